@@ -1,24 +1,87 @@
 # skill_validation_system/app.py
 
 import os
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
-from config import UPLOAD_FOLDER, SECRET_KEY
-from utils.file_handler import save_file
+import json
+import time
+import click
+from flask import (
+    Flask, Request, Response as FlaskResponse, render_template, request, redirect, url_for, flash, jsonify,
+    session, stream_with_context, g
+)
+from config import (
+    load_secret_key, UPLOAD_FOLDER, DASHBOARD_PAGE_SIZE, MAX_UPLOAD_BYTES, RESCORE_BATCH_SIZE, TRACE_REQUESTS,
+    BULK_INGEST_DIR, BULK_MAX_ARCHIVE_BYTES
+)
+from utils.file_handler import save_file, save_stream, UploadTooLargeError
 from utils.helpers import (
-    get_all_candidates, get_candidate_by_id, save_candidate, update_candidate,
-    get_assessment_by_id, save_assessments, get_responses_by_candidate_id,
-    save_responses, get_response_by_id, update_response
+    get_candidate_by_id, save_candidate, update_candidate,
+    get_assessments_by_ids, get_responses_by_candidate_id,
+    save_responses, get_response_by_id, update_response, get_cache_stats,
+    get_candidates_page, rebuild_candidate_stats, get_all_candidates
+)
+from services.job_queue import get_job_queue, start_workers, QUEUED, RUNNING, DONE, FAILED
+from services.candidate_pipeline import PROCESS_RESUME, INDEX_CANDIDATE
+from services.bulk_ingest import BULK_INGEST, ingest_resumes
+from services.candidate_index import get_candidate_index, index_candidates, search_candidates
+from services.scoring_service import score_responses_batch
+from services.embedding_cache import get_embedding_cache
+from services.question_bank import question_bank_stats
+from services.prompt_builder import prompt_stats
+from services.rescoring import rescore_responses
+from services.export import iter_export, parse_date, MIMETYPES, CSV
+from utils.storage import migrate_json_to_sqlite
+from utils.sessions import make_session_interface
+from utils.metrics import (
+    render_metrics, register_process_gauges, observe_request, start_trace, current_trace, finish_trace,
+    recent_traces
 )
-from services.resume_parser import extract_skills_from_resume
-from services.assessment_generator import generate_assessments_for_skills
-from services.scoring_service import score_response
 from models.candidate import Candidate
 from models.response import Response
 
 # --- App Initialization ---
+class AppRequest(Request):
+    """Allows the bulk upload endpoint a larger body than MAX_CONTENT_LENGTH."""
+
+    @property
+    def max_content_length(self):
+        if self.path == '/hr/bulk-upload':
+            return BULK_MAX_ARCHIVE_BYTES + 64 * 1024
+        return super().max_content_length
+
 app = Flask(__name__)
+app.request_class = AppRequest
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['SECRET_KEY'] = SECRET_KEY
+app.config['SECRET_KEY'] = load_secret_key()
+# Sessions are kept server-side so any worker or host can serve any applicant
+session_interface = make_session_interface()
+if session_interface is not None:
+    app.session_interface = session_interface
+# Reject oversized requests before they are read; the margin leaves room for the form fields
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES + 64 * 1024
+
+# --- Request Metrics ---
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    if TRACE_REQUESTS == 'all' or (TRACE_REQUESTS == 'header' and request.headers.get('X-Trace') == '1'):
+        start_trace(request.method, request.path)
+
+@app.after_request
+def add_server_timing(response):
+    g.response_status = response.status_code
+    trace = current_trace()
+    if trace is not None:
+        response.headers['Server-Timing'] = trace.server_timing()
+    return response
+
+# Teardown also runs when a view raised, so failed requests are recorded too
+@app.teardown_request
+def finish_request_metrics(exc):
+    status = 500 if exc is not None else g.pop('response_status', 500)
+    started = g.pop('request_started', None)
+    if started is not None:
+        observe_request(request.endpoint, request.method, status, time.perf_counter() - started)
+    finish_trace(status)
 
 # --- Helper to ensure directories exist ---
 # This is good practice for Render's persistent disks
@@ -43,77 +106,195 @@ def applicant_upload():
             flash('No resume file selected.', 'danger')
             return redirect(request.url)
 
-        resume_path = save_file(file, app.config['UPLOAD_FOLDER'])
+        try:
+            resume_path = save_file(file, app.config['UPLOAD_FOLDER'])
+        except UploadTooLargeError as e:
+            flash(str(e), 'danger')
+            return redirect(request.url)
         candidate = Candidate(
             name=request.form['name'],
             email=request.form['email'],
             resume_path=os.path.relpath(resume_path, 'static')
         )
         save_candidate(candidate)
-        flash(f'Successfully uploaded resume for {candidate.name}. Now processing...', 'success')
 
-        try:
-            skills = extract_skills_from_resume(resume_path)
-            if not skills:
-                flash('Processing failed: We could not identify any skills in your resume. Please check the file and try again.', 'danger')
-                return redirect(request.url)
+        # Skill extraction and assessment generation run in the background; the
+        # processing page follows the job and moves on once it has finished.
+        job_id = get_job_queue().enqueue(
+            PROCESS_RESUME, {'candidate_id': candidate.id, 'resume_path': resume_path}, candidate_id=candidate.id
+        )
+        start_workers()
+        session['candidate_id'] = candidate.id
+        session['job_id'] = job_id
+        session.pop('assessment_ids', None)
+        flash(f'Successfully uploaded resume for {candidate.name}. Now processing...', 'success')
+        return redirect(url_for('applicant_processing'))
             
-            candidate.skills = skills
-            update_candidate(candidate)
+    return render_template('applicant/upload.html')
 
-            assessments = generate_assessments_for_skills(skills)
-            if not assessments:
-                flash('Processing failed: An error occurred while generating assessment questions. Please try again later.', 'danger')
-                return redirect(request.url)
 
-            save_assessments(assessments)
-            session['candidate_id'] = candidate.id
-            session['assessment_ids'] = [a.id for a in assessments]
-            
-            return redirect(url_for('applicant_assessment'))
+@app.errorhandler(413)
+def upload_too_large(error):
+    flash(f'The file is larger than the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit.', 'danger')
+    return redirect(url_for('applicant_upload'))
 
-        except Exception as e:
-            print(f"A critical error occurred during processing for candidate {candidate.id}: {e}")
-            flash('A critical server error occurred during processing. The technical team has been notified.', 'danger')
-            return redirect(request.url)
-            
-    return render_template('applicant/upload.html')
 
+def _ready_assessment_ids(job):
+    """The assessment IDs a job has published so far, including while it is running."""
+    if job and job['status'] in (RUNNING, DONE) and job['result']:
+        return job['result'].get('assessment_ids') or []
+    return []
+
+def _job_status(job):
+    """The public view of a resume processing job, as served to the processing page."""
+    ready = len(_ready_assessment_ids(job))
+    return {
+        'status': job['status'],
+        'error': job['error'],
+        'ready': ready,
+        # The applicant can start as soon as the first questions have been saved
+        'redirect': url_for('applicant_assessment') if job['status'] == DONE or ready else None,
+    }
+
+@app.route('/processing')
+def applicant_processing():
+    job_id = session.get('job_id')
+    job = get_job_queue().get(job_id) if job_id else None
+    if job is None or job['status'] == DONE or _ready_assessment_ids(job):
+        return redirect(url_for('applicant_assessment'))
+    if job['status'] in (QUEUED, RUNNING):
+        # Make sure this process consumes the queue even if it did not enqueue the job
+        start_workers()
+    return render_template('applicant/processing.html', job_id=job_id, job=_job_status(job))
+
+@app.route('/status/<job_id>')
+def job_status(job_id):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'status': 'unknown', 'error': 'Job not found'}), 404
+    return jsonify(_job_status(job))
+
+@app.route('/status/<job_id>/events')
+def job_status_events(job_id):
+    queue = get_job_queue()
+
+    def events():
+        # Server-sent events: push the status whenever it changes, until the job ends
+        last = None
+        deadline = time.time() + 300
+        while time.time() < deadline:
+            job = queue.get(job_id)
+            status = _job_status(job) if job else {'status': 'unknown', 'error': 'Job not found'}
+            if status != last:
+                yield f"data: {json.dumps(status)}\n\n"
+                last = status
+            if status['status'] not in (QUEUED, RUNNING):
+                return
+            time.sleep(0.5)
+
+    return FlaskResponse(stream_with_context(events()), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+def _session_assessments():
+    """
+    Returns (assessment_ids, complete, error) for the applicant's session. While the
+    processing job is still streaming questions, the IDs published so far are
+    returned with complete=False; `error` is the job's message if it failed.
+    """
+    assessment_ids = session.get('assessment_ids')
+    if assessment_ids or not session.get('job_id'):
+        return assessment_ids, True, None
+
+    job = get_job_queue().get(session['job_id'])
+    if job and job['status'] == FAILED:
+        session.pop('job_id', None)
+        return None, True, job['error']
+    assessment_ids = _ready_assessment_ids(job)
+    if job and job['status'] == DONE:
+        session['assessment_ids'] = assessment_ids
+        return assessment_ids, True, None
+    return assessment_ids, job is None, None
 
 @app.route('/assessment', methods=['GET', 'POST'])
 def applicant_assessment():
     candidate_id = session.get('candidate_id')
-    assessment_ids = session.get('assessment_ids')
+    assessment_ids, complete, error = _session_assessments() if candidate_id else (None, True, None)
+
+    if error:
+        flash(error, 'danger')
+        return redirect(url_for('applicant_upload'))
+
+    if candidate_id and not assessment_ids and not complete:
+        # The job has not produced any questions yet
+        return redirect(url_for('applicant_processing'))
 
     if not candidate_id or not assessment_ids:
         flash('Your session has expired or is invalid. Please start over by uploading your resume.', 'warning')
         return redirect(url_for('applicant_upload'))
 
     candidate = get_candidate_by_id(candidate_id)
-    assessments = [get_assessment_by_id(aid) for aid in assessment_ids if get_assessment_by_id(aid) is not None]
+    assessments = get_assessments_by_ids(assessment_ids)
+    assessments_by_id = {a.id: a for a in assessments}
 
     if request.method == 'POST':
-        responses_to_save = []
-        validated_skills = {}
-        for i in range(len(assessments)):
+        answered = []
+        # Questions may have been appended to the page while it was open, so read
+        # every submitted index rather than relying on the count at render time
+        i = 0
+        while f'assessment_id_{i}' in request.form:
             assessment_id = request.form.get(f'assessment_id_{i}')
             answer = request.form.get(f'answer_{assessment_id}')
-            assessment = get_assessment_by_id(assessment_id)
-            score = score_response(answer, assessment.model_answer)
-            response = Response(candidate_id=candidate.id, assessment_id=assessment_id, answer=answer, score=score)
+            assessment = assessments_by_id.get(assessment_id)
+            if assessment is not None:
+                answered.append((assessment, answer))
+            i += 1
+
+        # Score every answer of the submission together in one batched call
+        scores = score_responses_batch(
+            [(answer, a.model_answer) for a, answer in answered],
+            question_types=[a.question_type for a, _ in answered],
+            questions=[a.question for a, _ in answered]
+        )
+        responses_to_save = []
+        validated_skills = {}
+        for (assessment, answer), score in zip(answered, scores):
+            response = Response(candidate_id=candidate.id, assessment_id=assessment.id, answer=answer, score=score)
             responses_to_save.append(response)
             validated_skills[assessment.skill] = score
         
         save_responses(responses_to_save)
         candidate.validated_skills = validated_skills
         update_candidate(candidate)
+        # Make the candidate findable in the talent pool search
+        get_job_queue().enqueue(INDEX_CANDIDATE, {'candidate_id': candidate.id}, candidate_id=candidate.id)
+        start_workers()
         
         session['candidate_name'] = candidate.name
         session.pop('candidate_id', None)
         session.pop('assessment_ids', None)
+        session.pop('job_id', None)
         return redirect(url_for('applicant_thank_you'))
 
-    return render_template('applicant/assessment.html', candidate=candidate, assessments=assessments)
+    return render_template('applicant/assessment.html', candidate=candidate, assessments=assessments, complete=complete)
+
+@app.route('/assessment/questions')
+def applicant_assessment_questions():
+    """Returns the questions added since `after`, rendered, while generation is still running."""
+    if not session.get('candidate_id'):
+        return jsonify({'error': 'Session expired'}), 404
+    assessment_ids, complete, error = _session_assessments()
+    if error:
+        return jsonify({'error': error, 'complete': True}), 404
+    assessment_ids = assessment_ids or []
+    try:
+        after = max(int(request.args.get('after', 0)), 0)
+    except ValueError:
+        after = 0
+    new_assessments = get_assessments_by_ids(assessment_ids[after:])
+    html = [
+        render_template('applicant/_question.html', assessment=a, index=after + offset)
+        for offset, a in enumerate(new_assessments)
+    ]
+    return jsonify({'questions': html, 'count': after + len(new_assessments), 'complete': complete})
 
 @app.route('/thank-you')
 def applicant_thank_you():
@@ -121,23 +302,47 @@ def applicant_thank_you():
     return render_template('applicant/thank_you.html', candidate_name=candidate_name)
 
 # --- HR Routes ---
+def _dashboard_query():
+    """Reads the sort, filter and cursor arguments shared by the dashboard views."""
+    try:
+        limit = min(max(int(request.args.get('limit', DASHBOARD_PAGE_SIZE)), 1), 100)
+    except ValueError:
+        limit = DASHBOARD_PAGE_SIZE
+    return {
+        'sort': request.args.get('sort', 'date'),
+        'descending': request.args.get('order', 'asc') == 'desc',
+        'skill': request.args.get('skill') or None,
+        'cursor': request.args.get('cursor') or None,
+        'limit': limit,
+    }
+
 @app.route('/hr')
 def hr_dashboard():
     ensure_dirs()
-    candidates = get_all_candidates()
-    for candidate in candidates:
-        responses = get_responses_by_candidate_id(candidate.id)
-        candidate.flagged_count = sum(1 for r in responses if r.flagged)
-    return render_template('hr/dashboard.html', candidates=candidates)
+    query = _dashboard_query()
+    rows, next_cursor = get_candidates_page(**query)
+    return render_template('hr/dashboard.html', rows=rows, next_cursor=next_cursor, query=query)
+
+@app.route('/hr/api/candidates')
+def hr_candidates_api():
+    rows, next_cursor = get_candidates_page(**_dashboard_query())
+    candidates = []
+    for candidate, stats in rows:
+        data = candidate.to_dict()
+        data['mean_score'] = stats.mean_score
+        data['flagged_count'] = stats.flagged_count
+        data['response_count'] = stats.response_count
+        candidates.append(data)
+    return jsonify({'candidates': candidates, 'next_cursor': next_cursor})
 
 @app.route('/hr/applicant/<candidate_id>')
 def hr_applicant_detail(candidate_id):
     candidate = get_candidate_by_id(candidate_id)
     responses = get_responses_by_candidate_id(candidate_id)
-    responses_data = []
-    for r in responses:
-        assessment = get_assessment_by_id(r.assessment_id)
-        responses_data.append({'response': r, 'assessment': assessment})
+    assessments = {a.id: a for a in get_assessments_by_ids({r.assessment_id for r in responses})}
+    responses_data = [
+        {'response': r, 'assessment': assessments.get(r.assessment_id)} for r in responses
+    ]
     return render_template('hr/applicant_detail.html', candidate=candidate, responses_data=responses_data)
 
 @app.route('/hr/flag_response/<response_id>', methods=['POST'])
@@ -147,9 +352,231 @@ def flag_response(response_id):
     if response and data is not None:
         response.flagged = data.get('flagged', False)
         update_response(response)
+        # Flagged answers are left out of the search index
+        get_job_queue().enqueue(INDEX_CANDIDATE, {'candidate_id': response.candidate_id}, candidate_id=response.candidate_id)
+        start_workers()
         return jsonify({'success': True, 'flagged': response.flagged})
     return jsonify({'success': False, 'error': 'Response not found or invalid data'}), 404
 
+def _search_query():
+    """Reads the talent search parameters from the query string."""
+    try:
+        k = min(max(int(request.args.get('k', 20)), 1), 100)
+    except ValueError:
+        k = 20
+    return (request.args.get('q') or '').strip(), k
+
+def _search_results(query, k):
+    """Runs a talent search and pairs each hit with its Candidate."""
+    results = []
+    for hit in search_candidates(query, k) if query else []:
+        candidate = get_candidate_by_id(hit['candidate_id'])
+        if candidate is not None:
+            results.append((candidate, hit))
+    return results
+
+@app.route('/hr/search')
+def hr_search():
+    query, k = _search_query()
+    return render_template('hr/search.html', query=query, results=_search_results(query, k))
+
+@app.route('/hr/api/search')
+def hr_search_api():
+    query, k = _search_query()
+    results = []
+    for candidate, hit in _search_results(query, k):
+        data = candidate.to_dict()
+        data['score'] = hit['score']
+        data['matched'] = hit['kind']
+        results.append(data)
+    return jsonify({'query': query, 'results': results})
+
+def _export_filters(args):
+    """Reads the export filters from query arguments or CLI options. Raises ValueError."""
+    flagged = (args.get('flagged') or '').lower()
+    if flagged not in ('', 'true', 'false'):
+        raise ValueError("flagged must be 'true' or 'false'")
+    return {
+        'since': parse_date(args.get('since')),
+        'until': parse_date(args.get('until'), end=True),
+        'skill': args.get('skill') or None,
+        'flagged': {'true': True, 'false': False}.get(flagged),
+    }
+
+@app.route('/hr/export')
+def hr_export():
+    """
+    Streams candidates joined with their responses and assessments as CSV or NDJSON
+    (`format`), filtered by registration date (`since`, `until`), `skill` and `flagged`.
+    """
+    export_format = request.args.get('format', CSV)
+    if export_format not in MIMETYPES:
+        return jsonify({'error': f"format must be one of {', '.join(MIMETYPES)}"}), 400
+    try:
+        filters = _export_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return FlaskResponse(
+        stream_with_context(iter_export(export_format, **filters)),
+        mimetype=MIMETYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename=candidates.{export_format}'},
+    )
+
+@app.route('/hr/bulk-upload', methods=['POST'])
+def hr_bulk_upload():
+    """
+    Queues the ingestion of a zip archive of resumes. The candidates' names and
+    emails come from a manifest.csv/manifest.json inside the archive, or from a
+    separate `manifest` file field.
+    """
+    archive = request.files.get('archive')
+    if archive is None or archive.filename == '':
+        return jsonify({'error': 'Upload a zip archive of resumes in the "archive" field.'}), 400
+    try:
+        source = save_stream(archive.stream, 'archive.zip', BULK_INGEST_DIR, max_bytes=BULK_MAX_ARCHIVE_BYTES)
+        manifest = request.files.get('manifest')
+        manifest_path = None
+        if manifest is not None and manifest.filename:
+            name = 'manifest.json' if manifest.filename.lower().endswith('.json') else 'manifest.csv'
+            manifest_path = save_stream(manifest.stream, name, BULK_INGEST_DIR)
+    except UploadTooLargeError as e:
+        return jsonify({'error': str(e)}), 413
+    job_id = get_job_queue().enqueue(BULK_INGEST, {'source': source, 'manifest_path': manifest_path})
+    start_workers()
+    return jsonify({'job_id': job_id, 'status_url': url_for('hr_bulk_status', job_id=job_id)}), 202
+
+@app.route('/hr/bulk/<job_id>')
+def hr_bulk_status(job_id):
+    """The progress of a bulk ingestion, and the outcome of every file once it has finished."""
+    job = get_job_queue().get(job_id)
+    if job is None or job['kind'] != BULK_INGEST:
+        return jsonify({'status': 'unknown', 'error': 'Job not found'}), 404
+    return jsonify({'status': job['status'], 'error': job['error'], 'result': job['result']})
+
+@app.route('/hr/cache-stats')
+def hr_cache_stats():
+    stats = get_cache_stats()
+    stats['embeddings'] = get_embedding_cache().stats()
+    stats['question_bank'] = question_bank_stats()
+    stats['prompts'] = prompt_stats()
+    stats['candidate_index'] = get_candidate_index().stats()
+    return jsonify(stats)
+
+def _cache_gauges():
+    """This process's cache hit ratios and counters, as (name, help, {labels: value}) gauges."""
+    ratios, events = {}, {}
+    for collection, counts in get_cache_stats().items():
+        lookups = sum(counts.get(k, 0) for k in ('hits', 'misses', 'journal_reads'))
+        ratios[(('cache', f'storage_{collection}'),)] = counts.get('hits', 0) / lookups if lookups else 0.0
+        for event, value in counts.items():
+            events[(('cache', f'storage_{collection}'), ('event', event))] = value
+    for cache, stats, ratio_key in (
+        ('embeddings', get_embedding_cache().stats(), 'hit_rate'),
+        ('question_bank', question_bank_stats(), 'hit_ratio'),
+    ):
+        ratios[(('cache', cache),)] = stats[ratio_key]
+        for event, value in stats.items():
+            if event != ratio_key and isinstance(value, (int, float)):
+                events[(('cache', cache), ('event', event))] = value
+    return [
+        ('cache_hit_ratio', 'Fraction of lookups served from cache, per cache.', ratios),
+        ('cache_events', 'Cache counters (hits, misses, items, ...) per process.', events),
+    ]
+
+register_process_gauges(_cache_gauges)
+
+@app.route('/metrics')
+def metrics():
+    gauges = [('candidate_index_vectors', 'Vectors in the talent pool index.',
+               {(): get_candidate_index().stats()['vectors']})]
+    return FlaskResponse(render_metrics(gauges), mimetype='text/plain; version=0.0.4')
+
+@app.route('/hr/traces')
+def hr_traces():
+    """This worker's most recent request traces, when TRACE_REQUESTS is enabled."""
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+    except ValueError:
+        limit = 50
+    return jsonify({'tracing': TRACE_REQUESTS, 'traces': recent_traces(limit)})
+
+# --- CLI Commands ---
+@app.cli.command('migrate-storage')
+def migrate_storage_command():
+    """Copies the data/*.json collections into the SQLite store (safe to re-run)."""
+    counts = migrate_json_to_sqlite()
+    for collection, count in counts.items():
+        print(f"Migrated {count} {collection}.")
+
+@app.cli.command('reindex-candidates')
+def reindex_candidates_command():
+    """Rebuilds the talent pool search index from every stored candidate."""
+    get_candidate_index().clear()
+    candidates = get_all_candidates()
+    vectors = 0
+    for start in range(0, len(candidates), 100):
+        vectors += index_candidates(candidates[start:start + 100])
+    get_candidate_index().merge()
+    print(f"Indexed {vectors} vectors for {len(candidates)} candidates.")
+
+@app.cli.command('rescore-responses')
+@click.option('--batch-size', type=int, default=None, help='Responses per batch.')
+@click.option('--workers', type=int, default=None, help='Worker processes (0 to score in-process).')
+@click.option('--restart', is_flag=True, help='Ignore the checkpoint of an interrupted run.')
+def rescore_responses_command(batch_size, workers, restart):
+    """Re-scores every stored response with the current scoring logic and embedding model."""
+    result = rescore_responses(batch_size=batch_size or RESCORE_BATCH_SIZE, workers=workers, restart=restart)
+    print(f"Rescored {result['rescored']} responses, skipped {result['skipped']} without an assessment "
+          f"({result['per_second']} responses/sec).")
+
+@app.cli.command('ingest-resumes')
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--manifest', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='CSV or JSON manifest of filename,name,email (default: manifest.csv/json in SOURCE).')
+@click.option('--workers', type=int, default=None, help='Text extraction processes (0 to extract in-process).')
+@click.option('--concurrency', type=int, default=None, help='Resumes processed at once.')
+@click.option('--batch-size', type=int, default=None, help='Resumes per write.')
+@click.option('--restart', is_flag=True, help='Ignore the report of an earlier run of the same inputs.')
+def ingest_resumes_command(source, manifest, workers, concurrency, batch_size, restart):
+    """Creates candidates and assessments for a directory or zip archive of resumes."""
+    report = ingest_resumes(
+        source, manifest_path=manifest, workers=workers, concurrency=concurrency, batch_size=batch_size,
+        restart=restart, on_progress=lambda summary: print(f"{summary['counts']} ({summary['files_per_second']} files/sec)"),
+    )
+    for name, outcome in sorted(report['files'].items()):
+        if outcome['status'] != 'ok':
+            print(f"{name}: {outcome['error']}")
+    ok = sum(outcome['status'] == 'ok' for outcome in report['files'].values())
+    print(f"Ingested {ok} of {len(report['files'])} resumes ({report.get('files_per_second')} files/sec). "
+          f"Report: {os.path.join(BULK_INGEST_DIR, report['run_id'] + '.json')}")
+
+@app.cli.command('export-data')
+@click.option('--format', 'export_format', type=click.Choice(list(MIMETYPES)), default=CSV, help='Output format.')
+@click.option('--output', type=click.File('w', encoding='utf-8'), default='-', help='Output file (default: stdout).')
+@click.option('--since', default=None, help='Only candidates registered on or after this ISO date.')
+@click.option('--until', default=None, help='Only candidates registered on or before this ISO date.')
+@click.option('--skill', default=None, help='Only candidates claiming or validated in this skill.')
+@click.option('--flagged', type=click.Choice(['true', 'false']), default=None, help='Only flagged or unflagged responses.')
+def export_data_command(export_format, output, since, until, skill, flagged):
+    """Streams candidates joined with their responses and assessments as CSV or NDJSON."""
+    try:
+        filters = _export_filters({'since': since, 'until': until, 'skill': skill, 'flagged': flagged})
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    for chunk in iter_export(export_format, **filters):
+        output.write(chunk)
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recomputes the per-candidate aggregates used to sort the HR dashboard."""
+    print(f"Rebuilt stats for {rebuild_candidate_stats()} candidates.")
+
+@app.cli.command('run-workers')
+def run_workers_command():
+    """Consumes the background job queue in this process until interrupted."""
+    print("Processing background jobs. Press Ctrl+C to stop.")
+    get_job_queue().work()
+
 # This block is not needed for Render deployment but is fine to keep for local testing
 if __name__ == '__main__':
     ensure_dirs()
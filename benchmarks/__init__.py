@@ -0,0 +1 @@
+# skill_validation_system/benchmarks/__init__.py
@@ -0,0 +1,63 @@
+# skill_validation_system/benchmarks/aggregate_scaling.py
+
+import argparse
+import sys
+
+from benchmarks.micro import scratch_workdir, use_dataset, median_ms, finish
+
+# The bulk lookups behind the HR views must cost one pass over their input: the
+# time per response of count_by() (what rebuild_candidate_stats() counts flagged
+# responses with), and per ID of get_assessments_by_ids(), may not grow with the dataset.
+
+# The per-item time at the largest size may exceed the smallest size's by this
+# factor, to absorb cache effects and timer noise
+_LINEAR_FACTOR = 2.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the bulk aggregate lookups scale linearly.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000], help="Candidates per dataset.")
+    parser.add_argument("--questions", type=int, default=5, help="Responses per candidate.")
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"])
+    args = parser.parse_args()
+
+    root = scratch_workdir("aggregates")
+    from utils import helpers
+
+    results, failures = {"sizes": args.sizes, "backends": {}}, []
+    for backend in args.backends:
+        timings = results["backends"][backend] = {}
+        for size in args.sizes:
+            repository = use_dataset(root, backend, size, args.questions)
+            responses = size * args.questions
+            # What the applicant detail views ask for: the assessment of every response
+            assessment_ids = [row[0] for row in repository.values("responses", "assessment_id")]
+
+            def flagged_counts():
+                if backend == "json":
+                    # The counts are memoized until the collection changes; time the pass itself
+                    repository._load("responses").aggregates.clear()
+                return repository.count_by("responses", "candidate_id", flagged=True)
+
+            counts = flagged_counts()
+            if sum(counts.values()) != sum(bool(row[0]) for row in repository.values("responses", "flagged")):
+                failures.append(f"{backend} {size}: flagged counts do not add up to the flagged responses")
+            flagged_ms = median_ms(flagged_counts, repeat=5)
+            by_ids_ms = median_ms(lambda: helpers.get_assessments_by_ids(assessment_ids), repeat=5)
+            timings[size] = {
+                "flagged_counts_ms": flagged_ms,
+                "flagged_counts_us_per_response": round(flagged_ms * 1000 / responses, 4),
+                "assessments_by_ids_ms": by_ids_ms,
+                "assessments_by_ids_us_per_id": round(by_ids_ms * 1000 / len(assessment_ids), 4),
+            }
+
+        smallest, largest = timings[args.sizes[0]], timings[args.sizes[-1]]
+        for key in ("flagged_counts_us_per_response", "assessments_by_ids_us_per_id"):
+            if largest[key] > smallest[key] * _LINEAR_FACTOR:
+                failures.append(f"{backend} {key}: {largest[key]} at {args.sizes[-1]} candidates against "
+                                f"{smallest[key]} at {args.sizes[0]}, which is worse than linear")
+    return finish(results, failures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# skill_validation_system/benchmarks/datagen.py
+
+import argparse
+import random
+from models.assessment import Assessment
+from models.candidate import Candidate
+from models.response import Response
+from utils.helpers import rebuild_candidate_stats
+from utils.skills import SKILL_ALIASES
+from utils.storage import get_repository
+
+SKILLS = sorted(set(SKILL_ALIASES.values()))
+_QUESTION_TYPES = ("mcq", "coding", "subjective")
+
+
+def _assessment(rng, skill, variant):
+    question_type = _QUESTION_TYPES[variant % len(_QUESTION_TYPES)]
+    if question_type == "mcq":
+        return Assessment(skill, f"Which statement about {skill} is correct? (variant {variant})\nA) ...\nB) ...\nC) ...\nD) ...",
+                          question_type, rng.choice("ABCD"))
+    if question_type == "coding":
+        return Assessment(skill, f"Write a function that demonstrates {skill} (variant {variant}).",
+                          question_type, f"def solve_{variant}(items):\n    return sorted(set(items))")
+    return Assessment(skill, f"Describe how you have used {skill} in a recent project (variant {variant}).",
+                      question_type, f"A strong answer explains the context, how {skill} was applied and the outcome.")
+
+
+def _answer(rng, assessment):
+    if assessment.question_type == "mcq":
+        return rng.choice("ABCD")
+    if assessment.question_type == "coding":
+        return f"def solve(items):\n    return {rng.choice(['sorted(set(items))', 'list(items)', 'items[::-1]'])}"
+    return f"I used {assessment.skill} to " + " ".join(rng.choice(
+        ["build", "scale", "test", "deploy", "monitor", "design", "a", "service", "pipeline", "team", "the", "data"]
+    ) for _ in range(rng.randint(20, 60)))
+
+
+def generate_dataset(candidates=1000, questions_per_candidate=15, variants_per_skill=3, flagged_rate=0.05, seed=0):
+    """
+    Fills the configured storage backend with synthetic candidates who have taken
+    an assessment: a shared pool of assessments (`variants_per_skill` per skill in
+    the taxonomy), `questions_per_candidate` scored responses per candidate, and
+    the dashboard aggregates.
+
+    Args:
+        candidates (int, optional): The number of candidates to create.
+        questions_per_candidate (int, optional): Responses per candidate.
+        variants_per_skill (int, optional): Assessments generated for each skill.
+        flagged_rate (float, optional): Fraction of responses flagged for review.
+        seed (int, optional): Seed for reproducible data.
+
+    Returns:
+        dict: The number of records written per collection.
+    """
+    rng = random.Random(seed)
+    repository = get_repository()
+    assessments = {skill: [_assessment(rng, skill, v) for v in range(variants_per_skill)] for skill in SKILLS}
+    repository.insert_many("assessments", [a for variants in assessments.values() for a in variants])
+
+    written = {"candidates": 0, "responses": 0}
+    batch_candidates, batch_responses = [], []
+
+    def flush():
+        repository.insert_many("candidates", batch_candidates)
+        repository.insert_many("responses", batch_responses)
+        written["candidates"] += len(batch_candidates)
+        written["responses"] += len(batch_responses)
+        batch_candidates.clear()
+        batch_responses.clear()
+
+    for i in range(candidates):
+        skills = rng.sample(SKILLS, min(len(SKILLS), rng.randint(questions_per_candidate, questions_per_candidate + 10)))
+        candidate = Candidate(name=f"Candidate {i}", email=f"candidate{i}@example.com",
+                              resume_path=f"uploads/synthetic-{i}.pdf", skills=skills)
+        for skill in skills[:questions_per_candidate]:
+            assessment = rng.choice(assessments[skill])
+            score = round(rng.uniform(20, 100), 2)
+            batch_responses.append(Response(candidate.id, assessment.id, _answer(rng, assessment), score=score,
+                                            flagged=rng.random() < flagged_rate))
+            candidate.validated_skills[skill] = score
+        batch_candidates.append(candidate)
+        if len(batch_candidates) >= 1000:
+            flush()
+    flush()
+    rebuild_candidate_stats()
+    written["assessments"] = sum(len(variants) for variants in assessments.values())
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the configured storage with synthetic candidates.")
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=15, help="Responses per candidate.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(generate_dataset(args.candidates, args.questions, seed=args.seed))
+
+
+if __name__ == "__main__":
+    main()
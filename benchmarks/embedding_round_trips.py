@@ -0,0 +1,62 @@
+# skill_validation_system/benchmarks/embedding_round_trips.py
+
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.micro import scratch_workdir, finish
+
+
+def _pairs(tag, count):
+    # Unique texts per run, so neither scoring path is served from the embedding cache
+    return [(f"{tag} answer {i}: indexes speed up lookups on large tables.",
+             f"{tag} model answer {i}: an index avoids a full table scan.") for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count the embeddings requests made to score N subjective answers, one by one and batched.")
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the fake server waits per request.")
+    args = parser.parse_args()
+
+    fake = FakeOpenAIServer(latency=args.latency)
+    # config.py reads the environment at import time
+    os.environ["OPENAI_BASE_URL"] = fake.start()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    scratch_workdir("embeddings")
+    from services.scoring_service import score_response, score_responses_batch
+
+    count = args.questions
+    results, failures = {"questions": count}, []
+    try:
+        for mode in ("single", "batch"):
+            pairs = _pairs(mode, count)
+            before = fake.stats().get("embeddings", 0)
+            started = time.perf_counter()
+            if mode == "single":
+                scores = [score_response(answer, model_answer) for answer, model_answer in pairs]
+            else:
+                scores = score_responses_batch(pairs)
+            results[mode] = {
+                "embedding_requests": fake.stats().get("embeddings", 0) - before,
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+            if len(scores) != count or any(not 0 <= s <= 100 for s in scores):
+                failures.append(f"{mode}: expected {count} scores between 0 and 100, got {scores}")
+    finally:
+        fake.stop()
+
+    if results["single"]["embedding_requests"] != 2 * count:
+        failures.append(f"scoring one by one made {results['single']['embedding_requests']} embeddings "
+                        f"requests, expected {2 * count}")
+    if results["batch"]["embedding_requests"] != 1:
+        failures.append(f"scoring a batch made {results['batch']['embedding_requests']} embeddings requests, "
+                        f"expected 1")
+    return finish(results, failures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
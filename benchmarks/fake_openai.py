@@ -0,0 +1,244 @@
+# skill_validation_system/benchmarks/fake_openai.py
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# A local stand-in for the parts of the OpenAI HTTP API the app uses: chat
+# completions (plain and streamed) and embeddings. Point the app at it with
+# OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+_QUESTION_TYPES = ("mcq", "coding", "subjective")
+
+
+def fake_embedding(text, dimensions=1536):
+    """
+    A deterministic, unit-length embedding: every word is hashed to a signed
+    dimension. Texts that share words get similar vectors, so scores computed from
+    these embeddings behave like real ones.
+    """
+    vector = [0.0] * dimensions
+    for word in _WORD.findall(text.lower()) or [text]:
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        vector[value % dimensions] += 1.0 if value & (1 << 63) else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def fake_assessments(prompt):
+    """Builds a JSON array of assessment objects for the skills listed in a generation prompt."""
+    match = re.search(r"---\n(.*?)\n---", prompt, re.S)
+    skills = [s.strip() for s in match.group(1).split(",") if s.strip()] if match else ["General"]
+    if "exactly" not in prompt:
+        skills = skills[:20]
+    items = []
+    for i, skill in enumerate(skills):
+        question_type = _QUESTION_TYPES[i % len(_QUESTION_TYPES)]
+        if question_type == "mcq":
+            question = f"Which statement about {skill} is correct?\nA) It is a database.\nB) It is used in production systems.\nC) It is a color.\nD) None of the above."
+            model_answer = "B"
+        elif question_type == "coding":
+            question = f"Write a function that shows a typical use of {skill}."
+            model_answer = f"def use_{i}(data):\n    return [item for item in data if item]"
+        else:
+            question = f"Describe a project where you applied {skill} and what you learned."
+            model_answer = f"A good answer explains the problem, how {skill} was applied, the trade-offs and the outcome."
+        items.append({"skill": skill, "question": question, "question_type": question_type, "model_answer": model_answer})
+    return json.dumps(items, separators=(",", ":"))
+
+
+class FakeOpenAIServer:
+    """
+    A threaded HTTP server answering /v1/chat/completions and /v1/embeddings.
+
+    Args:
+        latency (float): Seconds each request waits before answering (for streamed
+            completions, before the first chunk).
+        jitter (float): Up to this many extra seconds, drawn uniformly per request.
+        failure_rate (float): Fraction of requests answered with a 429 or 503.
+        chunk_delay (float): Seconds between the chunks of a streamed completion.
+        dimensions (int): Length of the returned embeddings.
+        seed (int): Seed of the latency and failure draws.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, jitter=0.0, failure_rate=0.0,
+                 chunk_delay=0.002, dimensions=1536, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.chunk_delay = chunk_delay
+        self.dimensions = dimensions
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._counts = {}
+        self._counts_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        """Serves in a daemon thread and returns the base URL for OPENAI_BASE_URL."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self):
+        """Returns the number of requests and injected failures per endpoint."""
+        with self._counts_lock:
+            return dict(self._counts)
+
+    def _count(self, key):
+        with self._counts_lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def _draw(self):
+        """Returns (delay, failure status or None) for one request."""
+        with self._random_lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            if self._random.random() < self.failure_rate:
+                return delay, self._random.choice((429, 503))
+            return delay, None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body, content_type="application/json", headers=None):
+                data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path.endswith("/embeddings"):
+                    endpoint = "embeddings"
+                elif self.path.endswith("/chat/completions"):
+                    endpoint = "chat"
+                else:
+                    self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                server._count(endpoint)
+                delay, failure = server._draw()
+                time.sleep(delay)
+                if failure:
+                    server._count(f"{endpoint}_failures")
+                    self._send(failure, {"error": {"message": "Injected failure"}}, headers={"retry-after": "0.05"})
+                elif endpoint == "embeddings":
+                    self._embeddings(body)
+                else:
+                    self._chat(body)
+
+            def _embeddings(self, body):
+                texts = body.get("input")
+                texts = [texts] if isinstance(texts, str) else texts
+                self._send(200, {
+                    "object": "list",
+                    "model": body.get("model"),
+                    "data": [
+                        {"object": "embedding", "index": i, "embedding": fake_embedding(text, server.dimensions)}
+                        for i, text in enumerate(texts)
+                    ],
+                    "usage": {"prompt_tokens": 0, "total_tokens": 0},
+                })
+
+            def _chat(self, body):
+                messages = body.get("messages") or []
+                system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+                prompt = messages[-1]["content"] if messages else ""
+                if "extract skills" in system:
+                    content = "Python, SQL, Docker, Communication, Problem Solving"
+                elif "assessment" in system:
+                    content = fake_assessments(prompt)
+                else:
+                    content = "OK"
+
+                if not body.get("stream"):
+                    self._send(200, {
+                        "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                        "model": body.get("model"),
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": content}}],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                    })
+                    return
+
+                # The whole stream is built up front so it can be sent with a
+                # Content-Length, keeping the connection reusable; the chunks are
+                # still written one by one with chunk_delay between them.
+                pieces = [content[i:i + 64] for i in range(0, len(content), 64)]
+                events = [
+                    self._chunk(body, {"content": piece}, None) for piece in pieces
+                ] + [self._chunk(body, {}, "stop"), b"data: [DONE]\n\n"]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(sum(len(e) for e in events)))
+                self.end_headers()
+                for event in events:
+                    self.wfile.write(event)
+                    self.wfile.flush()
+                    if server.chunk_delay:
+                        time.sleep(server.chunk_delay)
+
+            def _chunk(self, body, delta, finish_reason):
+                data = {
+                    "id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": body.get("model"),
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                }
+                return f"data: {json.dumps(data)}\n\n".encode("utf-8")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake OpenAI API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before each response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum extra random latency in seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 429/503.")
+    parser.add_argument("--chunk-delay", type=float, default=0.002, help="Seconds between streamed chunks.")
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    server = FakeOpenAIServer(args.host, args.port, args.latency, args.jitter, args.failure_rate,
+                              args.chunk_delay, args.dimensions, args.seed)
+    print(f"Fake OpenAI API listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
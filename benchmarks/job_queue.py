@@ -0,0 +1,99 @@
+# skill_validation_system/benchmarks/job_queue.py
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.micro import scratch_workdir, finish
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[max(0, int(len(values) * fraction) - 1)]
+
+
+def _run(queue, jobs, workers):
+    """Enqueues `jobs` (kind, payload, candidate ID) at once and runs them on `workers` threads."""
+    from services.job_queue import DONE, FAILED
+
+    stop = threading.Event()
+    started = time.perf_counter()
+    job_ids = [queue.enqueue(kind, payload, candidate_id=candidate_id) for kind, payload, candidate_id in jobs]
+    threads = [threading.Thread(target=queue.work, args=(stop,), daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    while queue.stats()["counts"].get(DONE, 0) + queue.stats()["counts"].get(FAILED, 0) < len(job_ids):
+        time.sleep(0.02)
+    seconds = time.perf_counter() - started
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    finished = [queue.get(job_id) for job_id in job_ids]
+    waits = [(job["started_at"] - job["created_at"]) * 1000 for job in finished]
+    totals = [(job["finished_at"] - job["created_at"]) * 1000 for job in finished]
+    return {
+        "workers": workers,
+        "jobs_per_second": round(len(job_ids) / seconds, 2),
+        "queue_wait_p50_ms": round(statistics.median(waits), 1),
+        "queue_wait_p95_ms": round(_percentile(waits, 0.95), 1),
+        "job_p50_ms": round(statistics.median(totals), 1),
+        "failed": sum(job["status"] == FAILED for job in finished),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure resume-processing jobs/sec and queue latency with the fake OpenAI server as the LLM.")
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds the fake server waits per request.")
+    args = parser.parse_args()
+
+    fake = FakeOpenAIServer(latency=args.latency)
+    # config.py reads the environment at import time. Every job asks the LLM for its
+    # questions rather than reusing banked ones, so each one costs the same.
+    os.environ["OPENAI_BASE_URL"] = fake.start()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ["QUESTION_BANK_ENABLED"] = "0"
+    scratch_workdir("jobs")
+    from benchmarks.scenarios import make_resume
+    from models.candidate import Candidate
+    from services.candidate_pipeline import PROCESS_RESUME
+    from services.job_queue import JobQueue
+    from utils.helpers import save_candidate
+
+    rng = random.Random(0)
+    results, failures = {"jobs": args.jobs, "llm_latency_s": args.latency, "runs": []}, []
+    try:
+        for workers in args.workers:
+            jobs = []
+            for i in range(args.jobs):
+                path = os.path.abspath(f"resume-{workers}-{i}.docx")
+                with open(path, "wb") as f:
+                    f.write(make_resume(rng))
+                candidate = Candidate(name="Jordan Example", email=f"jordan{workers}.{i}@example.com", resume_path=path)
+                save_candidate(candidate)
+                jobs.append((PROCESS_RESUME, {"candidate_id": candidate.id, "resume_path": path}, candidate.id))
+            run = _run(JobQueue(os.path.abspath(f"jobs-{workers}.db")), jobs, workers)
+            results["runs"].append(run)
+            if run["failed"]:
+                failures.append(f"{run['failed']} of {args.jobs} jobs failed with {workers} workers")
+    finally:
+        fake.stop()
+
+    # The jobs mostly wait on the LLM, so more worker threads must process more of them
+    runs = results["runs"]
+    if len(runs) > 1 and runs[-1]["jobs_per_second"] < runs[0]["jobs_per_second"] * 1.5:
+        failures.append(f"{runs[-1]['workers']} workers ran {runs[-1]['jobs_per_second']} jobs/s against "
+                        f"{runs[0]['jobs_per_second']} with {runs[0]['workers']}")
+    return finish(results, failures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# skill_validation_system/benchmarks/micro.py
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Helpers shared by the component microbenchmarks (benchmarks/<component>.py). Each
+# runs in its own process with `python -m benchmarks.<component>`, prints its
+# results as JSON and exits non-zero when the property it checks does not hold.
+
+
+def scratch_workdir(prefix):
+    """
+    Switches to a new temporary working directory, where the app's relative data
+    paths (data/, static/uploads/) then point. Call it before using any storage.
+    """
+    workdir = tempfile.mkdtemp(prefix=f"skill-{prefix}-")
+    os.chdir(workdir)
+    return workdir
+
+
+def median_ms(func, repeat=5, number=1):
+    """Runs `func` `number` times per sample and returns the median per-call time in ms."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number)
+    return round(statistics.median(samples) * 1000, 4)
+
+
+def finish(results, failures):
+    """Prints the results and failed checks and returns the process exit code."""
+    results["failures"] = failures
+    print(json.dumps(results, indent=2))
+    for failure in failures:
+        print(f"FAILED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def use_dataset(root, backend, candidates, questions=5):
+    """
+    Switches to a new directory under `root`, points the process-wide repository at
+    a new `backend` ("json" or "sqlite") store there and fills it with a synthetic
+    dataset. Returns the repository.
+    """
+    from benchmarks.datagen import generate_dataset
+    from utils import storage
+
+    # The data paths are relative, so a fresh directory means an empty store
+    workdir = os.path.join(root, f"{backend}-{candidates}")
+    os.makedirs(workdir)
+    os.chdir(workdir)
+    repository = storage._repository = storage.BACKENDS[backend]()
+    generate_dataset(candidates, questions, seed=candidates)
+    if backend == "json":
+        # Measure reads against a snapshot rather than a long journal
+        for collection in storage.COLLECTIONS:
+            repository.compact(collection)
+    return repository
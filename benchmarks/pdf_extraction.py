@@ -0,0 +1,96 @@
+# skill_validation_system/benchmarks/pdf_extraction.py
+
+import argparse
+import os
+import shutil
+import sys
+
+from benchmarks.micro import scratch_workdir, median_ms, finish
+
+_LINES_PER_PAGE = 40
+
+
+def make_pdf(path, pages):
+    """Writes a PDF of `pages` pages of resume-like text, marked "Page <n>"."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for n in range(1, pages + 1):
+        lines = [f"Page {n}"] + [
+            f"Built services in Python, SQL and Kubernetes for project {n}-{i}." for i in range(_LINES_PER_PAGE)
+        ]
+        text = "".join(f"({line}) Tj T* " for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 780 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects),))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume text extraction on 1, 10 and 100 page PDFs.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scratch_workdir("pdf")
+    from config import EXTRACT_CACHE_DIR
+    from utils import file_handler
+
+    def cold(path):
+        shutil.rmtree(EXTRACT_CACHE_DIR, ignore_errors=True)
+        return file_handler.read_file_content(path)
+
+    results, failures = {"workers": file_handler.PDF_EXTRACT_WORKERS, "documents": {}}, []
+    for pages in args.pages:
+        path = os.path.abspath(f"resume-{pages}.pdf")
+        make_pdf(path, pages)
+        text = cold(path)
+        expected = min(pages, file_handler.PDF_MAX_PAGES)
+        if f"Page {expected}\n" not in text + "\n" or f"Page {expected + 1}\n" in text + "\n":
+            failures.append(f"{pages} pages: the text does not end at page {expected}")
+
+        workers = file_handler.PDF_EXTRACT_WORKERS
+        file_handler.PDF_EXTRACT_WORKERS = 1
+        serial_ms = median_ms(lambda: cold(path), args.repeat)
+        file_handler.PDF_EXTRACT_WORKERS = workers
+        parallel_ms = median_ms(lambda: cold(path), args.repeat)
+        cold(path)
+        cached_ms = median_ms(lambda: file_handler.read_file_content(path), args.repeat * 10)
+        if file_handler.read_file_content(path) != text:
+            failures.append(f"{pages} pages: the cached text differs from the extracted text")
+        results["documents"][pages] = {
+            "serial_ms": serial_ms, "parallel_ms": parallel_ms, "cached_ms": cached_ms,
+            "chars": len(text),
+        }
+
+    # An extraction cut short by the timeout must not be cached
+    path = os.path.abspath(f"resume-{max(args.pages)}.pdf")
+    shutil.rmtree(EXTRACT_CACHE_DIR, ignore_errors=True)
+    timeout = file_handler.EXTRACT_TIMEOUT
+    file_handler.EXTRACT_TIMEOUT = 0
+    partial = file_handler.read_file_content(path)
+    file_handler.EXTRACT_TIMEOUT = timeout
+    if os.path.isdir(EXTRACT_CACHE_DIR) and os.listdir(EXTRACT_CACHE_DIR):
+        failures.append("a timed-out extraction was cached")
+    if file_handler.read_file_content(path) == partial and max(args.pages) > 1:
+        failures.append("the full text was not extracted after a timed-out extraction")
+    return finish(results, failures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
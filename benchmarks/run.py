@@ -0,0 +1,233 @@
+# skill_validation_system/benchmarks/run.py
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.scenarios import SCENARIOS, run_scenario, discover_candidate_ids
+from benchmarks.startup import measure_startup
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Latency regressions smaller than this many milliseconds are treated as noise.
+MIN_REGRESSION_MS = 5.0
+# Steps with fewer samples than this have too noisy a p95 to compare.
+MIN_SAMPLES = 30
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(recorder, done, failed, elapsed):
+    """Turns a scenario's samples into latency percentiles (ms) and throughput."""
+    steps = {}
+    for step in sorted(set(recorder.samples) | set(recorder.errors)):
+        values = sorted(recorder.samples.get(step, []))
+        steps[step] = {
+            "count": len(values),
+            "errors": recorder.errors.get(step, 0),
+            "mean_ms": round(1000 * sum(values) / len(values), 2) if values else None,
+            "p50_ms": round(1000 * percentile(values, 0.50), 2) if values else None,
+            "p95_ms": round(1000 * percentile(values, 0.95), 2) if values else None,
+            "p99_ms": round(1000 * percentile(values, 0.99), 2) if values else None,
+        }
+    requests = sum(s["count"] + s["errors"] for name, s in steps.items() if name not in SCENARIOS
+                   and name != "processing_wait")
+    return {
+        "iterations": done,
+        "failed_iterations": failed,
+        "seconds": round(elapsed, 2),
+        "iterations_per_second": round(done / elapsed, 3) if elapsed else 0.0,
+        "requests_per_second": round(requests / elapsed, 2) if elapsed else 0.0,
+        "steps": steps,
+    }
+
+
+def print_report(results):
+    for name, result in results["scenarios"].items():
+        print(f"\n== {name}: {result['iterations']} iterations ({result['failed_iterations']} failed) in "
+              f"{result['seconds']}s, {result['iterations_per_second']} it/s, {result['requests_per_second']} req/s")
+        print(f"{'step':<24}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for step, s in result["steps"].items():
+            cells = [f"{s[key]:>10.1f}" if s[key] is not None else f"{'-':>10}" for key in ("p50_ms", "p95_ms", "p99_ms")]
+            print(f"{step:<24}{s['count']:>7}{s['errors']:>8}{''.join(cells)}")
+    startup = results.get("startup")
+    if startup:
+        print(f"\n== startup: import {startup['import_ms']} ms, whole process {startup['process_ms']} ms, "
+              f"warm-up {startup['warmup_ms']} ms (median of {startup['runs']})")
+        print(f"Heavy modules loaded by the import: {', '.join(startup['heavy_modules_loaded']) or 'none'}")
+    if results.get("fake_openai"):
+        print(f"\nFake OpenAI requests: {results['fake_openai']}")
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Returns the regressions of `results` against `baseline`: a step whose p95
+    latency grew by more than `tolerance` (and MIN_REGRESSION_MS), a scenario whose
+    throughput fell by more than `tolerance`, or one with failed iterations where
+    the baseline had none. Steps with fewer than MIN_SAMPLES samples are skipped.
+    Startup regresses when importing the app got slower by more than `tolerance`
+    or started loading a heavy module eagerly.
+    """
+    regressions = []
+    startup, base_startup = results.get("startup"), baseline.get("startup")
+    if startup and base_startup:
+        limit = max(base_startup["import_ms"] * (1 + tolerance), base_startup["import_ms"] + MIN_REGRESSION_MS)
+        if startup["import_ms"] > limit:
+            regressions.append(f"startup: import {startup['import_ms']} ms > baseline {base_startup['import_ms']} ms "
+                               f"(+{tolerance:.0%})")
+        eager = set(startup["heavy_modules_loaded"]) - set(base_startup["heavy_modules_loaded"])
+        if eager:
+            regressions.append(f"startup: importing the app now loads {', '.join(sorted(eager))}")
+    for name, base in baseline.get("scenarios", {}).items():
+        current = results["scenarios"].get(name)
+        if current is None:
+            continue
+        if current["iterations_per_second"] < base["iterations_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {current['iterations_per_second']} it/s "
+                               f"< baseline {base['iterations_per_second']} it/s")
+        if current["failed_iterations"] and not base["failed_iterations"]:
+            regressions.append(f"{name}: {current['failed_iterations']} failed iterations (baseline had none)")
+        for step, base_step in base["steps"].items():
+            step_now = current["steps"].get(step)
+            if not step_now or min(step_now["count"], base_step["count"]) < MIN_SAMPLES:
+                continue
+            limit = max(base_step["p95_ms"] * (1 + tolerance), base_step["p95_ms"] + MIN_REGRESSION_MS)
+            if step_now["p95_ms"] > limit:
+                regressions.append(f"{name}/{step}: p95 {step_now['p95_ms']} ms > baseline "
+                                   f"{base_step['p95_ms']} ms (+{tolerance:.0%})")
+    return regressions
+
+
+def _start_app(args):
+    """
+    Starts a fake OpenAI server and the app on a local threaded server, in a
+    scratch working directory seeded with the synthetic dataset. Returns
+    (base URL, fake server).
+    """
+    fake = FakeOpenAIServer(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                            chunk_delay=args.chunk_delay, seed=args.seed)
+    # config.py reads the environment and resolves data paths against the working
+    # directory at import time, so both are set up before the app is imported
+    os.environ["OPENAI_BASE_URL"] = fake.start()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    workdir = args.workdir or tempfile.mkdtemp(prefix="skill-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    print(f"Working directory: {workdir}")
+
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    from benchmarks.datagen import generate_dataset
+    from app import app
+
+    if args.candidates:
+        started = time.perf_counter()
+        written = generate_dataset(args.candidates, seed=args.seed)
+        print(f"Generated {written} in {time.perf_counter() - started:.1f}s")
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", fake
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the app against a local fake OpenAI API.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS) + ["startup", "all"], default="all")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Interpreter starts measured by `startup`.")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent virtual users per scenario.")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds each scenario runs.")
+    parser.add_argument("--iterations", type=int, help="Iterations per user instead of a duration.")
+    parser.add_argument("--candidates", type=int, default=1000, help="Synthetic candidates to generate first.")
+    parser.add_argument("--reuse-resumes", action="store_true", help="Upload identical resumes (warm caches).")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake OpenAI latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Fake OpenAI extra random latency in seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fake OpenAI 429/503 rate.")
+    parser.add_argument("--chunk-delay", type=float, default=0.002, help="Fake OpenAI delay between streamed chunks.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="Directory for the app's data (default: a new temporary directory).")
+    parser.add_argument("--url", help="Benchmark an already running app instead of starting one. Its "
+                                      "OPENAI_BASE_URL should point at `python -m benchmarks.fake_openai`.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression.")
+    args = parser.parse_args()
+
+    names = sorted(SCENARIOS) + ["startup"] if args.scenario == "all" else [args.scenario]
+    results = {
+        "settings": {key: getattr(args, key) for key in (
+            "users", "duration", "iterations", "candidates", "reuse_resumes", "latency", "jitter", "failure_rate"
+        )},
+        "scenarios": {},
+    }
+    if "startup" in names:
+        # Measured first, in fresh interpreters, before this process loads the app
+        print(f"Measuring startup over {args.startup_runs} runs...")
+        results["startup"] = measure_startup(args.startup_runs)
+        names.remove("startup")
+
+    fake = None
+    if not names:
+        base_url = None
+    elif args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        base_url, fake = _start_app(args)
+
+    context = {"unique_resumes": not args.reuse_resumes}
+    if "hr_reads" in names:
+        context["candidate_ids"] = discover_candidate_ids(base_url)
+
+    for name in names:
+        print(f"Running {name} with {args.users} users...")
+        results["scenarios"][name] = summarize(
+            *run_scenario(name, base_url, args.users, args.duration, args.iterations, context, args.seed)
+        )
+    if fake is not None:
+        results["fake_openai"] = fake.stats()
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != results["settings"]:
+        print("\nNote: the baseline was recorded with different settings.")
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+# skill_validation_system/benchmarks/scenarios.py
+
+import io
+import random
+import re
+import threading
+import time
+import uuid
+import httpx
+
+# Scripted user journeys. Each scenario is a function (client, recorder, context)
+# that performs one iteration over HTTP and records the latency of every step.
+# `client` is an httpx.Client with its own cookie jar, i.e. one virtual user.
+
+_ASSESSMENT_ID = re.compile(r'name="assessment_id_(\d+)" value="([^"]+)"')
+_RESUME_SKILLS = [
+    "Python", "Django", "PostgreSQL", "Docker", "Kubernetes", "AWS", "React", "TypeScript",
+    "Redis", "Kafka", "Terraform", "GraphQL", "Machine Learning", "Communication", "Agile", "Git",
+]
+
+
+class ScenarioError(Exception):
+    """Raised when a step returns something other than what a real user would get."""
+
+
+class Recorder:
+    """Collects (step, seconds, ok) samples from every virtual user."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def add(self, step, seconds, ok=True):
+        with self._lock:
+            if ok:
+                self.samples.setdefault(step, []).append(seconds)
+            else:
+                self.errors[step] = self.errors.get(step, 0) + 1
+
+    def timed(self, step, client, method, url, expect=(200,), **kwargs):
+        """Sends one request, records its latency under `step` and checks the status code."""
+        started = time.perf_counter()
+        try:
+            response = client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.add(step, 0, ok=False)
+            raise
+        elapsed = time.perf_counter() - started
+        ok = response.status_code in expect
+        self.add(step, elapsed, ok)
+        if not ok:
+            raise ScenarioError(f"{step}: {method} {url} returned {response.status_code}")
+        return response
+
+
+def make_resume(rng, unique=True):
+    """Returns the bytes of a small .docx resume with a random selection of skills."""
+    import docx
+    document = docx.Document()
+    document.add_heading("Jordan Example", level=1)
+    document.add_paragraph("Summary")
+    document.add_paragraph("Software engineer with experience building web services and data pipelines.")
+    document.add_paragraph("Skills")
+    document.add_paragraph(", ".join(rng.sample(_RESUME_SKILLS, rng.randint(6, 12))))
+    document.add_paragraph("Experience")
+    for year in range(2018, 2024):
+        document.add_paragraph(f"{year}: Built and operated services handling millions of requests per day.")
+    if unique:
+        # Defeats the content-hash caches, as every real applicant's resume differs
+        document.add_paragraph(f"Reference {uuid.uuid4()}")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def applicant_flow(client, recorder, context):
+    """
+    An applicant uploads a resume, waits on the processing page until the first
+    questions are ready, loads the assessment (following the questions that are
+    still being generated) and submits an answer to every question.
+    """
+    rng = context["random"]
+    resume = make_resume(rng, context.get("unique_resumes", True))
+    started = time.perf_counter()
+
+    recorder.timed("upload_form", client, "GET", "/")
+    response = recorder.timed(
+        "upload", client, "POST", "/", expect=(302,),
+        data={"name": "Jordan Example", "email": f"{uuid.uuid4().hex[:12]}@example.com"},
+        files={"resume": ("resume.docx", resume,
+                          "application/vnd.openxmlformats-officedocument.wordprocessingml.document")},
+    )
+    if not response.headers.get("location", "").endswith("/processing"):
+        raise ScenarioError(f"upload redirected to {response.headers.get('location')}")
+
+    # Poll the processing page the way the browser does until it hands over
+    wait_started = time.perf_counter()
+    deadline = wait_started + context.get("processing_timeout", 120)
+    while True:
+        response = recorder.timed("processing_poll", client, "GET", "/processing", expect=(200, 302))
+        if response.status_code == 302:
+            break
+        if time.perf_counter() > deadline:
+            recorder.add("processing_wait", 0, ok=False)
+            raise ScenarioError("processing did not finish in time")
+        time.sleep(context.get("poll_interval", 0.2))
+    recorder.add("processing_wait", time.perf_counter() - wait_started)
+
+    response = recorder.timed("assessment_page", client, "GET", "/assessment")
+    assessment_ids = dict(_ASSESSMENT_ID.findall(response.text))
+    if 'data-complete="false"' in response.text or not assessment_ids:
+        while True:
+            data = recorder.timed(
+                "assessment_questions", client, "GET", f"/assessment/questions?after={len(assessment_ids)}"
+            ).json()
+            for html in data["questions"]:
+                assessment_ids.update(_ASSESSMENT_ID.findall(html))
+            if data["complete"]:
+                break
+            time.sleep(context.get("poll_interval", 0.2))
+    if not assessment_ids:
+        raise ScenarioError("the assessment has no questions")
+
+    form = {}
+    for index, assessment_id in assessment_ids.items():
+        form[f"assessment_id_{index}"] = assessment_id
+        form[f"answer_{assessment_id}"] = rng.choice(["B", "def solve(items):\n    return sorted(items)",
+                                                      "I designed and deployed a service and measured the outcome."])
+    recorder.timed("assessment_submit", client, "POST", "/assessment", expect=(302,), data=form)
+    recorder.timed("thank_you", client, "GET", "/thank-you")
+    recorder.add("applicant_flow", time.perf_counter() - started)
+
+
+def hr_reads(client, recorder, context):
+    """
+    A hiring manager opens the dashboard, pages through it sorted by score, and
+    opens a few applicants' detail pages.
+    """
+    rng = context["random"]
+    started = time.perf_counter()
+    recorder.timed("hr_dashboard", client, "GET", "/hr")
+    data = recorder.timed("hr_api_candidates", client, "GET", "/hr/api/candidates?sort=score&order=desc").json()
+    if data.get("next_cursor"):
+        recorder.timed("hr_dashboard_page", client, "GET", "/hr",
+                       params={"sort": "score", "order": "desc", "cursor": data["next_cursor"]})
+    candidate_ids = context.get("candidate_ids") or [c["id"] for c in data["candidates"]]
+    for candidate_id in rng.sample(candidate_ids, min(3, len(candidate_ids))):
+        recorder.timed("hr_applicant_detail", client, "GET", f"/hr/applicant/{candidate_id}")
+    recorder.add("hr_reads", time.perf_counter() - started)
+
+
+SCENARIOS = {
+    "applicant_flow": applicant_flow,
+    "hr_reads": hr_reads,
+}
+
+
+def discover_candidate_ids(base_url, limit=500):
+    """Collects up to `limit` candidate IDs through the HR API, for hr_reads."""
+    ids = []
+    cursor = None
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        while len(ids) < limit:
+            params = {"limit": 100, **({"cursor": cursor} if cursor else {})}
+            data = client.get("/hr/api/candidates", params=params).json()
+            ids.extend(c["id"] for c in data["candidates"])
+            cursor = data.get("next_cursor")
+            if not cursor:
+                break
+    return ids[:limit]
+
+
+def run_scenario(name, base_url, users=8, duration=20.0, iterations=None, context=None, seed=0):
+    """
+    Runs a scenario with `users` concurrent virtual users until `duration` seconds
+    have passed (or each user has done `iterations` iterations).
+
+    Returns:
+        tuple: (Recorder, completed iterations, failed iterations, elapsed seconds)
+    """
+    scenario = SCENARIOS[name]
+    recorder = Recorder()
+    counts = {"done": 0, "failed": 0}
+    counts_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def user(number):
+        user_context = dict(context or {}, random=random.Random(seed * 1000 + number))
+        done = 0
+        with httpx.Client(base_url=base_url, timeout=120, follow_redirects=False) as client:
+            while (iterations is None and time.perf_counter() < deadline) or (iterations is not None and done < iterations):
+                try:
+                    scenario(client, recorder, user_context)
+                    key = "done"
+                except (ScenarioError, httpx.HTTPError) as e:
+                    print(f"[{name}] user {number}: {e}")
+                    key = "failed"
+                done += 1
+                with counts_lock:
+                    counts[key] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(n,), daemon=True) for n in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, counts["done"], counts["failed"], time.perf_counter() - started
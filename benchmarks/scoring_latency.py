@@ -0,0 +1,75 @@
+# skill_validation_system/benchmarks/scoring_latency.py
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.micro import scratch_workdir, finish
+
+_MCQ_QUESTION = "Which index type suits range queries?\nA) Hash\nB) B-tree\nC) Bitmap\nD) None"
+_CODE_ANSWER = "def unique_sorted(items):\n    return sorted(set(items))"
+
+
+def _cases(question_type, count):
+    """Returns `count` (answer, model answer, question) triples of one question type."""
+    if question_type == "mcq":
+        return [("Answer: " + "ABCD"[i % 4], "B", _MCQ_QUESTION) for i in range(count)]
+    if question_type == "coding":
+        return [(f"def unique_sorted(items):\n    result = sorted(set(items))  # {i}\n    return result",
+                 _CODE_ANSWER, "Write a function returning the sorted unique items.") for i in range(count)]
+    # New texts every time, so each answer is embedded rather than read from the cache
+    return [(f"An index lets the database find rows without a full scan ({i}).",
+             f"Indexes avoid scanning the whole table ({i}).", "Why add an index?") for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report scoring latency per question type.")
+    parser.add_argument("--answers", type=int, default=200, help="Answers scored per local question type.")
+    parser.add_argument("--subjective", type=int, default=20, help="Subjective answers scored.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the fake server waits per request.")
+    args = parser.parse_args()
+
+    fake = FakeOpenAIServer(latency=args.latency)
+    # config.py reads the environment at import time
+    os.environ["OPENAI_BASE_URL"] = fake.start()
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    scratch_workdir("scoring")
+    from services.scoring_service import score_response
+
+    results, failures = {"types": {}}, []
+    try:
+        for question_type, count in (("mcq", args.answers), ("coding", args.answers), ("subjective", args.subjective)):
+            before = fake.stats().get("embeddings", 0)
+            samples, scores = [], []
+            for answer, model_answer, question in _cases(question_type, count):
+                started = time.perf_counter()
+                scores.append(score_response(answer, model_answer, question_type=question_type, question=question))
+                samples.append((time.perf_counter() - started) * 1000)
+            samples.sort()
+            results["types"][question_type] = {
+                "answers": count,
+                "p50_ms": round(statistics.median(samples), 4),
+                "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 4),
+                "embedding_requests": fake.stats().get("embeddings", 0) - before,
+                "mean_score": round(float(statistics.mean(scores)), 2),
+            }
+    finally:
+        fake.stop()
+
+    types = results["types"]
+    for question_type in ("mcq", "coding"):
+        if types[question_type]["embedding_requests"]:
+            failures.append(f"{question_type} answers made {types[question_type]['embedding_requests']} "
+                            f"embeddings requests, expected none")
+    if types["mcq"]["mean_score"] != 25.0:
+        failures.append(f"one MCQ answer in four is right, but the mean score is {types['mcq']['mean_score']}")
+    if types["subjective"]["embedding_requests"] != 2 * args.subjective:
+        failures.append("subjective answers were not scored through embeddings")
+    return finish(results, failures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# skill_validation_system/benchmarks/serialization.py
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+from benchmarks.micro import scratch_workdir, finish
+
+
+def _responses(count):
+    from models.response import Response
+    return [
+        Response(f"candidate-{i % 5000}", f"assessment-{i % 800}", f"Answer {i}: use an index on the join column.",
+                 score=round((i % 100) / 10, 1), flagged=i % 17 == 0, id=f"response-{i:08d}")
+        for i in range(count)
+    ]
+
+
+def _allocated_mb(build):
+    """Returns the memory held by what `build()` returns, in MB."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return round(size / 1024 / 1024, 2)
+
+
+def _per_second(count, func):
+    started = time.perf_counter()
+    result = func()
+    return round(count / (time.perf_counter() - started)), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure record memory and snapshot encode/decode throughput.")
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    scratch_workdir("serialization")
+    from models.response import Response
+    from utils import file_handler
+
+    count = args.records
+    results, failures = {"records": count, "memory_mb": {}, "formats": {}}, []
+    dicts = [r.to_dict() for r in _responses(count)]
+    # Both include the field values the records hold
+    results["memory_mb"]["models"] = _allocated_mb(lambda: _responses(count))
+    results["memory_mb"]["dicts"] = _allocated_mb(lambda: [r.to_dict() for r in _responses(count)])
+    if results["memory_mb"]["models"] >= results["memory_mb"]["dicts"]:
+        failures.append("slot-based models do not take less memory than their dicts")
+
+    formats = ["json"] + (["msgpack"] if file_handler.msgpack is not None else [])
+    path = os.path.abspath("responses.json")
+    for data_format in formats:
+        file_handler.DATA_FORMAT = data_format
+        encode_rate, _ = _per_second(count, lambda: os.replace(file_handler.stage_records(path, dicts), file_handler.data_path(path)))
+        decode_rate, loaded = _per_second(count, lambda: file_handler.read_records(path))
+        hydrate_rate, hydrated = _per_second(count, lambda: [Response.from_dict(d) for d in loaded])
+        if loaded != dicts or hydrated[-1].to_dict() != dicts[-1]:
+            failures.append(f"{data_format}: the records read back differ from those written")
+        results["formats"][data_format] = {
+            "bytes": os.path.getsize(file_handler.data_path(path)),
+            "encode_per_second": encode_rate, "decode_per_second": decode_rate,
+            "hydrate_per_second": hydrate_rate,
+        }
+    if "msgpack" in results["formats"]:
+        packed, text = results["formats"]["msgpack"], results["formats"]["json"]
+        if packed["bytes"] >= text["bytes"]:
+            failures.append("msgpack snapshots are not smaller than JSON ones")
+    else:
+        results["formats"]["msgpack"] = "not installed"
+    return finish(results, failures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
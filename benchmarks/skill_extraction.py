@@ -0,0 +1,57 @@
+# skill_validation_system/benchmarks/skill_extraction.py
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmarks.micro import finish
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "skills_labeled.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the local skill extractor against labeled resumes and measure its throughput.")
+    parser.add_argument("--min-precision", type=float, default=0.9)
+    parser.add_argument("--min-recall", type=float, default=0.85)
+    parser.add_argument("--min-rate", type=float, default=1000, help="Resumes per second, at about 3 KB each.")
+    parser.add_argument("--seconds", type=float, default=2.0, help="How long to measure the throughput for.")
+    args = parser.parse_args()
+
+    from utils.skills import extract_skills_from_text
+
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+    results, failures = {"resumes": len(fixture), "errors": {}}, []
+    true_positives = found_total = expected_total = 0
+    for entry in fixture:
+        found, expected = set(extract_skills_from_text(entry["text"])), set(entry["skills"])
+        true_positives += len(found & expected)
+        found_total += len(found)
+        expected_total += len(expected)
+        if found != expected:
+            results["errors"][entry["id"]] = {"unexpected": sorted(found - expected), "missed": sorted(expected - found)}
+    results["precision"] = round(true_positives / found_total, 4) if found_total else 0.0
+    results["recall"] = round(true_positives / expected_total, 4) if expected_total else 0.0
+    if results["precision"] < args.min_precision:
+        failures.append(f"precision {results['precision']} is below {args.min_precision}")
+    if results["recall"] < args.min_recall:
+        failures.append(f"recall {results['recall']} is below {args.min_recall}")
+
+    # A resume of typical length: the labeled texts one after another
+    text = "\n\n".join(entry["text"] for entry in fixture)
+    resumes, started = 0, time.perf_counter()
+    while time.perf_counter() - started < args.seconds:
+        extract_skills_from_text(text)
+        resumes += 1
+    results["resume_bytes"] = len(text.encode("utf-8"))
+    results["resumes_per_second"] = round(resumes / (time.perf_counter() - started), 1)
+    if results["resumes_per_second"] < args.min_rate:
+        failures.append(f"{results['resumes_per_second']} resumes/s is below {args.min_rate}")
+    return finish(results, failures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
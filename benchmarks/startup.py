@@ -0,0 +1,77 @@
+# skill_validation_system/benchmarks/startup.py
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Imported lazily by the app; importing `app` must not load them (see utils/warmup.py).
+HEAVY_MODULES = ("numpy", "faiss", "PyPDF2", "docx", "httpx", "openai")
+
+
+def _parse_importtime(stderr):
+    """Returns {module: cumulative microseconds} from `python -X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented; the name itself has no spaces
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def _run(code, workdir):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True)
+    return time.perf_counter() - started, result
+
+
+def measure_startup(runs=5, module="app"):
+    """
+    Measures how long a fresh interpreter takes to import the app, with
+    `python -X importtime`, and how long the warm-up of the lazily imported
+    libraries takes afterwards (what a preloading gunicorn master saves each worker).
+
+    Args:
+        runs (int, optional): Interpreter starts to take the median of.
+        module (str, optional): The module to import.
+
+    Returns:
+        dict: Median "import_ms" and "process_ms" (whole interpreter run), median
+        "warmup_ms", the heavy modules the import loaded ("heavy_modules_loaded",
+        which should be empty), and the slowest imports of the median run.
+    """
+    workdir = tempfile.mkdtemp(prefix="skill-startup-")
+    imports, processes, warmups, parsed = [], [], [], []
+    for _ in range(runs):
+        elapsed, result = _run(f"import {module}", workdir)
+        modules = _parse_importtime(result.stderr)
+        imports.append(modules.get(module, 0) / 1000)
+        processes.append(elapsed * 1000)
+        parsed.append(modules)
+        _, result = _run(
+            f"import json, {module}; from utils.warmup import warm_up; print(json.dumps(warm_up()))", workdir
+        )
+        warmups.append(sum(json.loads(result.stdout.strip().splitlines()[-1]).values()) * 1000)
+
+    median_run = parsed[sorted(range(runs), key=lambda i: imports[i])[runs // 2]]
+    slowest = sorted(median_run.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "runs": runs,
+        "import_ms": round(statistics.median(imports), 1),
+        "process_ms": round(statistics.median(processes), 1),
+        "warmup_ms": round(statistics.median(warmups), 1),
+        "heavy_modules_loaded": sorted(m for m in HEAVY_MODULES if any(m in modules for modules in parsed)),
+        "slowest_imports_ms": {name: round(us / 1000, 1) for name, us in slowest[:10]},
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(measure_startup(), indent=2))
@@ -0,0 +1,66 @@
+# skill_validation_system/benchmarks/storage_scaling.py
+
+import argparse
+import itertools
+import random
+import sys
+
+from benchmarks.micro import scratch_workdir, use_dataset, median_ms, finish
+
+# Latency of the storage helpers the request handlers use, for each backend on
+# datasets of growing size. Lookups and writes go through indexes (SQLite) or the
+# cached collections and the journal (JSON), so their cost must not grow with the
+# number of rows.
+
+# A per-operation time at the largest size may exceed the smallest size's by this
+# factor plus the slack, to absorb timer and fsync noise
+_FLAT_FACTOR = 3.0
+_FLAT_SLACK_MS = 0.2
+
+
+def _operations(ids):
+    from models.response import Response
+    from utils import helpers
+
+    ids = itertools.cycle(ids)
+    return {
+        "get_candidate": lambda: helpers.get_candidate_by_id(next(ids)),
+        "responses_of_candidate": lambda: helpers.get_responses_by_candidate_id(next(ids)),
+        "update_candidate": lambda: helpers.update_candidate(helpers.get_candidate_by_id(next(ids))),
+        "save_response": lambda: helpers.save_responses([Response(next(ids), "benchmark", "A", score=50.0)]),
+        "dashboard_page": lambda: helpers.get_candidates_page(sort="score", descending=True),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that storage operations stay flat as the row count grows.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000], help="Candidates per dataset.")
+    parser.add_argument("--questions", type=int, default=5, help="Responses per candidate.")
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"])
+    parser.add_argument("--number", type=int, default=50, help="Calls per timing sample.")
+    args = parser.parse_args()
+
+    root = scratch_workdir("storage")
+    results, failures = {"sizes": args.sizes, "backends": {}}, []
+    for backend in args.backends:
+        timings = results["backends"][backend] = {}
+        for size in args.sizes:
+            repository = use_dataset(root, backend, size, args.questions)
+            ids = repository.values("candidates", "id")
+            ids = [row[0] for row in random.Random(size).sample(ids, min(len(ids), 500))]
+            operations = _operations(ids)
+            timings[size] = {}
+            for name, operation in operations.items():
+                operation()
+                timings[size][name] = median_ms(operation, repeat=5, number=args.number)
+
+        smallest, largest = timings[args.sizes[0]], timings[args.sizes[-1]]
+        for name in smallest:
+            if largest[name] > smallest[name] * _FLAT_FACTOR + _FLAT_SLACK_MS:
+                failures.append(f"{backend} {name}: {largest[name]} ms at {args.sizes[-1]} candidates against "
+                                f"{smallest[name]} ms at {args.sizes[0]}")
+    return finish(results, failures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# skill_validation_system/benchmarks/storage_stress.py
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+from benchmarks.micro import scratch_workdir, finish
+
+# Parallel writers against the JSON backend: several processes with several
+# threads each append to the same journals while compactions run, and readers
+# check that what they see only ever grows. At the end every record must be
+# present exactly once, with the last value its writer saved.
+
+
+def _writer(process, threads, records, queue):
+    from models.question_bank_entry import QuestionBankEntry
+    from models.response import Response
+    from utils.storage import get_repository
+
+    repository = get_repository()
+    errors, hit_ms = [], []
+    done = threading.Event()
+
+    def write(thread):
+        progress = QuestionBankEntry(id=f"writer-{process}-{thread}", skill="stress", created_at=0, served_count=0)
+        for i in range(records):
+            repository.insert_many("responses", [
+                Response(f"c{process}", f"a{thread}", f"answer {i}", id=f"{process}-{thread}-{i}")
+            ])
+            progress.served_count = i + 1
+            repository.update("question_bank", progress)
+
+    def read():
+        # Within one process the visible collection may only grow, and cache hits on
+        # a collection nobody writes must not wait for the writers or compactions
+        seen = 0
+        while not done.is_set():
+            count = len(repository.values("responses", "id"))
+            if count < seen:
+                errors.append(f"process {process} saw {count} responses after {seen}")
+            seen = count
+            started = time.perf_counter()
+            repository.get("candidates", "none")
+            hit_ms.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.001)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    workers = [threading.Thread(target=write, args=(t,)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    done.set()
+    reader.join()
+    compactions = sum(s["compactions"] for s in repository.cache_stats().values())
+    queue.put({"errors": errors, "compactions": compactions, "max_hit_ms": max(hit_ms, default=0)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress the JSON journal with parallel writer processes.")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--records", type=int, default=200, help="Records written per thread.")
+    parser.add_argument("--compact-bytes", type=int, default=32 * 1024)
+    args = parser.parse_args()
+
+    scratch_workdir("stress")
+    # Read by config.py in this process and in the spawned writers
+    os.environ["STORAGE_BACKEND"] = "json"
+    os.environ["JOURNAL_COMPACT_BYTES"] = str(args.compact_bytes)
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    started = time.perf_counter()
+    processes = [context.Process(target=_writer, args=(p, args.threads, args.records, queue))
+                 for p in range(args.processes)]
+    for process in processes:
+        process.start()
+    reports = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    seconds = time.perf_counter() - started
+
+    from config import RESPONSES_FILE
+    from utils.storage import get_repository
+
+    failures = [error for report in reports for error in report["errors"]]
+    failures += [f"writer process exited with {p.exitcode}" for p in processes if p.exitcode]
+    repository = get_repository()
+    expected = {f"{p}-{t}-{i}" for p in range(args.processes) for t in range(args.threads) for i in range(args.records)}
+    ids = [r.id for r in repository.all("responses")]
+    if len(ids) != len(set(ids)):
+        failures.append(f"{len(ids) - len(set(ids))} responses are stored twice")
+    if set(ids) != expected:
+        failures.append(f"{len(expected - set(ids))} responses are missing, {len(set(ids) - expected)} unexpected")
+    stale = [e.id for e in repository.find("question_bank", "skill", "stress") if e.served_count != args.records]
+    if stale or len(repository.all("question_bank")) != args.processes * args.threads:
+        failures.append(f"{len(stale)} progress records do not hold their last write")
+    with open(RESPONSES_FILE + ".journal", "rb") as f:
+        for line in f:
+            try:
+                json.loads(line)
+            except ValueError:
+                failures.append("the journal holds a torn line")
+                break
+
+    # Returned records are copies: changing one changes nothing until it is saved
+    record = repository.get("responses", "0-0-0")
+    record.score = 99.0
+    if repository.get("responses", "0-0-0").score == 99.0:
+        failures.append("a returned record is shared with the cache")
+    repository.update("responses", record)
+    if repository.get("responses", "0-0-0").score != 99.0:
+        failures.append("an updated record was not saved")
+
+    compactions = sum(r["compactions"] for r in reports)
+    if compactions == 0:
+        failures.append("no compaction ran; lower --compact-bytes")
+    results = {
+        "writes": len(expected) * 2, "seconds": round(seconds, 2),
+        "writes_per_second": round(len(expected) * 2 / seconds, 1),
+        "compactions": compactions,
+        "max_cache_hit_ms": round(max(r["max_hit_ms"] for r in reports), 3),
+    }
+    return finish(results, failures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
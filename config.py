@@ -1,5 +1,30 @@
 import os
+import time
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "your_openai_api_key")
+# Optional override of the API endpoint, e.g. a local mock server for testing.
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL") or None
+
+# --- LLM Client Configuration ---
+# Size of the shared HTTP connection pool used for OpenAI requests.
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", 20))
+# Seconds before a single request attempt is abandoned.
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", 120))
+# Retries (with exponential backoff) on 429, 5xx, timeouts and connection errors.
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 4))
+# Per-endpoint limits: concurrent requests, requests per second (0 = unlimited) and
+# the delay in seconds after which a slow request is hedged (0 = never).
+LLM_ENDPOINT_LIMITS = {
+    "chat": {
+        "concurrency": int(os.environ.get("LLM_CHAT_CONCURRENCY", 4)),
+        "rate": float(os.environ.get("LLM_CHAT_RPS", 0)),
+        "hedge_after": 0,
+    },
+    "embeddings": {
+        "concurrency": int(os.environ.get("LLM_EMBEDDING_CONCURRENCY", 8)),
+        "rate": float(os.environ.get("LLM_EMBEDDING_RPS", 0)),
+        "hedge_after": float(os.environ.get("LLM_EMBEDDING_HEDGE_AFTER", 5)),
+    },
+}
 
 # --- File Paths ---
 # Defines the paths for data storage and uploads.
@@ -7,14 +32,169 @@ UPLOAD_FOLDER = 'static/uploads'
 CANDIDATES_FILE = 'data/candidates.json'
 ASSESSMENTS_FILE = 'data/assessments.json'
 RESPONSES_FILE = 'data/responses.json'
+CANDIDATE_STATS_FILE = 'data/candidate_stats.json'
+QUESTION_BANK_FILE = 'data/question_bank.json'
 FAISS_INDEX_PATH = 'faiss_index/skill_assessment.index'
+FAISS_IDS_DB_PATH = 'faiss_index/vector_ids.db'
+
+# --- Resume Extraction Configuration ---
+# Uploads larger than this are rejected while they stream in.
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+# Extracted resume text and skills are cached here, keyed by the file's content hash.
+EXTRACT_CACHE_DIR = 'data/extracted_text'
+SKILLS_CACHE_DIR = 'data/resume_skills'
+# Pages beyond this limit are ignored.
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", 100))
+# PDFs with at least this many pages are split across worker processes.
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 8))
+PDF_EXTRACT_WORKERS = int(os.environ.get("PDF_EXTRACT_WORKERS", min(os.cpu_count() or 1, 4)))
+# Seconds after which extraction stops and keeps the text read so far.
+EXTRACT_TIMEOUT = float(os.environ.get("EXTRACT_TIMEOUT", 30))
+
+# How skills are extracted from resumes: "local" (skill taxonomy only),
+# "local_then_llm" (ask the LLM only when the taxonomy finds fewer than
+# SKILL_LOCAL_MIN_SKILLS skills) or "llm" (always ask the LLM).
+SKILL_EXTRACTION_MODE = os.environ.get("SKILL_EXTRACTION_MODE", "local_then_llm")
+SKILL_LOCAL_MIN_SKILLS = int(os.environ.get("SKILL_LOCAL_MIN_SKILLS", 5))
+# Token budget for the resume text sent to the LLM; the least useful sections are dropped first.
+RESUME_TOKEN_BUDGET = int(os.environ.get("RESUME_TOKEN_BUDGET", 2000))
+# At most this many skills are listed in an assessment generation prompt.
+MAX_PROMPT_SKILLS = int(os.environ.get("MAX_PROMPT_SKILLS", 40))
+
+# --- Storage Configuration ---
+# The repository backend used by utils/helpers.py: "json" (the data/*.json files)
+# or "sqlite" (a single indexed database, see `flask --app app migrate-storage`).
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json")
+SQLITE_DB_PATH = os.environ.get("SQLITE_DB_PATH", 'data/skill_validation.db')
+# File format of the json backend's collections: "json" (compact) or "msgpack"
+# (binary, needs the msgpack package).
+DATA_FORMAT = os.environ.get("DATA_FORMAT", "json")
+# Number of candidates shown per page on the HR dashboard.
+DASHBOARD_PAGE_SIZE = int(os.environ.get("DASHBOARD_PAGE_SIZE", 25))
+
+# The json backend appends writes to a journal next to each file. Journals are
+# fsynced once per write call and folded into the snapshot once they reach this size.
+JOURNAL_FSYNC = os.environ.get("JOURNAL_FSYNC", "1") != "0"
+JOURNAL_COMPACT_BYTES = int(os.environ.get("JOURNAL_COMPACT_BYTES", 4 * 1024 * 1024))
+
+# --- Background Job Configuration ---
+# Resume processing runs as queued jobs so uploads return immediately.
+JOBS_DB_PATH = os.environ.get("JOBS_DB_PATH", 'data/jobs.db')
+# Worker threads started inside each web process. Set to 0 when jobs are consumed
+# by separate `flask --app app run-workers` processes instead.
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+# Seconds an idle worker waits before checking the queue again.
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 0.5))
+# Seconds without progress after which a running job is assumed lost and handed out again.
+JOB_TIMEOUT = int(os.environ.get("JOB_TIMEOUT", 600))
+# Seconds between the heartbeats a worker records while its job runs, so a slow job
+# that is still alive is never mistaken for a lost one.
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get("JOB_HEARTBEAT_INTERVAL", 30))
+
+# --- Bulk Ingestion Configuration ---
+# Reports of bulk ingestion runs; an interrupted run resumes from its report.
+BULK_INGEST_DIR = 'data/bulk_ingest'
+# Largest archive accepted by the bulk upload endpoint.
+BULK_MAX_ARCHIVE_BYTES = int(os.environ.get("BULK_MAX_ARCHIVE_BYTES", 500 * 1024 * 1024))
+# Resumes per batch: candidates and assessments are written once per batch.
+BULK_BATCH_SIZE = int(os.environ.get("BULK_BATCH_SIZE", 50))
+# Processes extracting resume text, and resumes whose skills and assessments are
+# generated at the same time.
+BULK_EXTRACT_WORKERS = int(os.environ.get("BULK_EXTRACT_WORKERS", os.cpu_count() or 1))
+BULK_CONCURRENCY = int(os.environ.get("BULK_CONCURRENCY", 4))
 
 # --- Assessment Configuration ---
 # The model used for generating assessment questions.
 ASSESSMENT_MODEL = "gpt-4"
 # The model used for generating embeddings for scoring.
 EMBEDDING_MODEL = "text-embedding-ada-002"
+# Embeddings are cached per model and text: an in-memory LRU per worker in front of
+# a memory-mapped store on disk that every worker on the host shares.
+EMBEDDING_CACHE_DIR = 'data/embedding_cache'
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.environ.get("EMBEDDING_CACHE_MEMORY_ITEMS", 10000))
+EMBEDDING_CACHE_MAX_ITEMS = int(os.environ.get("EMBEDDING_CACHE_MAX_ITEMS", 500000))
+# Maximum number of texts sent in a single embeddings request.
+EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE", 512))
+
+# --- Candidate Search Configuration ---
+# The talent pool index switches from exact search to an IVF index at this many vectors.
+FAISS_IVF_THRESHOLD = int(os.environ.get("FAISS_IVF_THRESHOLD", 50000))
+# IVF clusters scanned per query; higher is more accurate but slower.
+FAISS_NPROBE = int(os.environ.get("FAISS_NPROBE", 16))
+# Index changes logged before they are merged into a new snapshot of the index.
+FAISS_MERGE_CHANGES = int(os.environ.get("FAISS_MERGE_CHANGES", 10000))
+
+# --- Bulk Re-scoring Configuration ---
+# Progress of `flask rescore-responses`, so an interrupted run can resume.
+RESCORE_CHECKPOINT_FILE = 'data/rescore_checkpoint.json'
+RESCORE_BATCH_SIZE = int(os.environ.get("RESCORE_BATCH_SIZE", 2000))
+
+# --- Export Configuration ---
+# Candidates read per batch by `flask export-data` and /hr/export.
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 500))
+
+# --- Metrics Configuration ---
+# Prometheus metrics are served at /metrics. Per-request traces (the spans of one
+# request, returned in a Server-Timing header and listed at /hr/traces) are opt-in:
+# "off", "header" (requests sent with "X-Trace: 1") or "all".
+TRACE_REQUESTS = os.environ.get("TRACE_REQUESTS", "off")
+# Number of recent traces each worker keeps for /hr/traces.
+TRACE_BUFFER_SIZE = int(os.environ.get("TRACE_BUFFER_SIZE", 200))
+# Each worker process writes its metrics to a file here every METRICS_FLUSH_SECONDS
+# (and when scraped), and /metrics sums the files of every worker, so any worker can
+# answer a scrape. Set to "" to serve only the scraped process's own metrics.
+METRICS_DIR = os.environ.get("METRICS_DIR", "data/metrics")
+METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", 5))
+
+# --- Question Bank Configuration ---
+# Generated questions are banked per canonical skill and reused for later candidates,
+# so the LLM is only asked about skills the bank does not cover yet.
+QUESTION_BANK_ENABLED = os.environ.get("QUESTION_BANK_ENABLED", "1") == "1"
+# The maximum number of skills assessed per candidate.
+MAX_ASSESSMENT_SKILLS = int(os.environ.get("MAX_ASSESSMENT_SKILLS", 20))
+# A skill counts as covered once it has this many fresh questions; until then new
+# ones are generated, so candidates are spread over several variants.
+QUESTION_BANK_MIN_VARIANTS = int(os.environ.get("QUESTION_BANK_MIN_VARIANTS", 3))
+# Questions are retired after this many days or after being served this many times.
+QUESTION_BANK_MAX_AGE_DAYS = float(os.environ.get("QUESTION_BANK_MAX_AGE_DAYS", 30))
+QUESTION_BANK_MAX_SERVES = int(os.environ.get("QUESTION_BANK_MAX_SERVES", 50))
 
 # --- Application Configuration ---
-# Secret key for Flask session management.
-SECRET_KEY = os.urandom(24)
+# Secret key for Flask session management. It must be the same in every worker
+# and on every host, so set SECRET_KEY in the environment when deploying. Without
+# it a key is generated once and kept in SECRET_KEY_FILE, which is enough for
+# several workers on one host. The app loads it when it is built (app.py), so
+# importing config has no side effects.
+SECRET_KEY_FILE = os.environ.get("SECRET_KEY_FILE", 'data/secret_key')
+
+def load_secret_key():
+    if os.environ.get("SECRET_KEY"):
+        return os.environ["SECRET_KEY"]
+    os.makedirs(os.path.dirname(SECRET_KEY_FILE) or ".", exist_ok=True)
+    try:
+        # O_EXCL: when several workers start at once, exactly one creates the key
+        fd = os.open(SECRET_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another worker may still be writing it
+        for _ in range(50):
+            with open(SECRET_KEY_FILE, "r", encoding="ascii") as f:
+                key = f.read().strip()
+            if key:
+                return key
+            time.sleep(0.1)
+        raise RuntimeError(f"{SECRET_KEY_FILE} is empty; delete it or set SECRET_KEY.")
+    key = os.urandom(32).hex()
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(key)
+    return key
+
+# --- Session Configuration ---
+# Where applicant sessions are kept: "sqlite" (SESSIONS_DB_PATH, shared by every
+# worker on the host), "redis" (REDIS_URL, shared across hosts) or "cookie"
+# (Flask's signed cookies, the original behaviour). The cookie then only carries
+# an opaque, signed session ID.
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "sqlite")
+SESSIONS_DB_PATH = os.environ.get("SESSIONS_DB_PATH", 'data/sessions.db')
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+# Seconds of inactivity after which a session expires.
+SESSION_LIFETIME = int(os.environ.get("SESSION_LIFETIME", 24 * 3600))
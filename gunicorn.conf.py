@@ -0,0 +1,18 @@
+# skill_validation_system/gunicorn.conf.py
+
+import gc
+
+# Gunicorn picks this file up from the working directory (`gunicorn app:app`).
+# The app is imported once in the master and the workers are forked from it, so
+# they start without importing anything and share the master's memory pages.
+preload_app = True
+
+
+def when_ready(server):
+    """Loads the lazily imported libraries in the master before any worker is forked."""
+    from utils.warmup import warm_up
+    timings = warm_up()
+    server.log.info("Warm-up imported %s in %.2fs", ", ".join(timings), sum(timings.values()))
+    # Keep the garbage collector from touching (and so copying) the shared objects in every worker
+    if hasattr(gc, "freeze"):
+        gc.freeze()
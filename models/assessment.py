@@ -6,6 +6,8 @@ class Assessment:
     """
     Represents an assessment for a specific skill.
     """
+    __slots__ = ("id", "skill", "question", "question_type", "model_answer")
+
     def __init__(self, skill, question, question_type, model_answer=None, id=None):
         """
         Initializes an Assessment object.
@@ -6,6 +6,8 @@ class Candidate:
     """
     Represents a candidate in the system.
     """
+    __slots__ = ("id", "name", "email", "resume_path", "skills", "validated_skills")
+
     def __init__(self, name, email, resume_path, skills=None, validated_skills=None, id=None):
         """
         Initializes a Candidate object.
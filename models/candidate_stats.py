@@ -0,0 +1,58 @@
+# skill_validation_system/models/candidate_stats.py
+
+import time
+
+class CandidateStats:
+    """
+    Precomputed per-candidate aggregates used to sort and filter the HR dashboard.
+    They are maintained by the write helpers in utils/helpers.py.
+    """
+    __slots__ = ("id", "mean_score", "flagged_count", "response_count", "skills", "seq")
+
+    def __init__(self, id, mean_score=None, flagged_count=0, response_count=0, skills=None, seq=None):
+        """
+        Initializes a CandidateStats object.
+
+        Args:
+            id (str): The ID of the candidate these aggregates belong to.
+            mean_score (float, optional): The mean of the candidate's validated skill scores. Defaults to None.
+            flagged_count (int, optional): The number of flagged responses. Defaults to 0.
+            response_count (int, optional): The number of submitted responses. Defaults to 0.
+            skills (list, optional): Lower-cased claimed and validated skills, for filtering. Defaults to None.
+            seq (int, optional): A monotonically increasing registration order. Defaults to the current time.
+        """
+        self.id = id
+        self.mean_score = mean_score
+        self.flagged_count = flagged_count
+        self.response_count = response_count
+        self.skills = skills or []
+        self.seq = seq if seq is not None else time.time_ns()
+
+    @property
+    def sort_score(self):
+        """The mean score as a sort key; candidates still pending sort below every score."""
+        return self.mean_score if self.mean_score is not None else -1.0
+
+    def to_dict(self):
+        """Converts the CandidateStats object to a dictionary."""
+        return {
+            "id": self.id,
+            "mean_score": self.mean_score,
+            "sort_score": self.sort_score,
+            "flagged_count": self.flagged_count,
+            "response_count": self.response_count,
+            "skills": self.skills,
+            "seq": self.seq
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """Creates a CandidateStats object from a dictionary."""
+        return CandidateStats(
+            id=data.get("id"),
+            mean_score=data.get("mean_score"),
+            flagged_count=data.get("flagged_count") or 0,
+            response_count=data.get("response_count") or 0,
+            skills=data.get("skills"),
+            seq=data.get("seq")
+        )
@@ -0,0 +1,44 @@
+# skill_validation_system/models/question_bank_entry.py
+
+import time
+
+class QuestionBankEntry:
+    """
+    Records that a generated assessment can be reused for other candidates
+    claiming the same skill.
+    """
+    __slots__ = ("id", "skill", "created_at", "served_count")
+
+    def __init__(self, id, skill, created_at=None, served_count=0):
+        """
+        Initializes a QuestionBankEntry object.
+
+        Args:
+            id (str): The ID of the reusable Assessment.
+            skill (str): The canonical skill key (see utils/skills.py) the question covers.
+            created_at (float, optional): When the question was generated. Defaults to now.
+            served_count (int, optional): How many candidates have been given the question. Defaults to 0.
+        """
+        self.id = id
+        self.skill = skill
+        self.created_at = created_at if created_at is not None else time.time()
+        self.served_count = served_count
+
+    def to_dict(self):
+        """Converts the QuestionBankEntry object to a dictionary."""
+        return {
+            "id": self.id,
+            "skill": self.skill,
+            "created_at": self.created_at,
+            "served_count": self.served_count
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """Creates a QuestionBankEntry object from a dictionary."""
+        return QuestionBankEntry(
+            id=data.get("id"),
+            skill=data.get("skill"),
+            created_at=data.get("created_at"),
+            served_count=data.get("served_count") or 0
+        )
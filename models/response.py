@@ -4,6 +4,8 @@ class Response:
     """
     Represents a candidate's response to an assessment.
     """
+    __slots__ = ("id", "candidate_id", "assessment_id", "answer", "score", "flagged")
+
     def __init__(self, candidate_id, assessment_id, answer, score=0.0, flagged=False, id=None):
         """
         Initializes a Response object.
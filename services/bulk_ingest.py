@@ -0,0 +1,311 @@
+# skill_validation_system/services/bulk_ingest.py
+
+import csv
+import io
+import json
+import multiprocessing
+import os
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from config import (
+    UPLOAD_FOLDER, BULK_INGEST_DIR, BULK_BATCH_SIZE, BULK_EXTRACT_WORKERS, BULK_CONCURRENCY
+)
+from models.candidate import Candidate
+from services.job_queue import job_handler, report_progress, JobError
+from services.question_bank import build_assessment, DeferredWrites
+from services.resume_parser import extract_skills_from_resume
+from utils.file_handler import (
+    read_file_content, save_stream, file_digest, write_text_atomic, UploadTooLargeError
+)
+from utils.helpers import save_candidates
+
+BULK_INGEST = "bulk_ingest"
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+MANIFEST_NAMES = ("manifest.csv", "manifest.json")
+
+# Outcomes of a file in the report
+OK, FAILED = "ok", "failed"
+
+
+# --- Inputs ---
+
+def _parse_manifest(name, data):
+    """
+    Parses a manifest of the candidates in a batch: a CSV file with a header row of
+    filename,name,email, or a JSON list of objects with those keys. A filename is
+    the file's path relative to the batch (e.g. "sales/jane.pdf"), or just its name
+    when no other file in the batch has the same one.
+
+    Returns:
+        dict: {lower-cased relative path: {"name": ..., "email": ...}}
+    """
+    text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+    if name.lower().endswith(".json"):
+        rows = json.loads(text)
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+    manifest = {}
+    for row in rows:
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        if row.get("filename"):
+            manifest[_relative_name(row["filename"]).lower()] = {"name": row.get("name"), "email": row.get("email")}
+    return manifest
+
+def _relative_name(path):
+    """Normalizes a path inside a batch to "/"-separated form without a leading "./"."""
+    parts = [p for p in path.replace("\\", "/").split("/") if p and p != "."]
+    return "/".join(parts)
+
+def _manifest_entry(manifest, name, basename_counts):
+    """
+    Finds the manifest row of a file by its relative path, or by its base name when
+    that is unique among the batch's files and the manifest names it without a folder.
+    """
+    entry = manifest.get(name.lower())
+    if entry is None:
+        basename = name.rsplit("/", 1)[-1].lower()
+        if basename_counts.get(basename) == 1:
+            entry = manifest.get(basename)
+    return entry
+
+def _collect_resumes(source):
+    """
+    Copies the resumes of a directory or zip archive into UPLOAD_FOLDER, stored
+    under their content hash like single uploads, and finds a manifest inside it.
+
+    Files are named by their path relative to the directory or archive root, so
+    files with the same name in different folders stay apart.
+
+    Returns:
+        tuple: ([(relative path, stored path or None, error or None)], manifest or None)
+    """
+    files, manifest = [], None
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for member in archive.infolist():
+                name = os.path.basename(member.filename)
+                if member.is_dir() or not name or name.startswith("."):
+                    continue
+                if name.lower() in MANIFEST_NAMES:
+                    manifest = _parse_manifest(name, archive.read(member))
+                elif name.lower().endswith(RESUME_EXTENSIONS):
+                    with archive.open(member) as stream:
+                        files.append(_store(_relative_name(member.filename), stream))
+    elif os.path.isdir(source):
+        for root, dirs, names in os.walk(source):
+            dirs.sort()
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                if name.lower() in MANIFEST_NAMES:
+                    with open(path, "rb") as f:
+                        manifest = _parse_manifest(name, f.read())
+                elif name.lower().endswith(RESUME_EXTENSIONS):
+                    with open(path, "rb") as stream:
+                        files.append(_store(_relative_name(os.path.relpath(path, source)), stream))
+    else:
+        raise ValueError(f"{source} is neither a directory nor a zip archive")
+    return files, manifest
+
+def _store(name, stream):
+    # The size limit applies to each file, and to what it inflates to for archives
+    try:
+        return name, save_stream(stream, os.path.basename(name), UPLOAD_FOLDER), None
+    except UploadTooLargeError as e:
+        return name, None, str(e)
+
+def _run_id(source, manifest_path):
+    """Identifies a run by its inputs, so running the same batch again resumes it."""
+    parts = [file_digest(source) if os.path.isfile(source) else os.path.abspath(source)]
+    if manifest_path:
+        parts.append(file_digest(manifest_path))
+    return uuid.uuid5(uuid.NAMESPACE_URL, "bulk:" + ":".join(parts)).hex
+
+# --- Processing ---
+
+def _extract_text(path):
+    """Extracts (and caches) a resume's text. Runs in a worker process."""
+    return bool(read_file_content(path).strip())
+
+def _process_resume(entry, resume_path):
+    """
+    Extracts the skills and builds the assessment of one resume, without saving.
+
+    Returns:
+        tuple: (Candidate, assessments, DeferredWrites)
+    """
+    skills = extract_skills_from_resume(resume_path)
+    if not skills:
+        raise JobError("No skills could be identified in the resume.")
+    # The same file for the same person always maps to the same candidate, and the
+    # candidate's new questions to the same assessment IDs, so a batch written again
+    # after a crash or with restart=True replaces its records instead of duplicating them
+    candidate_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"bulk:{file_digest(resume_path)}:{entry['email'].lower()}"))
+    deferred = DeferredWrites()
+    assessments = build_assessment(skills, deferred=deferred, id_seed=candidate_id)
+    if not assessments:
+        raise JobError("The assessment could not be generated.")
+    candidate = Candidate(
+        id=candidate_id, name=entry["name"], email=entry["email"],
+        resume_path=os.path.relpath(resume_path, "static"), skills=skills,
+    )
+    return candidate, assessments, deferred
+
+def _summary(report):
+    counts = {}
+    for outcome in report["files"].values():
+        counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+    return {"run_id": report["run_id"], "total": len(report["files"]), "counts": counts,
+            "files_per_second": report.get("files_per_second")}
+
+def ingest_resumes(source, manifest_path=None, workers=None, concurrency=None, batch_size=None,
+                   restart=False, on_progress=None):
+    """
+    Creates candidates and their assessments for a batch of resumes.
+
+    Resume text is extracted in parallel worker processes, and skill extraction
+    and assessment generation run for `concurrency` resumes at a time. Each batch
+    of resumes is written together: one write for its candidates, their stats,
+    the assessments and the question bank. The report, with the outcome of every
+    file, is saved after each batch in BULK_INGEST_DIR/<run id>.json; running the
+    same inputs again skips the files that already succeeded.
+
+    Args:
+        source (str): A directory or zip archive of .pdf/.docx resumes. A
+            manifest.csv or manifest.json inside it is used when `manifest_path`
+            is not given.
+        manifest_path (str, optional): A manifest of filename,name,email rows.
+        workers (int, optional): Text extraction processes; 0 extracts in this
+            process. Defaults to BULK_EXTRACT_WORKERS.
+        concurrency (int, optional): Resumes processed at once. Defaults to
+            BULK_CONCURRENCY.
+        batch_size (int, optional): Resumes per write. Defaults to BULK_BATCH_SIZE.
+        restart (bool, optional): Ignore the report of an earlier run.
+        on_progress (callable, optional): Called with a summary after every batch.
+
+    Returns:
+        dict: The report: "files" maps each file's relative path to its "status" ("ok" or
+        "failed"), "candidate_id", "assessment_ids" or "error", and "seconds";
+        plus the run's "seconds" and "files_per_second".
+    """
+    workers = BULK_EXTRACT_WORKERS if workers is None else workers
+    concurrency = concurrency or BULK_CONCURRENCY
+    batch_size = batch_size or BULK_BATCH_SIZE
+
+    run_id = _run_id(source, manifest_path)
+    report_path = os.path.join(BULK_INGEST_DIR, f"{run_id}.json")
+    report = {"run_id": run_id, "source": source, "files": {}}
+    if not restart and os.path.exists(report_path):
+        with open(report_path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        print(f"Resuming run {run_id}: {sum(o['status'] == OK for o in report['files'].values())} files done.")
+
+    files, manifest = _collect_resumes(source)
+    if manifest_path:
+        with open(manifest_path, "rb") as f:
+            manifest = _parse_manifest(manifest_path, f.read())
+    manifest = manifest or {}
+    basename_counts = {}
+    for name, _, _ in files:
+        basename = name.rsplit("/", 1)[-1].lower()
+        basename_counts[basename] = basename_counts.get(basename, 0) + 1
+
+    pending = []
+    for name, path, error in files:
+        if report["files"].get(name, {}).get("status") == OK:
+            continue
+        entry = _manifest_entry(manifest, name, basename_counts)
+        if error is None and not (entry and entry.get("name") and entry.get("email")):
+            error = "No name and email for this file in the manifest."
+        if error:
+            report["files"][name] = {"status": FAILED, "error": error}
+        else:
+            pending.append((name, path, entry))
+
+    started = time.monotonic()
+    processed = 0
+    pool = None
+    if workers > 0 and pending:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    def extract(batch):
+        paths = [path for _, path, _ in batch]
+        if pool is None:
+            return [_extract_text(path) for path in paths]
+        return list(pool.map(_extract_text, paths))
+
+    try:
+        with ThreadPoolExecutor(max_workers=1) as prefetch, ThreadPoolExecutor(max_workers=concurrency) as threads:
+            # The next batch's text is extracted while the current one is processed
+            next_texts = prefetch.submit(extract, batches[0]) if batches else None
+            for index, batch in enumerate(batches):
+                texts = next_texts.result()
+                if index + 1 < len(batches):
+                    next_texts = prefetch.submit(extract, batches[index + 1])
+                processed += _process_batch(batch, texts, threads, report)
+                report["seconds"] = round(time.monotonic() - started, 2)
+                report["files_per_second"] = round(processed / max(report["seconds"], 0.01), 2)
+                write_text_atomic(report_path, json.dumps(report))
+                if on_progress:
+                    on_progress(_summary(report))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    write_text_atomic(report_path, json.dumps(report))
+    return report
+
+def _process_batch(batch, texts, threads, report):
+    """Processes one batch concurrently and writes its records. Returns the number of files handled."""
+    def run(item):
+        (name, path, entry), has_text = item
+        item_started = time.monotonic()
+        try:
+            if not has_text:
+                raise JobError("No text could be extracted from the file.")
+            result = _process_resume(entry, path)
+        except JobError as e:
+            return name, None, str(e), time.monotonic() - item_started
+        except Exception as e:
+            print(f"Bulk ingestion of {name} failed: {e}")
+            return name, None, "Processing failed with an unexpected error.", time.monotonic() - item_started
+        return name, result, None, time.monotonic() - item_started
+
+    candidates, deferred, outcomes = [], DeferredWrites(), []
+    for name, result, error, seconds in threads.map(run, list(zip(batch, texts))):
+        if error:
+            outcomes.append((name, {"status": FAILED, "error": error, "seconds": round(seconds, 3)}))
+            continue
+        candidate, assessments, writes = result
+        candidates.append(candidate)
+        deferred.merge(writes)
+        outcomes.append((name, {
+            "status": OK, "candidate_id": candidate.id, "skills": len(candidate.skills),
+            "assessment_ids": [a.id for a in assessments], "seconds": round(seconds, 3),
+        }))
+
+    # Assessments first, so a crash in between never leaves candidates without them
+    deferred.save()
+    if candidates:
+        save_candidates(candidates)
+    report["files"].update(outcomes)
+    return len(batch)
+
+@job_handler(BULK_INGEST)
+def bulk_ingest_job(source, manifest_path=None):
+    """
+    Runs a bulk ingestion queued by the bulk upload endpoint, publishing the
+    summary after every batch.
+
+    Returns:
+        dict: The summary and the per-file outcomes.
+    """
+    try:
+        report = ingest_resumes(source, manifest_path, on_progress=report_progress)
+    except (ValueError, zipfile.BadZipFile) as e:
+        raise JobError(f"The archive could not be read: {e}")
+    return {**_summary(report), "files": report["files"]}
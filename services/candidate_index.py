@@ -0,0 +1,421 @@
+# skill_validation_system/services/candidate_index.py
+
+import fcntl
+import os
+import re
+import sqlite3
+import threading
+from config import FAISS_INDEX_PATH, FAISS_IDS_DB_PATH, FAISS_IVF_THRESHOLD, FAISS_NPROBE, FAISS_MERGE_CHANGES
+from services.openai_service import get_embedding, get_embeddings
+from utils.helpers import get_candidate_by_id, get_responses_by_candidate_id, get_assessments_by_ids
+
+# Kinds of indexed vectors
+PROFILE = "profile"
+ANSWER = "answer"
+
+
+class CandidateIndex:
+    """
+    A persistent FAISS index over the talent pool.
+
+    Every candidate contributes one vector for their skill profile and one per
+    answered question. Vector ids are allocated by a SQLite table (FAISS_IDS_DB_PATH)
+    that maps them back to the candidate, so vectors can be added and removed in
+    place without rebuilding. The index starts as an exact inner-product index and
+    is converted to an IVF index once it holds FAISS_IVF_THRESHOLD vectors, which
+    keeps queries in the millisecond range at millions of vectors.
+
+    The index is stored as a snapshot file next to FAISS_INDEX_PATH plus a log of
+    the changes made since, kept in the same SQLite database: an update commits its
+    id mapping and its change records together, and is then applied to the
+    in-memory index. Every process applies only the changes it has not seen yet, so
+    an update costs time in proportion to its own size. Once FAISS_MERGE_CHANGES
+    changes have accumulated, one process writes a new snapshot and truncates the
+    log (`merge`); other processes load the new snapshot the next time they look.
+    """
+
+    def __init__(self, index_path=FAISS_INDEX_PATH, ids_db_path=FAISS_IDS_DB_PATH):
+        self.index_path = index_path
+        self.ids_db_path = ids_db_path
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._index = None
+        self._snapshot = None
+        self._applied = 0
+        self._pending = 0
+
+    # --- Storage ---
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.ids_db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.ids_db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS vectors ("
+                "vid INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE, "
+                "candidate_id TEXT NOT NULL, kind TEXT NOT NULL, weight REAL NOT NULL DEFAULT 1.0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_vectors_candidate ON vectors (candidate_id)")
+            # Changes since the snapshot: the vector added under `vid`, or NULL for a removal
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS changes ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, vid INTEGER NOT NULL, vector BLOB)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._local.conn = conn
+        return conn
+
+    def _snapshot_path(self, name):
+        return os.path.join(os.path.dirname(self.index_path), name)
+
+    def _snapshot_files(self):
+        """The names of the snapshot files on disk: <index file>.<seq>, or the index file itself."""
+        pattern = re.compile(re.escape(os.path.basename(self.index_path)) + r"(\.\d+)?")
+        return [name for name in os.listdir(os.path.dirname(self.index_path) or ".") if pattern.fullmatch(name)]
+
+    def _catch_up(self):
+        """Applies the changes committed since this process last looked. Needs self._lock."""
+        import numpy as np
+        import faiss
+        conn = self._connect()
+        # One read transaction, so the snapshot and the log it continues match
+        conn.execute("BEGIN")
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            snapshot = meta.get("snapshot")
+            snapshot_seq = int(meta.get("snapshot_seq", 0))
+            if snapshot is None and os.path.exists(self.index_path):
+                # An index saved whole, before the change log existed
+                snapshot = os.path.basename(self.index_path)
+            if snapshot != self._snapshot:
+                self._index = faiss.read_index(self._snapshot_path(snapshot)) if snapshot else None
+                self._snapshot = snapshot
+                self._applied = snapshot_seq
+            changes = conn.execute(
+                "SELECT seq, vid, vector FROM changes WHERE seq > ? ORDER BY seq", (self._applied,)
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+
+        # Consecutive changes of the same type are applied as one batch
+        position = 0
+        while position < len(changes):
+            removal = changes[position][2] is None
+            end = position
+            while end < len(changes) and (changes[end][2] is None) == removal:
+                end += 1
+            run = changes[position:end]
+            ids = np.array([vid for _, vid, _ in run], dtype="int64")
+            if removal:
+                if self._index is not None:
+                    self._index.remove_ids(ids)
+            else:
+                vectors = np.vstack([np.frombuffer(vector, dtype="float32") for _, _, vector in run])
+                if self._index is None:
+                    self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(vectors.shape[1]))
+                self._index.add_with_ids(vectors, ids)
+            position = end
+        if changes:
+            self._applied = changes[-1][0]
+        self._pending = self._applied - snapshot_seq
+
+    def _maybe_convert_to_ivf(self):
+        """Swaps the exact index for an IVF index once the pool is large enough. Needs self._lock."""
+        import numpy as np
+        import faiss
+        if isinstance(self._index, faiss.IndexIVF) or self._index.ntotal < FAISS_IVF_THRESHOLD:
+            return
+        count = self._index.ntotal
+        vectors = self._index.index.reconstruct_n(0, count)
+        ids = faiss.vector_to_array(self._index.id_map).astype("int64")
+        nlist = max(1, int(4 * np.sqrt(count)))
+        quantizer = faiss.IndexFlatIP(vectors.shape[1])
+        ivf = faiss.IndexIVFFlat(quantizer, vectors.shape[1], nlist, faiss.METRIC_INNER_PRODUCT)
+        # Training on a sample is enough for the cluster centroids
+        sample = vectors[np.random.default_rng(0).choice(count, min(count, nlist * 64), replace=False)]
+        ivf.train(sample)
+        ivf.add_with_ids(vectors, ids)
+        self._index = ivf
+
+    def merge(self, wait=True):
+        """
+        Writes the index with every committed change as a new snapshot and truncates
+        the change log. Converts the index to IVF when it has grown large enough.
+
+        Args:
+            wait (bool, optional): Wait for a merge running in another process
+                instead of skipping this one.
+
+        Returns:
+            bool: Whether a snapshot was written.
+        """
+        import faiss
+        directory = os.path.dirname(self.index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handle = open(self.index_path + ".lock", "a")
+        try:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            with self._lock:
+                self._catch_up()
+                if self._index is None or not self._pending:
+                    return False
+                self._maybe_convert_to_ivf()
+                seq = self._applied
+                name = f"{os.path.basename(self.index_path)}.{seq}"
+                tmp_path = self._snapshot_path(f"{name}.{os.getpid()}.tmp")
+                faiss.write_index(self._index, tmp_path)
+                os.replace(tmp_path, self._snapshot_path(name))
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    previous = conn.execute("SELECT value FROM meta WHERE key = 'snapshot'").fetchone()
+                    conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                     [("snapshot", name), ("snapshot_seq", str(seq))])
+                    conn.execute("DELETE FROM changes WHERE seq <= ?", (seq,))
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                self._snapshot = name
+                self._pending = 0
+            # Keep the previous snapshot for processes that are just loading it
+            keep = {name, previous[0] if previous else None}
+            for entry in self._snapshot_files():
+                if entry not in keep:
+                    os.remove(self._snapshot_path(entry))
+            return True
+        finally:
+            handle.close()
+
+    # --- Updates ---
+
+    def upsert(self, entries, replace_candidates=()):
+        """
+        Adds or replaces vectors in one step.
+
+        Args:
+            entries (list): (key, candidate_id, kind, weight, vector) tuples. A key
+                identifies the vector's source (e.g. "answer:<response id>"); an
+                existing vector with the same key is replaced.
+            replace_candidates (iterable, optional): Candidate IDs whose existing
+                vectors are all removed first.
+        """
+        import numpy as np
+        import faiss
+        entries = [e for e in entries if e[4]]
+        replace_candidates = list(replace_candidates)
+        if not entries and not replace_candidates:
+            return
+        vectors = np.array([e[4] for e in entries], dtype="float32")
+        if entries:
+            faiss.normalize_L2(vectors)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old_ids = self._delete_rows("candidate_id", replace_candidates)
+            old_ids += self._delete_rows("key", [e[0] for e in entries])
+            changes = [(vid, None) for vid in old_ids]
+            for (key, candidate_id, kind, weight, _), vector in zip(entries, vectors):
+                cursor = conn.execute(
+                    "INSERT INTO vectors (key, candidate_id, kind, weight) VALUES (?, ?, ?, ?)",
+                    (key, candidate_id, kind, weight),
+                )
+                changes.append((cursor.lastrowid, vector.tobytes()))
+            conn.executemany("INSERT INTO changes (vid, vector) VALUES (?, ?)", changes)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        # Only committed changes reach an index
+        with self._lock:
+            self._catch_up()
+            pending = self._pending
+        if pending >= FAISS_MERGE_CHANGES:
+            self.merge(wait=False)
+
+    def _delete_rows(self, field, values):
+        conn = self._connect()
+        ids = []
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            ids.extend(row[0] for row in conn.execute(f"SELECT vid FROM vectors WHERE {field} IN ({marks})", chunk))
+            conn.execute(f"DELETE FROM vectors WHERE {field} IN ({marks})", chunk)
+        return ids
+
+    def remove_candidate(self, candidate_id):
+        """Removes every vector belonging to a candidate."""
+        self.upsert([], replace_candidates=[candidate_id])
+
+    def clear(self):
+        """Deletes the index, its change log and its id mapping."""
+        directory = os.path.dirname(self.index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handle = open(self.index_path + ".lock", "a")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM vectors")
+                conn.execute("DELETE FROM changes")
+                conn.execute("DELETE FROM meta")
+                conn.execute("COMMIT")
+                for entry in self._snapshot_files():
+                    os.remove(self._snapshot_path(entry))
+                self._index = None
+                self._snapshot = None
+                self._applied = 0
+                self._pending = 0
+        finally:
+            handle.close()
+
+    # --- Queries ---
+
+    def search(self, vector, k=20):
+        """
+        Finds the candidates whose vectors are closest to a query vector.
+
+        Args:
+            vector (list): The query embedding.
+            k (int, optional): The number of candidates to return.
+
+        Returns:
+            list: Up to k dicts with "candidate_id", "score" (weighted cosine
+            similarity of the best matching vector) and "kind" of that vector,
+            best first.
+        """
+        import numpy as np
+        import faiss
+        query = np.array([vector], dtype="float32")
+        faiss.normalize_L2(query)
+        # The index is updated in place, so it is only searched under the lock
+        with self._lock:
+            self._catch_up()
+            index = self._index
+            if index is None or index.ntotal == 0:
+                return []
+            if isinstance(index, faiss.IndexIVF):
+                index.nprobe = FAISS_NPROBE
+            # Several vectors can belong to one candidate, so fetch more than k
+            similarities, ids = index.search(query, min(index.ntotal, k * 8))
+        hits = [(int(vid), float(sim)) for vid, sim in zip(ids[0], similarities[0]) if vid >= 0]
+        if not hits:
+            return []
+        marks = ",".join("?" * len(hits))
+        rows = {
+            row[0]: row[1:] for row in self._connect().execute(
+                f"SELECT vid, candidate_id, kind, weight FROM vectors WHERE vid IN ({marks})", [vid for vid, _ in hits]
+            )
+        }
+        best = {}
+        for vid, similarity in hits:
+            if vid not in rows:
+                continue  # removed since the search
+            candidate_id, kind, weight = rows[vid]
+            score = similarity * weight
+            if candidate_id not in best or score > best[candidate_id]["score"]:
+                best[candidate_id] = {"candidate_id": candidate_id, "score": round(score, 4), "kind": kind}
+        return sorted(best.values(), key=lambda hit: hit["score"], reverse=True)[:k]
+
+    def stats(self):
+        """
+        Returns the number of indexed vectors, the changes not yet merged and the
+        current snapshot. Read from the SQLite tables alone, so the index is neither
+        loaded nor brought up to date (the /metrics and /hr/cache-stats views call this).
+        """
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            vectors = conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+            changes = conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+            snapshot = conn.execute("SELECT value FROM meta WHERE key = 'snapshot'").fetchone()
+        finally:
+            conn.execute("COMMIT")
+        return {"vectors": vectors, "unmerged_changes": changes, "snapshot": snapshot[0] if snapshot else None}
+
+
+_candidate_index = None
+_index_lock = threading.Lock()
+
+def get_candidate_index():
+    """Returns the process-wide CandidateIndex."""
+    global _candidate_index
+    with _index_lock:
+        if _candidate_index is None:
+            _candidate_index = CandidateIndex()
+        return _candidate_index
+
+# --- Candidate documents ---
+
+def _candidate_documents(candidate):
+    """Returns the (key, kind, weight, text) documents a candidate is indexed under."""
+    validated = ", ".join(f"{skill} ({score:.0f}%)" for skill, score in (candidate.validated_skills or {}).items())
+    documents = [(
+        f"{PROFILE}:{candidate.id}", PROFILE, 1.0,
+        f"Skills: {', '.join(candidate.skills or [])}. Validated skills: {validated or 'none'}."
+    )]
+    responses = [r for r in get_responses_by_candidate_id(candidate.id) if r.answer and not r.flagged]
+    assessments = {a.id: a for a in get_assessments_by_ids({r.assessment_id for r in responses})}
+    for response in responses:
+        assessment = assessments.get(response.assessment_id)
+        if assessment is None:
+            continue
+        # A strong answer counts fully, a wrong one at half weight
+        weight = 0.5 + (response.score or 0.0) / 200
+        documents.append((
+            f"{ANSWER}:{response.id}", ANSWER, weight,
+            f"{assessment.skill}: {assessment.question}\nAnswer: {response.answer}"
+        ))
+    return documents
+
+def index_candidates(candidates):
+    """
+    Embeds and (re)indexes the given candidates' profiles and answers. Answers that
+    were flagged since the last indexing are dropped.
+
+    Returns:
+        int: The number of vectors written.
+    """
+    entries = []
+    for candidate in candidates:
+        documents = _candidate_documents(candidate)
+        embeddings = get_embeddings([text for _, _, _, text in documents])
+        entries.extend(
+            (key, candidate.id, kind, weight, embedding)
+            for (key, kind, weight, _), embedding in zip(documents, embeddings)
+        )
+    # Replacing the candidates' vectors wholesale also drops answers since flagged
+    get_candidate_index().upsert(entries, replace_candidates=[c.id for c in candidates])
+    return len(entries)
+
+def index_candidate(candidate_id):
+    """Indexes one candidate by ID. Returns the number of vectors written."""
+    candidate = get_candidate_by_id(candidate_id)
+    return index_candidates([candidate]) if candidate else 0
+
+def search_candidates(query, k=20):
+    """
+    Semantic search over the talent pool, e.g. "strongest in distributed systems".
+
+    Args:
+        query (str): A free-text description of the skills sought.
+        k (int, optional): The maximum number of candidates to return.
+
+    Returns:
+        list: Hits as returned by CandidateIndex.search, best first.
+    """
+    embedding = get_embedding(query)
+    if not embedding:
+        return []
+    return get_candidate_index().search(embedding, k)
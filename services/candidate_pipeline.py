@@ -0,0 +1,55 @@
+# skill_validation_system/services/candidate_pipeline.py
+
+from services.job_queue import job_handler, report_progress, JobError
+from services.resume_parser import extract_skills_from_resume
+from services.question_bank import build_assessment
+from services.candidate_index import index_candidate
+from utils.helpers import get_candidate_by_id, update_candidate
+
+PROCESS_RESUME = "process_resume"
+INDEX_CANDIDATE = "index_candidate"
+
+@job_handler(PROCESS_RESUME)
+def process_resume(candidate_id, resume_path):
+    """
+    Extracts a candidate's skills from their resume and generates their assessment.
+    Runs as a background job queued by the upload route.
+
+    Args:
+        candidate_id (str): The ID of the candidate who uploaded the resume.
+        resume_path (str): The path of the saved resume file.
+
+    Returns:
+        dict: {"assessment_ids": [...]} for the generated assessments.
+    """
+    candidate = get_candidate_by_id(candidate_id)
+    if candidate is None:
+        raise JobError("Your application could not be found. Please start over.")
+
+    skills = extract_skills_from_resume(resume_path)
+    if not skills:
+        raise JobError("Processing failed: We could not identify any skills in your resume. "
+                       "Please check the file and try again.")
+    candidate.skills = skills
+    update_candidate(candidate)
+
+    # Reuses banked questions where possible and saves the assessments. The IDs are
+    # published as they become available so the applicant can start answering early.
+    assessments = build_assessment(
+        skills, on_progress=lambda ready: report_progress({"assessment_ids": [a.id for a in ready]})
+    )
+    if not assessments:
+        raise JobError("Processing failed: An error occurred while generating assessment questions. "
+                       "Please try again later.")
+    return {"assessment_ids": [a.id for a in assessments]}
+
+@job_handler(INDEX_CANDIDATE)
+def index_candidate_job(candidate_id):
+    """
+    Adds a candidate's skill profile and answers to the talent pool search index.
+    Queued once the candidate has submitted their assessment.
+
+    Returns:
+        dict: {"vectors": n}, the number of vectors indexed.
+    """
+    return {"vectors": index_candidate(candidate_id)}
@@ -0,0 +1,259 @@
+# skill_validation_system/services/embedding_cache.py
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from config import (
+    EMBEDDING_MODEL, EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_MEMORY_ITEMS, EMBEDDING_CACHE_MAX_ITEMS
+)
+
+def normalize_text(text):
+    """Collapses whitespace so that trivially different inputs share one embedding."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class EmbeddingCache:
+    """
+    A two-tier, content-addressed cache of embedding vectors for one embedding model.
+
+    Vectors are keyed by a SHA-256 of (model, normalized text). The first tier is an
+    in-memory LRU; the second is a directory shared by every worker on the host:
+
+        CURRENT          the name of the generation directory in use
+        gen-<n>/vectors.f32  float32 rows, appended and read through a memory map
+        gen-<n>/keys.txt     one hex key per line; line N is the key of row N
+        meta.json        the vector dimension
+
+    Writers append under an exclusive flock and readers pick up new lines
+    incrementally. Once the disk tier holds more than `max_items` rows it is
+    compacted to the most recently added half: both files are written to a new
+    generation directory, and rewriting CURRENT switches to it in one atomic rename,
+    so the keys and vectors in use always belong together. Without a CURRENT file
+    the files are read from the directory itself, as written by earlier versions.
+    """
+
+    def __init__(self, model=EMBEDDING_MODEL, directory=EMBEDDING_CACHE_DIR,
+                 memory_items=EMBEDDING_CACHE_MEMORY_ITEMS, max_items=EMBEDDING_CACHE_MAX_ITEMS):
+        self.model = model
+        self.directory = os.path.join(directory, re.sub(r"[^A-Za-z0-9_.-]", "_", model))
+        self.memory_items = memory_items
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._index = {}
+        self._rows = 0
+        self._keys_offset = 0
+        self._generation = None
+        self._current_inode = None
+        self._dim = None
+        self._matrix = None
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    # --- Paths & locking ---
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _data_path(self, name):
+        """The path of keys.txt or vectors.f32 in the current generation."""
+        return os.path.join(self.directory, self._generation or "", name)
+
+    def _current_stat(self):
+        try:
+            return os.stat(self._path("CURRENT")).st_ino
+        except FileNotFoundError:
+            return None
+
+    def _flock(self, mode):
+        os.makedirs(self.directory, exist_ok=True)
+        handle = open(self._path("lock"), "a")
+        fcntl.flock(handle, mode)
+        return handle
+
+    def key(self, text):
+        """Returns the content address of `text` for this cache's model."""
+        digest = hashlib.sha256()
+        digest.update(self.model.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    # --- Disk tier ---
+
+    def _reset_disk_view(self):
+        self._index = {}
+        self._rows = 0
+        self._keys_offset = 0
+        self._matrix = None
+
+    def _refresh(self):
+        """Loads keys appended by any process since the last refresh. Needs the flock."""
+        import numpy as np
+        current_inode = self._current_stat()
+        if self._generation is None or current_inode != self._current_inode:
+            # First look, or a compaction switched to a new generation
+            self._reset_disk_view()
+            self._current_inode = current_inode
+            self._generation = ""
+            if current_inode is not None:
+                with open(self._path("CURRENT"), "r", encoding="ascii") as f:
+                    self._generation = f.read().strip()
+        try:
+            size = os.stat(self._data_path("keys.txt")).st_size
+        except FileNotFoundError:
+            size = 0
+        if size > self._keys_offset:
+            with open(self._data_path("keys.txt"), "rb") as f:
+                f.seek(self._keys_offset)
+                chunk = f.read(size - self._keys_offset)
+            complete = chunk[:chunk.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                self._index.setdefault(line.decode("ascii"), self._rows)
+                self._rows += 1
+            self._keys_offset += len(complete)
+        if self._dim is None and os.path.exists(self._path("meta.json")):
+            with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+                self._dim = json.load(f)["dim"]
+        if self._rows and (self._matrix is None or self._matrix.shape[0] < self._rows):
+            self._matrix = np.memmap(self._data_path("vectors.f32"), dtype=np.float32, mode="r",
+                                     shape=(self._rows, self._dim))
+
+    def _maybe_refresh(self):
+        current_inode = self._current_stat()
+        changed = self._generation is None or current_inode != self._current_inode
+        if not changed:
+            try:
+                changed = os.stat(self._data_path("keys.txt")).st_size != self._keys_offset
+            except FileNotFoundError:
+                changed = self._keys_offset != 0
+        if changed:
+            handle = self._flock(fcntl.LOCK_SH)
+            try:
+                self._refresh()
+            finally:
+                handle.close()
+
+    def _compact(self):
+        """Keeps the newest half of the disk tier in a new generation. Needs the exclusive flock."""
+        import numpy as np
+        keep = max(self.max_items // 2, 1)
+        keys = sorted(self._index, key=self._index.get)[-keep:]
+        rows = np.asarray(self._matrix[[self._index[k] for k in keys]], dtype=np.float32)
+        generation = f"gen-{time.time_ns()}"
+        os.makedirs(self._path(generation))
+        for name, data in (("vectors.f32", rows.tobytes()), ("keys.txt", "".join(k + "\n" for k in keys).encode("ascii"))):
+            with open(os.path.join(self._path(generation), name), "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        with open(self._path("CURRENT.tmp"), "w", encoding="ascii") as f:
+            f.write(generation)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self._path("CURRENT.tmp"), self._path("CURRENT"))
+        # Older generations (and any left by a compaction that crashed before the
+        # switch) go; readers holding a memory map of old files keep it valid
+        for name in os.listdir(self.directory):
+            if name.startswith("gen-") and name != generation:
+                shutil.rmtree(self._path(name), ignore_errors=True)
+        for name in ("vectors.f32", "keys.txt"):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+        self._counters["evictions"] += self._rows - len(keys)
+        self._refresh()
+
+    # --- Public API ---
+
+    def get(self, text):
+        """
+        Looks up the embedding of `text`.
+
+        Returns:
+            list: The cached embedding, or None on a miss.
+        """
+        import numpy as np
+        key = self.key(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return vector.tolist()
+            self._maybe_refresh()
+            row = self._index.get(key)
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            vector = np.array(self._matrix[row], dtype=np.float32)
+            self._remember(key, vector)
+            self._counters["disk_hits"] += 1
+            return vector.tolist()
+
+    def put(self, text, embedding):
+        """Stores the embedding of `text` in both tiers."""
+        import numpy as np
+        key = self.key(text)
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+            handle = self._flock(fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                if key in self._index:
+                    return
+                if self._dim is None:
+                    self._dim = int(vector.shape[0])
+                    with open(self._path("meta.json"), "w", encoding="utf-8") as f:
+                        json.dump({"dim": self._dim, "model": self.model}, f)
+                if vector.shape[0] != self._dim:
+                    return
+                # Write the vector at the row its key will get before appending the key,
+                # so a visible key always has its row, even after a crash in between.
+                fd = os.open(self._data_path("vectors.f32"), os.O_WRONLY | os.O_CREAT, 0o644)
+                try:
+                    os.pwrite(fd, vector.tobytes(), self._rows * self._dim * 4)
+                finally:
+                    os.close(fd)
+                with open(self._data_path("keys.txt"), "a", encoding="ascii") as f:
+                    f.write(key + "\n")
+                self._refresh()
+                if self._rows > self.max_items:
+                    self._compact()
+            finally:
+                handle.close()
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def stats(self):
+        """Returns hit/miss counters and the hit rate of this process."""
+        with self._lock:
+            stats = dict(self._counters)
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0
+            stats["memory_items"] = len(self._memory)
+            stats["disk_items"] = len(self._index)
+            return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_embedding_cache():
+    """Returns the process-wide cache for config.EMBEDDING_MODEL."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache()
+    return _cache
@@ -0,0 +1,156 @@
+# skill_validation_system/services/export.py
+
+import csv
+import datetime
+import io
+import json
+from config import EXPORT_BATCH_SIZE
+from utils.metrics import Span
+from utils.storage import get_repository
+
+# Values of the export format option
+CSV = "csv"
+NDJSON = "ndjson"
+MIMETYPES = {CSV: "text/csv", NDJSON: "application/x-ndjson"}
+
+# Rows are the models' to_dict() output, flattened into prefixed CSV columns
+CANDIDATE_FIELDS = ("id", "name", "email", "resume_path", "skills", "validated_skills")
+RESPONSE_FIELDS = ("id", "assessment_id", "answer", "score", "flagged")
+ASSESSMENT_FIELDS = ("skill", "question", "question_type", "model_answer")
+CSV_COLUMNS = (
+    [f"candidate_{f}" for f in CANDIDATE_FIELDS] + ["candidate_registered_at"]
+    + [f"response_{f}" for f in RESPONSE_FIELDS] + [f"assessment_{f}" for f in ASSESSMENT_FIELDS]
+)
+
+
+def parse_date(value, end=False):
+    """
+    Parses an ISO date or datetime from a query string or command line. A bare date
+    means the start of that day (UTC), or its end when `end` is set.
+
+    Returns:
+        datetime.datetime or None: A timezone-aware datetime, or None for an empty value.
+
+    Raises:
+        ValueError: If the value is not an ISO date.
+    """
+    if not value:
+        return None
+    parsed = datetime.datetime.fromisoformat(value)
+    if len(value) == 10 and end:
+        parsed += datetime.timedelta(days=1) - datetime.timedelta(microseconds=1)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+def _to_ns(moment):
+    return int(moment.timestamp()) * 1_000_000_000 + moment.microsecond * 1000
+
+def _registered_at(stats):
+    # Stats rebuilt for data that predates them hold a registration order, not a time
+    if stats.seq < 10 ** 15:
+        return None
+    return datetime.datetime.fromtimestamp(stats.seq / 1e9, datetime.timezone.utc).isoformat()
+
+def iter_export_records(since=None, until=None, skill=None, flagged=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yields one record per response, joined with its candidate and assessment, for
+    candidates in registration order. Candidates without a matching response get one
+    record with "response" and "assessment" set to None (unless `flagged` is set).
+
+    Candidates are read `batch_size` at a time through the dashboard's keyset index,
+    so only one batch and its responses are held in memory however large the
+    dataset is.
+
+    Args:
+        since (datetime, optional): Only candidates registered at or after this time.
+        until (datetime, optional): Only candidates registered at or before this time.
+        skill (str, optional): Only candidates claiming or validated in this skill.
+        flagged (bool, optional): Only flagged (True) or unflagged (False) responses.
+        batch_size (int, optional): Candidates read per batch.
+
+    Yields:
+        dict: {"candidate": ..., "registered_at": ..., "response": ..., "assessment": ...}
+    """
+    repository = get_repository()
+    has_item = ("skills", skill.strip().lower()) if skill and skill.strip() else None
+    after = (_to_ns(since) - 1, "\uffff") if since else None
+    until_ns = _to_ns(until) if until else None
+    while True:
+        with Span("export_batch") as span:
+            stats = repository.page("candidate_stats", "seq", after=after, limit=batch_size, has_item=has_item)
+            if until_ns is not None:
+                stats = [s for s in stats if s.seq <= until_ns]
+            if flagged:
+                # The aggregates tell which candidates have no flagged response at all
+                wanted = [s for s in stats if s.flagged_count]
+            else:
+                wanted = stats
+            candidates = {c.id: c for c in repository.get_many("candidates", [s.id for s in wanted])}
+            responses = {candidate_id: [
+                r for r in repository.find("responses", "candidate_id", candidate_id)
+                if flagged is None or bool(r.flagged) == flagged
+            ] for candidate_id in candidates}
+            assessment_ids = list({r.assessment_id for rs in responses.values() for r in rs})
+            assessments = {a.id: a for a in repository.get_many("assessments", assessment_ids)}
+            span.add("candidates", len(candidates))
+            span.add("responses", sum(len(rs) for rs in responses.values()))
+        for s in wanted:
+            candidate = candidates.get(s.id)
+            if candidate is None:
+                continue
+            record = {"candidate": candidate.to_dict(), "registered_at": _registered_at(s)}
+            if not responses[s.id]:
+                if flagged is None:
+                    yield {**record, "response": None, "assessment": None}
+                continue
+            for response in responses[s.id]:
+                assessment = assessments.get(response.assessment_id)
+                yield {**record, "response": response.to_dict(),
+                       "assessment": assessment.to_dict() if assessment else None}
+        if len(stats) < batch_size:
+            return
+        after = (stats[-1].seq, stats[-1].id)
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return "" if value is None else value
+
+def iter_csv(records):
+    """Yields the records as CSV text, a header line first, one chunk per row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    writer.writerow(CSV_COLUMNS)
+    yield flush()
+    for record in records:
+        candidate = record["candidate"]
+        response = record["response"] or {}
+        assessment = record["assessment"] or {}
+        writer.writerow(
+            [_csv_value(candidate.get(f)) for f in CANDIDATE_FIELDS] + [_csv_value(record["registered_at"])]
+            + [_csv_value(response.get(f)) for f in RESPONSE_FIELDS]
+            + [_csv_value(assessment.get(f)) for f in ASSESSMENT_FIELDS]
+        )
+        yield flush()
+
+def iter_ndjson(records):
+    """Yields the records as newline-delimited JSON, one line per record."""
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+SERIALIZERS = {CSV: iter_csv, NDJSON: iter_ndjson}
+
+def iter_export(format=CSV, **filters):
+    """
+    Yields the export in the given format ("csv" or "ndjson") as text chunks.
+    `filters` are passed to iter_export_records.
+    """
+    return SERIALIZERS[format](iter_export_records(**filters))
@@ -0,0 +1,259 @@
+# skill_validation_system/services/job_queue.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from config import JOBS_DB_PATH, JOB_WORKERS, JOB_POLL_INTERVAL, JOB_TIMEOUT, JOB_HEARTBEAT_INTERVAL
+
+# Job states. A job moves from queued to running to done or failed.
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# Registered job handlers, keyed by job kind. See job_handler().
+HANDLERS = {}
+
+# The job being run by the current worker thread, for report_progress().
+_current = threading.local()
+
+
+class JobError(Exception):
+    """Raised by a job handler with a message that is safe to show to the applicant."""
+
+
+def report_progress(partial_result):
+    """
+    Publishes a partial result for the job running in this thread, so that status
+    readers can use it before the job has finished. Does nothing outside a job.
+    """
+    job = getattr(_current, "job", None)
+    if job is not None:
+        job[0].update_result(job[1], partial_result, started_at=job[2])
+
+
+def job_handler(kind):
+    """Registers the decorated function as the handler for jobs of the given kind."""
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+class JobQueue:
+    """
+    A durable job queue stored in SQLite (WAL mode), shared by every process on the
+    host. Jobs are claimed atomically, so any number of worker threads or processes
+    can consume the same queue. Workers record a heartbeat every
+    JOB_HEARTBEAT_INTERVAL seconds while a job runs; a running job whose worker died
+    is handed out again once it has had no heartbeat for JOB_TIMEOUT seconds. Only
+    the worker holding the latest claim can record the job's outcome.
+    """
+
+    def __init__(self, db_path=JOBS_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, candidate_id TEXT, status TEXT NOT NULL, "
+                "payload TEXT, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+            )
+            if "heartbeat_at" not in {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}:
+                # Added after the table was first created
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_candidate ON jobs (candidate_id, created_at)")
+            self._local.conn = conn
+        return conn
+
+    def _to_dict(self, row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"]) if job["payload"] else {}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def enqueue(self, kind, payload, candidate_id=None):
+        """
+        Adds a job to the queue.
+
+        Args:
+            kind (str): The registered handler to run.
+            payload (dict): JSON-serializable keyword arguments for the handler.
+            candidate_id (str, optional): The candidate the job belongs to.
+
+        Returns:
+            str: The new job's ID.
+        """
+        job_id = str(uuid.uuid4())
+        self._connect().execute(
+            "INSERT INTO jobs (id, kind, candidate_id, status, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, candidate_id, QUEUED, json.dumps(payload), time.time()),
+        )
+        self._wakeup.set()
+        return job_id
+
+    def claim(self):
+        """Atomically marks the oldest runnable job as running and returns it, or None."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? OR (status = ? AND COALESCE(heartbeat_at, started_at) < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now - JOB_TIMEOUT),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = NULL, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (RUNNING, now, row["id"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"]) if row is not None else None
+
+    def finish(self, job_id, result=None, error=None, started_at=None):
+        """
+        Records the outcome of a job. With `started_at`, the time of the claim, the
+        outcome is only recorded if the job has not been claimed again since.
+
+        Returns:
+            bool: Whether the outcome was recorded.
+        """
+        query = "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?"
+        params = [FAILED if error else DONE, json.dumps(result) if result is not None else None,
+                  error, time.time(), job_id]
+        if started_at is not None:
+            query += " AND status = ? AND started_at = ?"
+            params += [RUNNING, started_at]
+        return self._connect().execute(query, params).rowcount > 0
+
+    def update_result(self, job_id, result, started_at=None):
+        """Stores a partial result for a job that is still running. This also counts as a sign of life."""
+        query = "UPDATE jobs SET result = ?, heartbeat_at = ? WHERE id = ? AND status = ?"
+        params = [json.dumps(result), time.time(), job_id, RUNNING]
+        if started_at is not None:
+            query += " AND started_at = ?"
+            params.append(started_at)
+        self._connect().execute(query, params)
+
+    def heartbeat(self, job_id, started_at):
+        """Records that the worker holding the claim made at `started_at` is still running the job."""
+        self._connect().execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ? AND started_at = ?",
+            (time.time(), job_id, RUNNING, started_at)
+        )
+
+    def _beat(self, job_id, started_at, done):
+        while not done.wait(JOB_HEARTBEAT_INTERVAL):
+            try:
+                self.heartbeat(job_id, started_at)
+            except sqlite3.Error as e:
+                print(f"Could not record a heartbeat for job {job_id}: {e}")
+
+    def get(self, job_id):
+        """Returns a job as a dictionary, or None."""
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def latest_for_candidate(self, candidate_id):
+        """Returns the most recent job of a candidate, or None."""
+        row = self._connect().execute(
+            "SELECT * FROM jobs WHERE candidate_id = ? ORDER BY created_at DESC LIMIT 1", (candidate_id,)
+        ).fetchone()
+        return self._to_dict(row)
+
+    def stats(self):
+        """Returns the number of jobs per status and the mean queue wait of finished jobs."""
+        conn = self._connect()
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        wait = conn.execute(
+            "SELECT AVG(started_at - created_at) FROM jobs WHERE started_at IS NOT NULL"
+        ).fetchone()[0]
+        return {"counts": counts, "mean_queue_seconds": round(wait or 0.0, 3)}
+
+    def run_one(self):
+        """Claims and runs a single job. Returns False when the queue is empty."""
+        job = self.claim()
+        if job is None:
+            return False
+        handler = HANDLERS.get(job["kind"])
+        claim = job["started_at"]
+        _current.job = (self, job["id"], claim)
+        done = threading.Event()
+        threading.Thread(target=self._beat, args=(job["id"], claim, done), daemon=True).start()
+        try:
+            if handler is None:
+                raise JobError(f"No handler is registered for '{job['kind']}' jobs.")
+            outcome = {"result": handler(**job["payload"])}
+        except JobError as e:
+            outcome = {"error": str(e)}
+        except Exception as e:
+            print(f"Job {job['id']} ({job['kind']}) failed: {e}")
+            outcome = {"error": "A critical server error occurred during processing. "
+                                "The technical team has been notified."}
+        finally:
+            done.set()
+            _current.job = None
+        if not self.finish(job["id"], started_at=claim, **outcome):
+            print(f"Job {job['id']} ({job['kind']}) was claimed again by another worker; its outcome was discarded.")
+        return True
+
+    def work(self, stop_event=None):
+        """Processes jobs until `stop_event` is set, sleeping while the queue is empty."""
+        while stop_event is None or not stop_event.is_set():
+            try:
+                ran = self.run_one()
+            except sqlite3.Error as e:
+                print(f"Job worker could not access the queue: {e}")
+                ran = False
+            if not ran:
+                self._wakeup.wait(JOB_POLL_INTERVAL)
+                self._wakeup.clear()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+_workers = []
+_workers_lock = threading.Lock()
+
+def get_job_queue():
+    """Returns the process-wide job queue."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+def start_workers(count=JOB_WORKERS):
+    """
+    Starts `count` daemon worker threads in this process, once. They are started
+    lazily so that each gunicorn worker gets its own threads after forking.
+    """
+    queue = get_job_queue()
+    with _workers_lock:
+        if _workers or count <= 0:
+            return
+        for i in range(count):
+            thread = threading.Thread(target=queue.work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            _workers.append(thread)
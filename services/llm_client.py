@@ -0,0 +1,272 @@
+# skill_validation_system/services/llm_client.py
+
+import asyncio
+import os
+import queue
+import random
+import threading
+import time
+from config import (
+    OPENAI_API_KEY, OPENAI_BASE_URL, LLM_MAX_CONNECTIONS, LLM_TIMEOUT,
+    LLM_MAX_RETRIES, LLM_ENDPOINT_LIMITS
+)
+
+# Status codes worth retrying: rate limiting, timeouts and transient server errors.
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# The longest wait between retries in seconds, whatever Retry-After asks for.
+MAX_RETRY_DELAY = 30.0
+
+
+class LLMError(Exception):
+    """Raised when an LLM call fails after all retries."""
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket: `rate` requests per second on average, with bursts of
+    up to `capacity` requests. A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _retry_after(error):
+    """Returns the server's Retry-After hint in seconds, if it sent one."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before the next attempt: Retry-After if sent, else jittered backoff; capped."""
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        return min(max(retry_after, 0.0), MAX_RETRY_DELAY)
+    return random.uniform(0, min(MAX_RETRY_DELAY, 0.5 * 2 ** attempt))
+
+
+def _is_retryable(error):
+    import openai
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in RETRYABLE_STATUS
+
+
+class AsyncLLMClient:
+    """
+    An asyncio OpenAI client shared by the whole process.
+
+    Requests go through one pooled HTTP transport. Each endpoint ("chat",
+    "embeddings") has its own concurrency semaphore and token-bucket rate limit
+    from config.LLM_ENDPOINT_LIMITS. Calls time out after LLM_TIMEOUT seconds,
+    are retried on 429/5xx/timeouts with exponential backoff and full jitter
+    (honouring Retry-After), and can be hedged: if an attempt has not returned
+    after the endpoint's `hedge_after` seconds, a duplicate request is raced
+    against it and the first success wins.
+    """
+
+    def __init__(self, api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, limits=LLM_ENDPOINT_LIMITS,
+                 timeout=LLM_TIMEOUT, max_retries=LLM_MAX_RETRIES, max_connections=LLM_MAX_CONNECTIONS):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limits = limits
+        self._api_key = api_key
+        self._base_url = base_url
+        self._max_connections = max_connections
+        self._client = None
+        self._semaphores = {}
+        self._buckets = {}
+
+    def _openai(self):
+        # Created lazily so that the client binds to the loop it is used from, and
+        # so that the openai SDK is only imported once a request is made
+        if self._client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self._max_connections,
+                                    max_keepalive_connections=self._max_connections),
+                timeout=self.timeout,
+            )
+            self._client = AsyncOpenAI(api_key=self._api_key, base_url=self._base_url,
+                                       http_client=http_client, max_retries=0, timeout=self.timeout)
+        return self._client
+
+    def _limits_for(self, endpoint):
+        if endpoint not in self._semaphores:
+            limits = self.limits.get(endpoint, {})
+            self._semaphores[endpoint] = asyncio.Semaphore(limits.get("concurrency", 8))
+            self._buckets[endpoint] = TokenBucket(limits.get("rate", 0))
+        return self._semaphores[endpoint], self._buckets[endpoint]
+
+    async def _attempt(self, endpoint, call):
+        semaphore, bucket = self._limits_for(endpoint)
+        async with semaphore:
+            await bucket.acquire()
+            return await asyncio.wait_for(call(), timeout=self.timeout)
+
+    async def _hedged(self, endpoint, call):
+        hedge_after = self.limits.get(endpoint, {}).get("hedge_after", 0)
+        if not hedge_after:
+            return await self._attempt(endpoint, call)
+        first = asyncio.ensure_future(self._attempt(endpoint, call))
+        done, _ = await asyncio.wait({first}, timeout=hedge_after)
+        if done:
+            return first.result()
+        second = asyncio.ensure_future(self._attempt(endpoint, call))
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    async def request(self, endpoint, call):
+        """
+        Runs `call` (a coroutine factory) under the endpoint's limits, with
+        timeouts, retries and hedging.
+
+        Raises:
+            LLMError: If the call still fails after all retries.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._hedged(endpoint, call)
+            except Exception as e:
+                if not _is_retryable(e) or attempt == self.max_retries:
+                    raise LLMError(f"{endpoint} request failed: {e}") from e
+                await asyncio.sleep(_retry_delay(e, attempt))
+
+    async def chat(self, messages, model, temperature=0.3):
+        """Returns the content of a chat completion."""
+        response = await self.request("chat", lambda: self._openai().chat.completions.create(
+            model=model, messages=messages, temperature=temperature
+        ))
+        return response.choices[0].message.content
+
+    async def chat_stream(self, messages, model, temperature=0.3):
+        """
+        Yields the content of a chat completion piece by piece as it is generated.
+        Opening the stream is retried like any other request; once content has
+        started flowing, errors are raised as LLMError. The endpoint's concurrency
+        slot is held until the stream is exhausted.
+        """
+        semaphore, bucket = self._limits_for("chat")
+        async with semaphore:
+            await bucket.acquire()
+            for attempt in range(self.max_retries + 1):
+                try:
+                    stream = await asyncio.wait_for(self._openai().chat.completions.create(
+                        model=model, messages=messages, temperature=temperature, stream=True
+                    ), timeout=self.timeout)
+                    break
+                except Exception as e:
+                    if not _is_retryable(e) or attempt == self.max_retries:
+                        raise LLMError(f"chat stream failed: {e}") from e
+                    await asyncio.sleep(_retry_delay(e, attempt))
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            except Exception as e:
+                raise LLMError(f"chat stream interrupted: {e}") from e
+
+    async def embed(self, texts, model):
+        """Returns one embedding per input text, in order."""
+        response = await self.request("embeddings", lambda: self._openai().embeddings.create(
+            model=model, input=texts
+        ))
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+# --- Sync bridge ---
+# Synchronous callers (Flask views, job workers) submit coroutines to one event
+# loop running in a daemon thread, so they all share the client's connection pool
+# and limits. The loop is recreated after a fork.
+
+_loop = None
+_loop_pid = None
+_client = None
+_bridge_lock = threading.Lock()
+
+def _get_loop():
+    global _loop, _loop_pid, _client
+    with _bridge_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            _client = AsyncLLMClient()
+            threading.Thread(target=_loop.run_forever, name="llm-client-loop", daemon=True).start()
+        return _loop
+
+def get_llm_client():
+    """Returns the process-wide AsyncLLMClient, bound to the bridge's event loop."""
+    _get_loop()
+    return _client
+
+def run_sync(coro_factory):
+    """
+    Runs the coroutine returned by `coro_factory(client)` on the shared loop and
+    waits for its result.
+    """
+    loop = _get_loop()
+    return asyncio.run_coroutine_threadsafe(coro_factory(_client), loop).result()
+
+_STREAM_END = object()
+
+def iterate_sync(agen_factory):
+    """
+    Consumes the async generator returned by `agen_factory(client)` on the shared
+    loop and yields its items to a synchronous caller as they arrive. An exception
+    raised by the generator is re-raised here.
+    """
+    loop = _get_loop()
+    items = queue.Queue()
+
+    async def pump():
+        try:
+            async for item in agen_factory(_client):
+                items.put(item)
+        except Exception as e:
+            items.put(e)
+        finally:
+            items.put(_STREAM_END)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), loop)
+    try:
+        while True:
+            item = items.get()
+            if item is _STREAM_END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Stop generating if the caller gives up early
+        future.cancel()
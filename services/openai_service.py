@@ -1,40 +1,65 @@
-from openai import OpenAI
-from config import OPENAI_API_KEY, ASSESSMENT_MODEL, EMBEDDING_MODEL
+import asyncio
+from config import ASSESSMENT_MODEL, EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE
+from services.embedding_cache import get_embedding_cache, normalize_text
+from services.llm_client import LLMError, run_sync, iterate_sync
+from services.prompt_builder import count_tokens
+from utils.metrics import Span
 
-# Initialize the OpenAI client with your API key
-# This is the new syntax for openai v1.0.0+
-client = OpenAI(api_key=OPENAI_API_KEY)
+# All requests go through the shared asyncio client in services/llm_client.py,
+# which pools connections and applies per-endpoint concurrency limits, rate
+# limits, timeouts and retries. The functions below are its synchronous wrappers.
 
-def generate_text(prompt):
+DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant."
+
+def generate_text(prompt, stream=False, system=DEFAULT_SYSTEM_PROMPT):
     """
-    Generates text using the specified OpenAI Chat model with the new client syntax.
+    Generates text using the specified OpenAI Chat model.
 
     Args:
         prompt (str): The prompt to send to the model.
+        stream (bool, optional): Return an iterator over the text as it is generated
+            instead of waiting for the whole completion.
+        system (str, optional): The system message. Keeping it identical across
+            calls lets the provider cache the shared prefix.
 
     Returns:
-        str: The generated text from the model, or None if an error occurs.
+        str: The generated text from the model, or None if an error occurs. With
+        stream=True, an iterator of text chunks that stops early if an error occurs.
     """
-    try:
-        # The method call is now client.chat.completions.create
-        response = client.chat.completions.create(
-            model=ASSESSMENT_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-        )
-        # The way to access the response content has also changed
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        # The error message from the traceback will be printed here
-        print(f"An error occurred in generate_text: {e}")
-        return None
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt}
+    ]
+    prompt_tokens = count_tokens(system) + count_tokens(prompt)
+    if stream:
+        return _stream_text(messages, prompt_tokens)
+    with Span("generate_text") as span:
+        span.add("prompt_tokens", prompt_tokens)
+        try:
+            content = run_sync(lambda client: client.chat(messages, model=ASSESSMENT_MODEL, temperature=0.3))
+        except LLMError as e:
+            span.add("failures")
+            print(f"An error occurred in generate_text: {e}")
+            return None
+        span.add("completion_tokens", count_tokens(content or ""))
+        return content.strip() if content else None
+
+def _stream_text(messages, prompt_tokens):
+    # The span lasts until the stream is exhausted
+    with Span("generate_text_stream") as span:
+        span.add("prompt_tokens", prompt_tokens)
+        try:
+            for chunk in iterate_sync(lambda client: client.chat_stream(messages, model=ASSESSMENT_MODEL, temperature=0.3)):
+                span.add("completion_tokens", count_tokens(chunk))
+                yield chunk
+        except LLMError as e:
+            span.add("failures")
+            print(f"An error occurred in generate_text: {e}")
 
 def get_embedding(text):
     """
-    Generates a vector embedding for a given text using the new client syntax.
+    Generates a vector embedding for a given text. Results are served from the
+    embedding cache when the same normalized text has been embedded before.
 
     Args:
         text (str): The input text to embed.
@@ -42,16 +67,77 @@ def get_embedding(text):
     Returns:
         list: A list of floats representing the embedding vector, or None if an error occurs.
     """
-    try:
-        # Sanitize input text by replacing newlines
-        text = text.replace("\n", " ")
-        # The method call is now client.embeddings.create
-        response = client.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=text
-        )
-        # Accessing the data is also slightly different
-        return response.data[0].embedding
-    except Exception as e:
-        print(f"An error occurred in get_embedding: {e}")
+    # Sanitize input text by collapsing newlines and repeated whitespace
+    text = normalize_text(text)
+    if not text:
         return None
+    with Span("get_embedding") as span:
+        cache = get_embedding_cache()
+        cached = cache.get(text)
+        if cached is not None:
+            span.add("cache_hits")
+            return cached
+        span.add("input_chars", len(text))
+        try:
+            embedding = run_sync(lambda client: client.embed([text], model=EMBEDDING_MODEL))[0]
+        except LLMError as e:
+            span.add("failures")
+            print(f"An error occurred in get_embedding: {e}")
+            return None
+        cache.put(text, embedding)
+        return embedding
+
+def get_embeddings(texts):
+    """
+    Generates embeddings for many texts with as few API round-trips as possible.
+    Texts are normalized and deduplicated, cached vectors are reused, and the
+    remaining texts are sent as list inputs of up to EMBEDDING_BATCH_SIZE each,
+    concurrently within the embeddings endpoint's limits.
+
+    Args:
+        texts (list): The input texts to embed.
+
+    Returns:
+        list: One embedding (list of floats) per input text, in order. Entries are
+        None for empty texts or when the API call for their batch failed.
+    """
+    with Span("get_embeddings") as span:
+        return _get_embeddings(texts, span)
+
+def _get_embeddings(texts, span):
+    cache = get_embedding_cache()
+    normalized = [normalize_text(t) for t in texts]
+    embeddings = {}
+    missing = []
+    for text in dict.fromkeys(normalized):
+        if not text:
+            continue
+        cached = cache.get(text)
+        if cached is not None:
+            embeddings[text] = cached
+        else:
+            missing.append(text)
+
+    span.add("texts", len(texts))
+    span.add("cache_hits", len(embeddings))
+    batches = [missing[i:i + EMBEDDING_BATCH_SIZE] for i in range(0, len(missing), EMBEDDING_BATCH_SIZE)]
+    if batches:
+        span.add("requests", len(batches))
+        span.add("input_chars", sum(len(text) for text in missing))
+        results = run_sync(lambda client: _embed_batches(client, batches))
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                span.add("failures")
+                print(f"An error occurred in get_embeddings: {result}")
+                continue
+            for text, embedding in zip(batch, result):
+                embeddings[text] = embedding
+                cache.put(text, embedding)
+
+    return [embeddings.get(text) for text in normalized]
+
+async def _embed_batches(client, batches):
+    """Embeds every batch concurrently, returning each batch's result or exception."""
+    return await asyncio.gather(
+        *(client.embed(batch, model=EMBEDDING_MODEL) for batch in batches), return_exceptions=True
+    )
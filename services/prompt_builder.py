@@ -0,0 +1,151 @@
+# skill_validation_system/services/prompt_builder.py
+
+import re
+import threading
+from config import ASSESSMENT_MODEL, RESUME_TOKEN_BUDGET, MAX_PROMPT_SKILLS
+from utils.metrics import PROMPT_TOKENS
+from utils.skills import canonicalize_skills
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to an estimate
+    tiktoken = None
+
+_encoding = None
+
+def count_tokens(text):
+    """
+    Counts the tokens in a piece of text locally. Uses tiktoken when it is
+    installed, otherwise estimates four characters per token.
+    """
+    global _encoding
+    if not text:
+        return 0
+    if tiktoken is None:
+        return max(1, len(text) // 4)
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.encoding_for_model(ASSESSMENT_MODEL)
+        except KeyError:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+    return len(_encoding.encode(text, disallowed_special=()))
+
+# --- Resume Compaction ---
+# Resumes are split into sections at heading lines, i.e. short lines that end in a
+# section keyword ("Technical Skills", "Work Experience:"), so that a job title like
+# "Project Manager" stays in its section. Sections are kept in order of
+# usefulness for skill extraction until the token budget is spent, then emitted in
+# their original order. Boilerplate sections are dropped outright.
+
+_SECTION_PRIORITY = [
+    ("skills", ("skill", "technologies", "tech stack", "competencies", "tools")),
+    ("experience", ("experience", "employment", "work history", "career")),
+    ("projects", ("project",)),
+    ("summary", ("summary", "profile", "objective", "about me")),
+    ("certifications", ("certification", "certificate", "course", "training")),
+    ("education", ("education", "qualification", "academic")),
+]
+_BOILERPLATE = ("reference", "hobbies", "interests", "declaration", "personal details",
+                "personal information", "languages known")
+_HEADING = re.compile(r"^[A-Za-z][A-Za-z &/-]{1,40}:?$")
+_CONTACT = re.compile(r"\S+@\S+|https?://\S+|www\.\S+|\+?\d[\d ()-]{7,}\d")
+
+def _section_kind(line):
+    """Returns the section a heading line starts, "boilerplate", or None if it is not a heading."""
+    if not _HEADING.match(line) or len(line.split()) > 4:
+        return None
+    lower = line.lower().rstrip(":").strip()
+    last = lower.split()[-1]
+
+    def ends_with(words):
+        # Single keywords are stems ("skill" matches "Skills"); phrases match whole
+        return any(lower.endswith(word) if " " in word else last.startswith(word) for word in words)
+
+    if ends_with(_BOILERPLATE):
+        return "boilerplate"
+    for kind, words in _SECTION_PRIORITY:
+        if ends_with(words):
+            return kind
+    return None
+
+def compact_resume(text, budget=RESUME_TOKEN_BUDGET):
+    """
+    Shrinks resume text to fit a token budget, keeping the sections that matter for
+    skill extraction (skills, experience, projects, ...) and dropping boilerplate,
+    contact details and blank lines.
+
+    Args:
+        text (str): The extracted resume text.
+        budget (int, optional): The maximum number of tokens to keep.
+
+    Returns:
+        str: The compacted resume text.
+    """
+    sections = [["header", []]]
+    seen = set()
+    for raw_line in (text or "").splitlines():
+        line = re.sub(r"\s+", " ", _CONTACT.sub("", raw_line)).strip()
+        # Repeated lines are usually page headers and footers
+        if not re.search(r"\w", line) or line in seen:
+            continue
+        seen.add(line)
+        kind = _section_kind(line)
+        if kind:
+            sections.append([kind, [line]])
+        else:
+            sections[-1][1].append(line)
+
+    rank = {kind: i for i, (kind, _) in enumerate(_SECTION_PRIORITY)}
+    order = sorted(
+        (i for i, (kind, _) in enumerate(sections) if kind != "boilerplate"),
+        key=lambda i: (rank.get(sections[i][0], len(rank)), i)
+    )
+    # First pass: no section may take more than a third of the budget, so one long
+    # section cannot crowd out the others. Second pass: spend what is left in order.
+    kept = {i: 0 for i in order}
+    remaining = budget
+    for cap in (budget // 3, budget):
+        for i in order:
+            spent = 0
+            lines = sections[i][1]
+            while kept[i] < len(lines):
+                cost = count_tokens(lines[kept[i]]) + 1
+                if cost > remaining or spent + cost > cap:
+                    break
+                kept[i] += 1
+                spent += cost
+                remaining -= cost
+    return "\n".join(line for i in sorted(kept) for line in sections[i][1][:kept[i]])
+
+def compact_skills(skills, limit=MAX_PROMPT_SKILLS):
+    """Canonicalizes and deduplicates a skill list and caps it at `limit` entries."""
+    return canonicalize_skills(skills)[:limit]
+
+# --- Prompt Accounting ---
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+def log_prompt(name, system, prompt):
+    """
+    Records the token count of a prompt about to be sent, in prompt_stats() and in
+    the prompt_tokens histogram served by /metrics.
+
+    Returns:
+        int: The prompt's token count (system and user parts together).
+    """
+    tokens = count_tokens(system) + count_tokens(prompt)
+    with _stats_lock:
+        entry = _stats.setdefault(name, {"prompts": 0, "tokens": 0})
+        entry["prompts"] += 1
+        entry["tokens"] += tokens
+    PROMPT_TOKENS.observe((name,), tokens)
+    return tokens
+
+def prompt_stats():
+    """Returns this process's prompt counts and token totals by prompt name, with the average size."""
+    with _stats_lock:
+        stats = {name: dict(entry) for name, entry in _stats.items()}
+    for entry in stats.values():
+        entry["avg_tokens"] = round(entry["tokens"] / entry["prompts"], 1)
+    return stats
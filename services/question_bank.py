@@ -0,0 +1,181 @@
+# skill_validation_system/services/question_bank.py
+
+import json
+import random
+import threading
+import time
+import uuid
+from config import (
+    QUESTION_BANK_ENABLED, MAX_ASSESSMENT_SKILLS, QUESTION_BANK_MIN_VARIANTS,
+    QUESTION_BANK_MAX_AGE_DAYS, QUESTION_BANK_MAX_SERVES
+)
+from models.question_bank_entry import QuestionBankEntry
+from services.assessment_generator import iter_assessments_for_skills
+from utils.helpers import get_assessments_by_ids, save_assessments
+from utils.skills import canonicalize_skills, is_known_skill, skill_key
+from utils.storage import get_repository
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "skills_requested": 0,
+    "skills_from_bank": 0,
+    "questions_generated": 0,
+    "llm_calls": 0,
+    "estimated_tokens_saved": 0,
+}
+
+def _count(**increments):
+    with _metrics_lock:
+        for name, value in increments.items():
+            _metrics[name] += value
+
+def question_bank_stats():
+    """Returns this process's question bank counters, including the skill hit ratio."""
+    with _metrics_lock:
+        stats = dict(_metrics)
+    requested = stats["skills_requested"]
+    stats["hit_ratio"] = round(stats["skills_from_bank"] / requested, 4) if requested else 0.0
+    return stats
+
+def _estimate_tokens(assessment):
+    # Roughly four characters per token for English text and JSON
+    return max(1, len(json.dumps(assessment.to_dict())) // 4)
+
+def _pick_entry(skill, now):
+    """
+    Returns the bank entry to serve for a skill, or None when the skill needs a new
+    question: it has fewer than QUESTION_BANK_MIN_VARIANTS fresh questions. Among
+    fresh questions the least-served one is picked, ties broken at random.
+    """
+    max_age = QUESTION_BANK_MAX_AGE_DAYS * 86400
+    fresh = [
+        e for e in get_repository().find("question_bank", "skill", skill)
+        if now - e.created_at <= max_age and e.served_count < QUESTION_BANK_MAX_SERVES
+    ]
+    if len(fresh) < QUESTION_BANK_MIN_VARIANTS:
+        return None
+    return min(fresh, key=lambda e: (e.served_count, random.random()))
+
+def _select_skills(skills):
+    """
+    Picks the skills to assess, at most MAX_ASSESSMENT_SKILLS of them. The LLM no
+    longer sees the whole list, so the choice is made here rather than by the model:
+    skills the taxonomy knows (utils/skills.py) come first, then the others, each
+    group in the order the resume gave them.
+    """
+    canonical = canonicalize_skills(skills)
+    return sorted(canonical, key=lambda skill: not is_known_skill(skill))[:MAX_ASSESSMENT_SKILLS]
+
+def _seeded_id(seed, skill, ordinals):
+    """The ID of the next assessment for `skill` built under `seed`: the same on every run."""
+    key = skill_key(skill)
+    ordinals[key] = ordinals.get(key, 0) + 1
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"assessment:{seed}:{key}:{ordinals[key]}"))
+
+class DeferredWrites:
+    """
+    Collects the records build_assessment would save, so that a caller building
+    many candidates' assessments can write them all at once with `save`.
+    """
+
+    def __init__(self):
+        self.assessments = []
+        self.bank_entries = []
+        self.served = {}
+
+    def merge(self, other):
+        self.assessments.extend(other.assessments)
+        self.bank_entries.extend(other.bank_entries)
+        for entry_id, count in other.served.items():
+            self.served[entry_id] = self.served.get(entry_id, 0) + count
+
+    def save(self):
+        """Writes the collected assessments and bank updates, one write per collection."""
+        repository = get_repository()
+        if self.assessments:
+            save_assessments(self.assessments)
+        if self.bank_entries:
+            repository.save_many("question_bank", self.bank_entries)
+        repository.increment("question_bank", "served_count", self.served)
+
+def build_assessment(skills, on_progress=None, deferred=None, id_seed=None):
+    """
+    Builds and saves a candidate's assessment. Questions for skills the bank covers
+    are reused; only the remaining skills are sent to the LLM, one question each,
+    and the newly generated questions are added to the bank. Generated questions
+    are streamed and saved one by one as they arrive.
+
+    Args:
+        skills (list): The skills extracted from the candidate's resume.
+        on_progress (callable, optional): Called with the list of assessments
+            available so far, each time it grows.
+        deferred (DeferredWrites, optional): Collect the new records here instead
+            of saving them.
+        id_seed (str, optional): Derive the IDs of newly generated assessments from
+            this (e.g. the candidate ID) and their skill, so building the same
+            candidate again replaces them rather than adding new records.
+
+    Returns:
+        list: The Assessment objects making up the candidate's test.
+    """
+    assessments = []
+    ordinals = {}
+
+    def add(new_assessments):
+        assessments.extend(new_assessments)
+        if on_progress and new_assessments:
+            on_progress(list(assessments))
+
+    if not QUESTION_BANK_ENABLED:
+        _count(llm_calls=1)
+        for assessment in iter_assessments_for_skills(skills):
+            if id_seed is not None:
+                assessment.id = _seeded_id(id_seed, assessment.skill, ordinals)
+            if deferred is not None:
+                deferred.assessments.append(assessment)
+            else:
+                save_assessments([assessment])
+            _count(questions_generated=1)
+            add([assessment])
+        return assessments
+
+    canonical = _select_skills(skills)
+    now = time.time()
+    served = {}
+    gaps = []
+    for skill in canonical:
+        entry = _pick_entry(skill_key(skill), now)
+        if entry is None:
+            gaps.append(skill)
+        else:
+            served[entry.id] = entry
+
+    # Banked questions are available immediately, in the candidate's skill order
+    banked = get_assessments_by_ids(list(served))
+    if deferred is not None:
+        for entry_id in served:
+            deferred.served[entry_id] = deferred.served.get(entry_id, 0) + 1
+    else:
+        get_repository().increment("question_bank", "served_count", {entry_id: 1 for entry_id in served})
+    _count(
+        skills_requested=len(canonical),
+        skills_from_bank=len(banked),
+        estimated_tokens_saved=sum(_estimate_tokens(a) for a in banked),
+    )
+    add(banked)
+
+    if gaps:
+        _count(llm_calls=1)
+        for assessment in iter_assessments_for_skills(gaps, one_per_skill=True):
+            if id_seed is not None:
+                assessment.id = _seeded_id(id_seed, assessment.skill, ordinals)
+            entry = QuestionBankEntry(id=assessment.id, skill=skill_key(assessment.skill), created_at=now, served_count=1)
+            if deferred is not None:
+                deferred.assessments.append(assessment)
+                deferred.bank_entries.append(entry)
+            else:
+                save_assessments([assessment])
+                get_repository().save_many("question_bank", [entry])
+            _count(questions_generated=1)
+            add([assessment])
+    return assessments
@@ -0,0 +1,137 @@
+# skill_validation_system/services/rescoring.py
+
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from config import EMBEDDING_MODEL, RESCORE_CHECKPOINT_FILE, RESCORE_BATCH_SIZE
+from services.scoring_service import score_responses_batch
+from utils.file_handler import write_text_atomic
+from utils.helpers import refresh_validated_skills
+from utils.storage import get_repository
+
+def _score_batch(items):
+    """
+    Scores one batch of (answer, model_answer, question_type, question) items. Runs in a
+    worker process: MCQ and coding answers are scored locally and the rest through
+    one batched, cached embedding call and a single matrix operation.
+    """
+    return score_responses_batch(
+        [(answer, model_answer) for answer, model_answer, _, _ in items],
+        question_types=[question_type for _, _, question_type, _ in items],
+        questions=[question for _, _, _, question in items],
+    )
+
+def _read_checkpoint():
+    if not os.path.exists(RESCORE_CHECKPOINT_FILE):
+        return None
+    with open(RESCORE_CHECKPOINT_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_checkpoint(checkpoint):
+    write_text_atomic(RESCORE_CHECKPOINT_FILE, json.dumps(checkpoint))
+
+def _iter_batches(after, batch_size):
+    """Yields (responses, assessments by ID) for every batch of responses after the ID `after`."""
+    repository = get_repository()
+    while True:
+        responses = repository.scan("responses", after=after, limit=batch_size)
+        if not responses:
+            return
+        assessments = repository.get_many("assessments", list({r.assessment_id for r in responses}))
+        yield responses, {a.id: a for a in assessments}
+        after = responses[-1].id
+
+def rescore_responses(batch_size=RESCORE_BATCH_SIZE, workers=None, restart=False):
+    """
+    Re-scores every stored response with the current scoring logic and embedding model.
+
+    Responses are read in ID order, batch by batch, and the batches are scored in
+    parallel worker processes. Results are written back in order, one bulk save per
+    batch, and the last written ID is checkpointed, so an interrupted run resumes
+    where it stopped unless `restart` is set. Candidates' validated skills and
+    dashboard stats are recomputed once all responses are done.
+
+    Args:
+        batch_size (int, optional): Responses per batch.
+        workers (int, optional): Worker processes. 0 scores in this process.
+            Defaults to the number of CPUs.
+        restart (bool, optional): Ignore an existing checkpoint.
+
+    Returns:
+        dict: The final checkpoint: "rescored" and "skipped" counts, and the
+        throughput of this run in "per_second".
+    """
+    checkpoint = None if restart else _read_checkpoint()
+    if checkpoint and checkpoint.get("embedding_model") != EMBEDDING_MODEL:
+        print("The checkpoint was written for another embedding model; starting over.")
+        checkpoint = None
+    if checkpoint:
+        print(f"Resuming after {checkpoint['rescored']} rescored responses.")
+    else:
+        checkpoint = {"after": None, "rescored": 0, "skipped": 0, "embedding_model": EMBEDDING_MODEL}
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    pool = None
+    if workers > 0:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+    repository = get_repository()
+    started = time.monotonic()
+    done_this_run = 0
+
+    def commit(responses, scored, scores):
+        nonlocal done_this_run
+        for response, score in zip(scored, scores):
+            response.score = score
+        if scored:
+            repository.save_many("responses", scored)
+        checkpoint["after"] = responses[-1].id
+        checkpoint["rescored"] += len(scored)
+        checkpoint["skipped"] += len(responses) - len(scored)
+        _write_checkpoint(checkpoint)
+        done_this_run += len(responses)
+        rate = done_this_run / max(time.monotonic() - started, 1e-9)
+        print(f"Rescored {checkpoint['rescored']} responses ({rate:.0f} responses/sec).")
+
+    try:
+        # Keep a bounded number of batches in flight and commit them in order, so
+        # the checkpoint always marks a fully written prefix of the collection
+        pending = deque()
+        for responses, assessments in _iter_batches(checkpoint["after"], batch_size):
+            scored = [r for r in responses if r.assessment_id in assessments]
+            items = [
+                (r.answer, assessments[r.assessment_id].model_answer, assessments[r.assessment_id].question_type,
+                 assessments[r.assessment_id].question)
+                for r in scored
+            ]
+            if pool is None:
+                commit(responses, scored, _score_batch(items))
+                continue
+            pending.append((responses, scored, pool.submit(_score_batch, items)))
+            while len(pending) > workers * 2:
+                responses, scored, future = pending.popleft()
+                commit(responses, scored, future.result())
+        while pending:
+            responses, scored, future = pending.popleft()
+            commit(responses, scored, future.result())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    # Candidates hold one validated score per skill; refresh them all once at the
+    # end rather than after every batch, since a candidate's answers span batches
+    candidate_ids = [candidate_id for (candidate_id,) in repository.values("candidates", "id")]
+    for start in range(0, len(candidate_ids), batch_size):
+        refresh_validated_skills(candidate_ids[start:start + batch_size])
+
+    elapsed = time.monotonic() - started
+    checkpoint["per_second"] = round(done_this_run / elapsed, 1) if elapsed else 0.0
+    # The run finished, so the next one starts from the beginning
+    if os.path.exists(RESCORE_CHECKPOINT_FILE):
+        os.remove(RESCORE_CHECKPOINT_FILE)
+    return checkpoint
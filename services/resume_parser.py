@@ -1,42 +1,82 @@
 # skill_validation_system/services/resume_parser.py
 
+import json
+import os
+from config import SKILLS_CACHE_DIR, SKILL_EXTRACTION_MODE, SKILL_LOCAL_MIN_SKILLS
 from services.openai_service import generate_text
-from utils.file_handler import read_file_content
+from services.prompt_builder import compact_resume, log_prompt
+from utils.file_handler import read_file_content, file_digest, write_text_atomic
+from utils.skills import canonicalize_skills, extract_skills_from_text, TAXONOMY_VERSION
 
-def extract_skills_from_resume(resume_path):
+# Values of config.SKILL_EXTRACTION_MODE
+LOCAL = "local"
+LOCAL_THEN_LLM = "local_then_llm"
+LLM = "llm"
+
+# Identical on every call so the provider can cache it; only the resume varies.
+SKILLS_SYSTEM_PROMPT = """You extract skills from resumes.
+From the resume text the user sends, identify and extract a list of key technical and soft skills.
+The output should be a single line of comma-separated values and nothing else.
+For example: Python, Java, SQL, Project Management, Team Leadership, Communication"""
+
+def _extract_skills_with_llm(resume_content):
+    """
+    Asks the AI model for the resume's skills and returns them as a raw list, or
+    None if the model could not be reached.
+    """
+    # Only the most relevant sections of the resume are sent, within the token budget
+    prompt = f"Resume Content:\n---\n{compact_resume(resume_content)}\n---\nSkills:"
+    log_prompt("resume_skills", SKILLS_SYSTEM_PROMPT, prompt)
+
+    # Use the OpenAI service to get the skills list
+    skills_text = generate_text(prompt, system=SKILLS_SYSTEM_PROMPT)
+    if not skills_text:
+        return None
+    # Split the comma-separated string and strip whitespace from each skill
+    return [skill.strip() for skill in skills_text.split(',')]
+
+def extract_skills_from_resume(resume_path, mode=None):
     """
-    Extracts skills from a resume using an AI model.
+    Extracts skills from a resume. Depending on the mode, skills are found with the
+    local skill taxonomy (utils/skills.py), with an AI model, or locally first with
+    the model only consulted when fewer than SKILL_LOCAL_MIN_SKILLS are found. The
+    result is canonicalized and cached by the file's content hash, so a resume that
+    was already processed is not parsed again. A result missing the model's part
+    because the call failed is returned but not cached, so a later upload retries.
 
     Args:
         resume_path (str): The file path to the resume.
+        mode (str, optional): "local", "local_then_llm" or "llm". Defaults to
+            config.SKILL_EXTRACTION_MODE.
 
     Returns:
         list: A list of extracted skills.
     """
+    mode = mode or SKILL_EXTRACTION_MODE
+    try:
+        cache_path = os.path.join(SKILLS_CACHE_DIR, f"{file_digest(resume_path)}-{mode}-t{TAXONOMY_VERSION}.json")
+    except OSError as e:
+        print(f"Error reading file {resume_path}: {e}")
+        return []
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
     # Read the text content from the uploaded resume file (PDF or DOCX)
     resume_content = read_file_content(resume_path)
     if not resume_content:
         return []
 
-    # Create a prompt for the AI model to extract skills
-    prompt = f"""
-    From the following resume text, please identify and extract a list of key technical and soft skills.
-    The output should be a single line of comma-separated values.
-    For example: Python, Java, SQL, Project Management, Team Leadership, Communication
-
-    Resume Content:
-    ---
-    {resume_content}
-    ---
-    Skills:
-    """
-    
-    # Use the OpenAI service to get the skills list
-    skills_text = generate_text(prompt)
-    
-    # Process the returned string into a list of skills
-    if skills_text:
-        # Split the comma-separated string and strip whitespace from each skill
-        return [skill.strip() for skill in skills_text.split(',')]
-        
-    return []
+    skills = [] if mode == LLM else extract_skills_from_text(resume_content)
+    complete = True
+    if mode == LLM or (mode == LOCAL_THEN_LLM and len(skills) < SKILL_LOCAL_MIN_SKILLS):
+        llm_skills = _extract_skills_with_llm(resume_content)
+        complete = llm_skills is not None
+        skills = canonicalize_skills(skills + (llm_skills or []))
+
+    if skills and complete:
+        try:
+            write_text_atomic(cache_path, json.dumps(skills))
+        except OSError as e:
+            print(f"Could not cache skills for {resume_path}: {e}")
+    return skills
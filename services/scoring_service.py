@@ -1,10 +1,86 @@
-import numpy as np
-import faiss
-from services.openai_service import get_embedding
-from config import FAISS_INDEX_PATH
-import os
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+from services.openai_service import get_embedding, get_embeddings
+from utils.metrics import traced
 
-def score_response(response_text, model_answer):
+# --- Local scorers ---
+# Question types listed in LOCAL_SCORERS are scored without any network call; every
+# other type (e.g. 'subjective') falls through to embedding similarity.
+
+# A standalone option letter: "C", "(c)", "C) text", "c." or "Answer: C", but not the
+# first word of a sentence such as "I think C"
+_MCQ_CHOICE = re.compile(r"^\s*(?:(?:answer|option)\s*[:\-]?\s*)?\(?([a-z])(?:\)|[.:\-]|\s*$)", re.IGNORECASE)
+# The option lines of a question, e.g. "A) It is a database."
+_MCQ_OPTION = re.compile(r"^\s*\(?([A-Z])[).:]\s", re.MULTILINE)
+_CODE_TOKEN = re.compile(r"[A-Za-z_]\w*|\d+(?:\.\d+)?|==|!=|<=|>=|\*\*|//|->|[^\s\w]")
+
+def _mcq_choice(text, options=None):
+    """
+    Extracts the chosen option letter from answers like "C", "c)" or "Answer: C".
+    Returns None if there is none, or if it is not one of `options`.
+    """
+    match = _MCQ_CHOICE.match(text or "")
+    if match is None:
+        return None
+    choice = match.group(1).upper()
+    return choice if not options or choice in options else None
+
+def score_mcq(response_text, model_answer, question=None):
+    """
+    Scores a multiple-choice answer by exact, normalized option-letter matching.
+    When the question is given, only its own option letters count as a choice.
+    """
+    expected = _mcq_choice(model_answer)
+    if expected is None:
+        # The model answer is not a bare letter, so compare the normalized text instead
+        matched = " ".join((response_text or "").split()).lower() == " ".join((model_answer or "").split()).lower()
+    else:
+        options = set(_MCQ_OPTION.findall(question or "")) | {expected}
+        matched = _mcq_choice(response_text, options) == expected
+    return 100.0 if matched else 0.0
+
+def score_coding(response_text, model_answer, question=None):
+    """
+    Scores a coding answer by comparing its token stream with the model answer's.
+    The score averages the token-multiset overlap (order-insensitive) with the
+    longest-matching-subsequence ratio (order-sensitive), scaled to [0, 100].
+    """
+    response_tokens = _CODE_TOKEN.findall(response_text or "")
+    model_tokens = _CODE_TOKEN.findall(model_answer or "")
+    if not response_tokens or not model_tokens:
+        return 0.0
+    response_counts, model_counts = Counter(response_tokens), Counter(model_tokens)
+    overlap = sum((response_counts & model_counts).values()) / sum((response_counts | model_counts).values())
+    sequence = SequenceMatcher(None, response_tokens, model_tokens, autojunk=False).ratio()
+    return round((overlap + sequence) / 2 * 100, 2)
+
+LOCAL_SCORERS = {
+    "mcq": score_mcq,
+    "coding": score_coding,
+}
+
+@traced()
+def score_response(response_text, model_answer, question_type=None, question=None):
+    """
+    Scores a candidate's answer against the model answer, dispatching on the
+    question type: MCQ and coding answers are scored locally, everything else
+    by the cosine similarity of their embeddings.
+
+    Args:
+        response_text (str): The candidate's answer.
+        model_answer (str): The reference answer.
+        question_type (str, optional): The Assessment.question_type of the question.
+        question (str, optional): The question text, for the options of an MCQ.
+
+    Returns:
+        float: A score between 0 and 100.
+    """
+    local_scorer = LOCAL_SCORERS.get((question_type or "").lower())
+    if local_scorer is not None:
+        return local_scorer(response_text, model_answer, question)
+    import numpy as np
+    import faiss
 
     # Get the vector embeddings for both the candidate's answer and the model answer
     response_embedding = get_embedding(response_text)
@@ -30,29 +106,59 @@ def score_response(response_text, model_answer):
     # We scale from [-1, 1] to [0, 100]
     score = (similarity + 1) / 2 * 100
     
-    return round(score, 2)
+    return round(float(score), 2)
 
-def create_and_search_faiss_index(model_answers, candidate_answer):
-   
-    model_embeddings = [get_embedding(ans) for ans in model_answers if get_embedding(ans)]
-    candidate_embedding = get_embedding(candidate_answer)
+@traced()
+def score_responses_batch(pairs, question_types=None, questions=None):
+    """
+    Scores many (response_text, model_answer) pairs at once. Pairs whose question
+    type has a local scorer are scored without network calls; the remaining texts
+    are embedded through a single batched get_embeddings call and their cosine
+    similarities are computed in one vectorized operation.
 
-    if not model_embeddings or not candidate_embedding:
-        return None, None
+    Args:
+        pairs (list): A list of (response_text, model_answer) tuples.
+        question_types (list, optional): The question type of each pair.
+        questions (list, optional): The question text of each pair.
 
-    embeddings_np = np.array(model_embeddings).astype('float32')
-    dimension = embeddings_np.shape[1]
-    
-    # Using IndexFlatIP for cosine similarity after normalization
-    index = faiss.IndexFlatIP(dimension)
-    faiss.normalize_L2(embeddings_np)
-    index.add(embeddings_np)
+    Returns:
+        list: One score (0-100) per pair, in order. Pairs whose embeddings could not
+        be generated score 0.
+    """
+    if not pairs:
+        return []
 
-    candidate_vec = np.array([candidate_embedding]).astype('float32')
-    faiss.normalize_L2(candidate_vec)
+    scores = [0.0] * len(pairs)
+    embedded = []
+    for i, (response_text, model_answer) in enumerate(pairs):
+        question_type = question_types[i] if question_types else None
+        local_scorer = LOCAL_SCORERS.get((question_type or "").lower())
+        if local_scorer is not None:
+            scores[i] = local_scorer(response_text, model_answer, questions[i] if questions else None)
+        else:
+            embedded.append(i)
+    if not embedded:
+        return scores
+    import numpy as np
+    import faiss
 
-    # Search the index for the top 1 closest match
-    k = 1
-    distances, indices = index.search(candidate_vec, k)
-    
-    return distances, indices
+    texts = [text for i in embedded for text in pairs[i]]
+    embeddings = get_embeddings(texts)
+    response_embeddings = dict(zip(embedded, embeddings[0::2]))
+    model_embeddings = dict(zip(embedded, embeddings[1::2]))
+
+    # Only pairs with both embeddings take part in the matrix computation
+    valid = [i for i in embedded if response_embeddings[i] and model_embeddings[i]]
+    if not valid:
+        return scores
+
+    response_matrix = np.array([response_embeddings[i] for i in valid], dtype='float32')
+    model_matrix = np.array([model_embeddings[i] for i in valid], dtype='float32')
+    faiss.normalize_L2(response_matrix)
+    faiss.normalize_L2(model_matrix)
+
+    # Row-wise dot products give the cosine similarity of each pair, scaled to [0, 100]
+    similarities = np.einsum('ij,ij->i', response_matrix, model_matrix)
+    for i, similarity in zip(valid, similarities):
+        scores[i] = round(float((similarity + 1) / 2 * 100), 2)
+    return scores
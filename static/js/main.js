@@ -67,3 +67,107 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 });
+
+// Follows a background resume processing job on the processing page and moves on
+// to the assessment as soon as the server offers a redirect, i.e. once the first
+// questions are ready, even while the rest are still being generated. Uses server-sent events where available and
+// falls back to polling the JSON status endpoint.
+document.addEventListener('DOMContentLoaded', function() {
+    const progress = document.getElementById('job-progress');
+    if (!progress) {
+        return;
+    }
+
+    function handleStatus(data) {
+        if (data.redirect) {
+            window.location.href = data.redirect;
+            return true;
+        }
+        if (data.status === 'failed' || data.status === 'unknown') {
+            const errorBox = document.getElementById('job-error');
+            errorBox.textContent = data.error || 'Processing failed. Please try again.';
+            errorBox.hidden = false;
+            document.getElementById('job-restart').hidden = false;
+            document.getElementById('job-message').hidden = true;
+            return true;
+        }
+        return false;
+    }
+
+    if (handleStatus({
+        status: progress.dataset.status,
+        redirect: progress.dataset.redirectUrl,
+        error: document.getElementById('job-error').textContent.trim()
+    })) {
+        return;
+    }
+
+    function poll() {
+        fetch(progress.dataset.statusUrl, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.json())
+            .then(data => {
+                if (!handleStatus(data)) {
+                    setTimeout(poll, 1000);
+                }
+            })
+            .catch(() => setTimeout(poll, 2000));
+    }
+
+    if (window.EventSource) {
+        const source = new EventSource(progress.dataset.eventsUrl);
+        source.onmessage = function(event) {
+            if (handleStatus(JSON.parse(event.data))) {
+                source.close();
+            }
+        };
+        source.onerror = function() {
+            // The stream ended or was interrupted; keep following the job by polling
+            source.close();
+            poll();
+        };
+    } else {
+        poll();
+    }
+});
+
+// While the assessment is still being generated, appends new questions to the
+// form as they become available and enables submitting once all have arrived.
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('assessment-form');
+    if (!form || form.dataset.complete === 'true') {
+        return;
+    }
+
+    const container = document.getElementById('assessment-questions');
+    const pending = document.getElementById('questions-pending');
+    const submit = form.querySelector('button[type="submit"]');
+    let count = parseInt(form.dataset.count, 10) || 0;
+
+    function finish() {
+        pending.hidden = true;
+        submit.disabled = false;
+    }
+
+    function poll() {
+        fetch(`${form.dataset.questionsUrl}?after=${count}`, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.json())
+            .then(data => {
+                (data.questions || []).forEach(html => container.insertAdjacentHTML('beforeend', html));
+                if (typeof data.count === 'number') {
+                    count = data.count;
+                }
+                if (data.error) {
+                    pending.textContent = data.error;
+                    pending.hidden = false;
+                    submit.disabled = false;
+                } else if (data.complete) {
+                    finish();
+                } else {
+                    setTimeout(poll, 1000);
+                }
+            })
+            .catch(() => setTimeout(poll, 2000));
+    }
+
+    poll();
+});
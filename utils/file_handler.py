@@ -2,12 +2,38 @@
 
 import os
 import json
-import PyPDF2
-import docx
+import hashlib
+import multiprocessing
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+# PyPDF2 and python-docx are imported by the functions that parse documents, so
+# processes that never read a resume do not pay for loading them.
+from config import (
+    DATA_FORMAT, MAX_UPLOAD_BYTES, EXTRACT_CACHE_DIR, PDF_MAX_PAGES, PDF_PARALLEL_MIN_PAGES,
+    PDF_EXTRACT_WORKERS, EXTRACT_TIMEOUT
+)
+from utils.metrics import Span
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for DATA_FORMAT = "msgpack"
+    msgpack = None
+
+_CHUNK_SIZE = 1024 * 1024
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES."""
 
 def save_file(file, upload_folder):
     """
-    Saves an uploaded file to the specified folder, ensuring the folder exists.
+    Saves an uploaded file under its content hash, e.g. <sha256>.pdf.
+
+    The upload is streamed to a temporary file in chunks and hashed on the way, so
+    memory use stays bounded whatever the file size, then moved into place with an
+    atomic rename. Identical files share one stored copy and, because extracted text
+    and skills are cached by the same hash, are never parsed twice.
 
     Args:
         file: The file object from the Flask request.
@@ -15,19 +41,157 @@ def save_file(file, upload_folder):
 
     Returns:
         str: The full path to the saved file.
+
+    Raises:
+        UploadTooLargeError: If the file is larger than MAX_UPLOAD_BYTES.
+    """
+    return save_stream(file.stream, file.filename, upload_folder)
+
+def save_stream(stream, filename, upload_folder, max_bytes=MAX_UPLOAD_BYTES):
+    """
+    Saves a binary stream under its content hash, as save_file does for uploads.
+
+    Args:
+        stream: A readable binary file object.
+        filename (str): The original file name, for its extension.
+        upload_folder (str): The folder to save the file in.
+        max_bytes (int, optional): The size limit.
+
+    Returns:
+        str: The full path to the saved file.
+
+    Raises:
+        UploadTooLargeError: If the stream holds more than `max_bytes` bytes.
     """
     # Ensure the target directory exists. If not, create it.
-    if not os.path.exists(upload_folder):
-        os.makedirs(upload_folder)
-    
-    # Construct the full file path and save the file
-    filepath = os.path.join(upload_folder, file.filename)
-    file.save(filepath)
+    os.makedirs(upload_folder, exist_ok=True)
+
+    extension = os.path.splitext(filename or "")[1].lower()
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=upload_folder, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"The file is larger than the {max_bytes // (1024 * 1024)} MB limit."
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+        filepath = os.path.join(upload_folder, digest.hexdigest() + extension)
+        if os.path.exists(filepath):
+            # Same content already stored: keep the existing copy
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
     return filepath
 
+def write_text_atomic(path, text):
+    """Writes text to a temporary file and renames it into place, so readers never see partial content."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+# --- Resume Text Extraction ---
+# Extracted text is cached on disk under the SHA-256 of the file's bytes, so the
+# same resume is only parsed once. Bump the version when extraction changes.
+_EXTRACTOR_VERSION = "1"
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+def file_digest(filepath):
+    """Returns the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _extract_pdf_pages(filepath, start, stop, deadline=None):
+    """
+    Extracts the text of pages [start, stop) of a PDF. Runs in a worker process.
+    Stops after the page being read when the wall-clock `deadline` has passed, so a
+    timed-out extraction does not keep occupying the pool.
+    """
+    import PyPDF2
+    pages = []
+    with open(filepath, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for i in range(start, stop):
+            if deadline is not None and time.time() > deadline:
+                break
+            pages.append(reader.pages[i].extract_text() or "")
+    return pages
+
+def _get_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # forkserver avoids forking the (multi-threaded) web process itself
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS, mp_context=context)
+        return _pdf_pool
+
+def _read_pdf(filepath):
+    """
+    Extracts the text of up to PDF_MAX_PAGES pages. Large documents are split into
+    page ranges that are extracted in parallel worker processes. Extraction stops at
+    EXTRACT_TIMEOUT seconds and returns the pages finished by then.
+
+    Returns:
+        tuple: (text, complete), where `complete` is False if the timeout cut it short.
+    """
+    import PyPDF2
+    # Wall-clock time, as the deadline is also checked in the worker processes
+    deadline = time.time() + EXTRACT_TIMEOUT
+    with open(filepath, "rb") as f:
+        page_count = len(PyPDF2.PdfReader(f).pages)
+    if page_count > PDF_MAX_PAGES:
+        print(f"{filepath} has {page_count} pages; only the first {PDF_MAX_PAGES} are read.")
+        page_count = PDF_MAX_PAGES
+
+    if page_count < PDF_PARALLEL_MIN_PAGES or PDF_EXTRACT_WORKERS <= 1:
+        pages = _extract_pdf_pages(filepath, 0, page_count, deadline)
+    else:
+        chunk = -(-page_count // PDF_EXTRACT_WORKERS)
+        pool = _get_pdf_pool()
+        futures = [
+            (min(start + chunk, page_count) - start,
+             pool.submit(_extract_pdf_pages, filepath, start, min(start + chunk, page_count), deadline))
+            for start in range(0, page_count, chunk)
+        ]
+        pages = []
+        for size, future in futures:
+            try:
+                # Workers stop on their own at the deadline; allow for the page in progress
+                part = future.result(timeout=max(deadline - time.time(), 0) + 1)
+            except FuturesTimeoutError:
+                part = []
+            pages.extend(part)
+            if len(part) < size:
+                # This range was cut short, so later pages would leave a gap
+                for _, pending in futures:
+                    pending.cancel()
+                break
+    complete = len(pages) == page_count
+    if not complete:
+        print(f"Text extraction of {filepath} timed out after {len(pages)} of {page_count} pages.")
+    return "\n".join(pages), complete
+
 def read_file_content(filepath):
     """
     Reads the text content from a given file, supporting PDF (.pdf) and Word (.docx) formats.
+    Results are cached on disk by content hash, so re-processing the same file is free.
+    Text cut short by EXTRACT_TIMEOUT is returned but not cached.
 
     Args:
         filepath (str): The path to the file.
@@ -35,23 +199,46 @@ def read_file_content(filepath):
     Returns:
         str: The extracted text content of the file, or an empty string if the format is unsupported or an error occurs.
     """
-    content = ""
+    with Span("read_file_content") as span:
+        content = _read_file_content(filepath, span)
+        span.add("chars", len(content))
+        return content
+
+def _read_file_content(filepath, span):
+    lower = filepath.lower()
+    if not lower.endswith((".pdf", ".docx")):
+        return ""
     try:
+        cache_path = os.path.join(
+            EXTRACT_CACHE_DIR, f"{file_digest(filepath)}-v{_EXTRACTOR_VERSION}-p{PDF_MAX_PAGES}.txt"
+        )
+        if os.path.exists(cache_path):
+            span.add("cache_hits")
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return f.read()
+
+        span.add("bytes", os.path.getsize(filepath))
+        complete = True
         # Check the file extension to use the correct library
-        if filepath.lower().endswith(".pdf"):
-            with open(filepath, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                # Extract text from each page
-                for page in reader.pages:
-                    content += page.extract_text() or ""
-        elif filepath.lower().endswith(".docx"):
+        if lower.endswith(".pdf"):
+            content, complete = _read_pdf(filepath)
+        else:
+            import docx
             doc = docx.Document(filepath)
             # Extract text from each paragraph
-            for para in doc.paragraphs:
-                content += para.text + "\n"
+            content = "".join(para.text + "\n" for para in doc.paragraphs)
     except Exception as e:
         print(f"Error reading file {filepath}: {e}")
         return ""
+
+    if not complete:
+        # A partial text is returned but not cached, so a later read can get it all
+        span.add("partial")
+        return content
+    try:
+        write_text_atomic(cache_path, content)
+    except OSError as e:
+        print(f"Could not cache extracted text for {filepath}: {e}")
     return content
 
 def read_json(filepath):
@@ -73,18 +260,53 @@ def read_json(filepath):
         print(f"Error reading JSON from {filepath}: {e}")
         return []
 
-def write_json(filepath, data):
+# --- Record Files ---
+# The json storage backend keeps each collection in one file. With DATA_FORMAT
+# "msgpack" a .msgpack file next to it is used instead, which is smaller and faster
+# to encode and decode; an existing JSON file is still read until the collection
+# is first written.
+
+def check_data_format():
+    """Raises ValueError if config.DATA_FORMAT is unknown or its library is missing."""
+    if DATA_FORMAT not in ("json", "msgpack"):
+        raise ValueError(f"Unknown DATA_FORMAT '{DATA_FORMAT}'")
+    if DATA_FORMAT == "msgpack" and msgpack is None:
+        raise ValueError("DATA_FORMAT 'msgpack' requires the msgpack package (pip install msgpack)")
+
+def data_path(filepath):
+    """Returns the file a collection configured at `filepath` is written to."""
+    if DATA_FORMAT == "msgpack":
+        return os.path.splitext(filepath)[0] + ".msgpack"
+    return filepath
+
+def read_records(filepath):
+    """Reads a collection's records in the configured DATA_FORMAT. Returns [] if there are none."""
+    path = data_path(filepath)
+    if path == filepath or not os.path.exists(path):
+        return read_json(filepath)
+    try:
+        with open(path, 'rb') as f:
+            return msgpack.unpackb(f.read(), raw=False)
+    except (msgpack.UnpackException, ValueError, IOError) as e:
+        print(f"Error reading records from {path}: {e}")
+        return []
+
+def stage_records(filepath, data):
     """
-    Writes Python data (list or dict) to a JSON file with indentation.
+    Writes and fsyncs a collection's records in the configured DATA_FORMAT to a
+    temporary file next to it, without replacing the current file.
 
-    Args:
-        filepath (str): The path to the JSON file.
-        data (list or dict): The data to write.
+    Returns:
+        str: The temporary file, to be renamed over data_path(filepath).
     """
-    try:
-        # Ensure the directory exists before writing
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-    except IOError as e:
-        print(f"Error writing JSON to {filepath}: {e}")
+    path = data_path(filepath)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        if path == filepath:
+            f.write(json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+        else:
+            f.write(msgpack.packb(data, use_bin_type=True))
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
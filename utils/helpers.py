@@ -1,87 +1,219 @@
 # skill_validation_system/utils/helpers.py
 
-from utils.file_handler import read_json, write_json
-from config import CANDIDATES_FILE, ASSESSMENTS_FILE, RESPONSES_FILE
-from models.candidate import Candidate
-from models.assessment import Assessment
-from models.response import Response
+import base64
+import binascii
+import json
+from utils.storage import get_repository
+from utils.metrics import traced
+from models.candidate_stats import CandidateStats
+
+# Every public read and write helper is timed as a span named after the function.
+
+# --- Candidate Stats Helpers ---
+# Per-candidate aggregates backing the sortable HR dashboard. They are updated by
+# the write helpers below so that listing candidates never recomputes them.
+
+DASHBOARD_SORTS = {
+    "date": "seq",
+    "score": "sort_score",
+    "flagged": "flagged_count",
+}
+
+def _get_stats(candidate_id):
+    return get_repository().get("candidate_stats", candidate_id) or CandidateStats(id=candidate_id)
+
+def _stats_skills(candidate):
+    skills = set(candidate.skills or []) | set(candidate.validated_skills or {})
+    return sorted({s.strip().lower() for s in skills if s})
+
+def _mean_score(validated_skills):
+    if not validated_skills:
+        return None
+    return sum(validated_skills.values()) / len(validated_skills)
+
+def _refresh_candidate_fields(stats, candidate):
+    stats.mean_score = _mean_score(candidate.validated_skills)
+    stats.skills = _stats_skills(candidate)
+    return stats
+
+@traced()
+def rebuild_candidate_stats():
+    """
+    Recomputes the aggregates of every candidate from scratch, e.g. for data written
+    before the aggregates existed.
+
+    Returns:
+        int: The number of candidates processed.
+    """
+    repository = get_repository()
+    response_counts = repository.count_by("responses", "candidate_id")
+    flagged_counts = repository.count_by("responses", "candidate_id", flagged=True)
+    existing = {s.id: s for s in repository.all("candidate_stats")}
+    stats = []
+    for seq, candidate in enumerate(repository.all("candidates")):
+        entry = existing.get(candidate.id) or CandidateStats(id=candidate.id, seq=seq)
+        _refresh_candidate_fields(entry, candidate)
+        entry.response_count = response_counts.get(candidate.id, 0)
+        entry.flagged_count = flagged_counts.get(candidate.id, 0)
+        stats.append(entry)
+    repository.save_many("candidate_stats", stats)
+    return len(stats)
+
+def _encode_cursor(stats, sort_field):
+    raw = json.dumps([getattr(stats, sort_field), stats.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def _decode_cursor(cursor, sort_field):
+    """Returns the (sort value, id) keyset of a cursor, or None if it is malformed."""
+    try:
+        value, candidate_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, ValueError, TypeError, UnicodeError):
+        return None
+    # The value is compared against the sort field, so it must have the same type
+    expected = (int, float) if sort_field == "sort_score" else int
+    if isinstance(value, bool) or not isinstance(value, expected) or not isinstance(candidate_id, str):
+        return None
+    return (value, candidate_id)
+
+@traced()
+def get_candidates_page(sort="date", descending=False, skill=None, cursor=None, limit=25):
+    """
+    Returns one page of candidates using keyset pagination over the precomputed
+    per-candidate aggregates.
+
+    Args:
+        sort (str): One of DASHBOARD_SORTS ("date", "score" or "flagged").
+        descending (bool): Whether to sort from the highest value down.
+        skill (str, optional): Only include candidates claiming or validated in this skill.
+        cursor (str, optional): The `next_cursor` of the previous page.
+        limit (int): The maximum number of candidates to return.
+
+    Returns:
+        tuple: (list of (Candidate, CandidateStats) pairs, next_cursor or None).
+    """
+    sort_field = DASHBOARD_SORTS.get(sort, DASHBOARD_SORTS["date"])
+    after = _decode_cursor(cursor, sort_field) if cursor else None
+    has_item = ("skills", skill.strip().lower()) if skill and skill.strip() else None
+    repository = get_repository()
+    stats = repository.page(
+        "candidate_stats", sort_field, descending=descending, after=after,
+        limit=limit + 1, has_item=has_item
+    )
+    next_cursor = _encode_cursor(stats[limit - 1], sort_field) if len(stats) > limit else None
+    stats = stats[:limit]
+    candidates = {c.id: c for c in repository.get_many("candidates", [s.id for s in stats])}
+    return [(candidates[s.id], s) for s in stats if s.id in candidates], next_cursor
 
 # --- Candidate Helpers ---
 
+@traced()
 def get_all_candidates():
-    """Retrieves all candidates from the JSON data file."""
-    candidates_data = read_json(CANDIDATES_FILE)
-    return [Candidate.from_dict(c) for c in candidates_data]
+    """Retrieves all candidates from the configured storage backend."""
+    return get_repository().all("candidates")
 
+@traced()
 def get_candidate_by_id(candidate_id):
     """Retrieves a single candidate by their unique ID."""
-    for candidate in get_all_candidates():
-        if candidate.id == candidate_id:
-            return candidate
-    return None
+    return get_repository().get("candidates", candidate_id)
 
+@traced()
 def save_candidate(candidate):
-    """Adds a new candidate to the data file."""
-    candidates = [c.to_dict() for c in get_all_candidates()]
-    candidates.append(candidate.to_dict())
-    write_json(CANDIDATES_FILE, candidates)
+    """Adds a new candidate to the store."""
+    repository = get_repository()
+    repository.insert_many("candidates", [candidate])
+    stats = _refresh_candidate_fields(CandidateStats(id=candidate.id), candidate)
+    repository.save_many("candidate_stats", [stats])
 
+@traced()
+def save_candidates(candidates):
+    """Adds or replaces many candidates and their stats in one write per collection."""
+    repository = get_repository()
+    existing = {s.id: s for s in repository.get_many("candidate_stats", [c.id for c in candidates])}
+    repository.save_many("candidates", candidates)
+    repository.save_many("candidate_stats", [
+        _refresh_candidate_fields(existing.get(c.id) or CandidateStats(id=c.id), c) for c in candidates
+    ])
+
+@traced()
 def update_candidate(updated_candidate):
     """Finds a candidate by ID and updates their data."""
-    candidates = get_all_candidates()
-    updated_list = [
-        updated_candidate if c.id == updated_candidate.id else c for c in candidates
-    ]
-    write_json(CANDIDATES_FILE, [c.to_dict() for c in updated_list])
+    repository = get_repository()
+    repository.update("candidates", updated_candidate)
+    stats = _refresh_candidate_fields(_get_stats(updated_candidate.id), updated_candidate)
+    repository.save_many("candidate_stats", [stats])
 
 # --- Assessment Helpers ---
 
-def get_all_assessments():
-    """Retrieves all assessments from the JSON data file."""
-    assessments_data = read_json(ASSESSMENTS_FILE)
-    return [Assessment.from_dict(a) for a in assessments_data]
-
-def get_assessment_by_id(assessment_id):
-    """Retrieves a single assessment by its unique ID."""
-    for assessment in get_all_assessments():
-        if assessment.id == assessment_id:
-            return assessment
-    return None
+@traced()
+def get_assessments_by_ids(assessment_ids):
+    """Retrieves several assessments at once, in the given order, skipping unknown IDs."""
+    return get_repository().get_many("assessments", assessment_ids)
 
+@traced()
 def save_assessments(assessments_to_save):
-    """Adds a list of new assessments to the data file."""
-    all_assessments = [a.to_dict() for a in get_all_assessments()]
-    all_assessments.extend([a.to_dict() for a in assessments_to_save])
-    write_json(ASSESSMENTS_FILE, all_assessments)
+    """Adds a list of new assessments to the store."""
+    get_repository().insert_many("assessments", assessments_to_save)
 
 # --- Response Helpers ---
 
-def get_all_responses():
-    """Retrieves all responses from the JSON data file."""
-    responses_data = read_json(RESPONSES_FILE)
-    return [Response.from_dict(r) for r in responses_data]
-
+@traced()
 def get_responses_by_candidate_id(candidate_id):
     """Retrieves all responses submitted by a specific candidate."""
-    return [r for r in get_all_responses() if r.candidate_id == candidate_id]
-    
+    return get_repository().find("responses", "candidate_id", candidate_id)
+
+@traced()
 def get_response_by_id(response_id):
     """Retrieves a single response by its unique ID."""
-    for response in get_all_responses():
-        if response.id == response_id:
-            return response
-    return None
+    return get_repository().get("responses", response_id)
+
+def _refresh_response_counts(candidate_ids):
+    """Recounts the responses of the given candidates through the candidate_id index."""
+    repository = get_repository()
+    stats = []
+    for candidate_id in set(candidate_ids):
+        responses = repository.find("responses", "candidate_id", candidate_id)
+        entry = _get_stats(candidate_id)
+        entry.response_count = len(responses)
+        entry.flagged_count = sum(1 for r in responses if r.flagged)
+        stats.append(entry)
+    if stats:
+        repository.save_many("candidate_stats", stats)
 
+@traced()
 def save_responses(responses_to_save):
-    """Adds a list of new responses to the data file."""
-    all_responses = [r.to_dict() for r in get_all_responses()]
-    all_responses.extend([r.to_dict() for r in responses_to_save])
-    write_json(RESPONSES_FILE, all_responses)
+    """Adds a list of new responses to the store."""
+    get_repository().insert_many("responses", responses_to_save)
+    _refresh_response_counts(r.candidate_id for r in responses_to_save)
 
+@traced()
 def update_response(updated_response):
     """Finds a response by ID and updates its data."""
-    responses = get_all_responses()
-    updated_list = [
-        updated_response if r.id == updated_response.id else r for r in responses
-    ]
-    write_json(RESPONSES_FILE, [r.to_dict() for r in updated_list])
+    get_repository().update("responses", updated_response)
+    _refresh_response_counts([updated_response.candidate_id])
+
+@traced()
+def refresh_validated_skills(candidate_ids):
+    """
+    Recomputes the validated skills of the given candidates from their stored
+    response scores (one score per assessed skill, as at submission) and saves the
+    candidates and their stats in bulk. Used after responses have been re-scored.
+    """
+    repository = get_repository()
+    candidates = repository.get_many("candidates", list(set(candidate_ids)))
+    stats = []
+    for candidate in candidates:
+        responses = repository.find("responses", "candidate_id", candidate.id)
+        assessments = {a.id: a for a in repository.get_many("assessments", [r.assessment_id for r in responses])}
+        candidate.validated_skills = {
+            assessments[r.assessment_id].skill: r.score for r in responses if r.assessment_id in assessments
+        }
+        stats.append(_refresh_candidate_fields(_get_stats(candidate.id), candidate))
+    if candidates:
+        repository.save_many("candidates", candidates)
+        repository.save_many("candidate_stats", stats)
+
+# --- Diagnostics ---
+
+def get_cache_stats():
+    """Returns the storage backend's read-cache hit/miss counters per collection."""
+    return get_repository().cache_stats()
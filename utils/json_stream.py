@@ -0,0 +1,83 @@
+# skill_validation_system/utils/json_stream.py
+
+import json
+
+class IncrementalArrayParser:
+    """
+    Parses a JSON array of objects that arrives in chunks, e.g. from a streamed LLM
+    completion, and hands back every element as soon as its closing brace arrives.
+
+    Parsing starts at the first '[' followed, after optional whitespace, by '{';
+    anything before it (a markdown code fence, or preamble such as "[Note] ...")
+    is ignored. An element that is not valid JSON is skipped without
+    affecting its neighbours, and a truncated final element is simply never
+    returned, so one bad item no longer throws away the whole array.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._started = False
+        self._bracket = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.skipped = 0
+
+    def feed(self, chunk):
+        """
+        Consumes the next piece of text.
+
+        Returns:
+            list: The elements completed by this chunk, in order.
+        """
+        items = []
+        for char in chunk:
+            if self._finished:
+                break
+            if not self._started:
+                # A '[' only opens the array once the first element's '{' follows it
+                if char == "{" and self._bracket:
+                    self._started = True
+                    self._depth = 1
+                    self._buffer = ["{"]
+                elif not (char.isspace() and self._bracket):
+                    self._bracket = char == "["
+                continue
+            if self._depth == 0:
+                # Between elements: only an object opening or the array's end matter
+                if char == "{":
+                    self._depth = 1
+                    self._buffer = ["{"]
+                elif char == "]":
+                    self._finished = True
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._decode("".join(self._buffer))
+                    if item is not None:
+                        items.append(item)
+                    self._buffer = []
+        return items
+
+    def _decode(self, text):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            self.skipped += 1
+            print(f"Skipping malformed JSON array element: {e}")
+            return None
@@ -0,0 +1,472 @@
+# skill_validation_system/utils/metrics.py
+
+import atexit
+import bisect
+import contextvars
+import fcntl
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from config import TRACE_BUFFER_SIZE, METRICS_DIR, METRICS_FLUSH_SECONDS
+
+# --- Metrics Registry ---
+# Counters and latency histograms, exported in the Prometheus text format by the
+# /metrics route. Each worker process records into its own registry and writes it to
+# METRICS_DIR; a scrape sums the registries of every worker, see render_metrics().
+
+PREFIX = "skill_validation"
+# Latency buckets in seconds, from in-memory lookups up to slow LLM completions.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Prompt size buckets in tokens, around RESUME_TOKEN_BUDGET.
+TOKEN_BUCKETS = (250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000, 16000, 32000)
+
+
+class Counter:
+    """A monotonically increasing value per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        _start_flushing()
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self):
+        """Returns a copy of the values: {labels: value}."""
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def merge(into, values):
+        """Adds the values of another registry to `into`."""
+        for labels, value in values.items():
+            into[labels] = into.get(labels, 0) + value
+
+    def samples(self, values=None):
+        values = self.snapshot() if values is None else values
+        return [(self.name, labels, value) for labels, value in values.items()]
+
+
+class Histogram:
+    """Observations counted into cumulative buckets per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        _start_flushing()
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self):
+        """Returns a copy of the values: {labels: [bucket counts, sum, count]}."""
+        with self._lock:
+            return {labels: [list(counts), total, count] for labels, (counts, total, count) in self._values.items()}
+
+    @staticmethod
+    def merge(into, values):
+        """Adds the values of another registry to `into`."""
+        for labels, (counts, total, count) in values.items():
+            entry = into.get(labels)
+            if entry is None:
+                into[labels] = [list(counts), total, count]
+            else:
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+                entry[2] += count
+
+    def samples(self, values=None):
+        values = self.snapshot() if values is None else values
+        samples = []
+        for labels, (counts, total, count) in values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", labels + (("le", _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+SPAN_SECONDS = Histogram(f"{PREFIX}_span_seconds", "Duration of instrumented operations.", ("span",))
+SPAN_ERRORS = Counter(f"{PREFIX}_span_errors_total", "Instrumented operations that raised.", ("span",))
+SPAN_UNITS = Counter(f"{PREFIX}_span_units_total", "Tokens, bytes, records etc. handled by instrumented operations.",
+                     ("span", "unit"))
+REQUEST_SECONDS = Histogram(f"{PREFIX}_http_request_seconds", "Duration of HTTP requests.",
+                            ("endpoint", "method", "status"))
+PROMPT_TOKENS = Histogram(f"{PREFIX}_prompt_tokens", "Tokens in each prompt sent to the LLM.", ("prompt",),
+                          buckets=TOKEN_BUCKETS)
+METRICS = [SPAN_SECONDS, SPAN_ERRORS, SPAN_UNITS, REQUEST_SECONDS, PROMPT_TOKENS]
+
+
+def observe_request(endpoint, method, status, seconds):
+    """Records the duration of one HTTP request."""
+    REQUEST_SECONDS.observe((endpoint or "unmatched", method, str(status)), seconds)
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# --- Multiprocess Aggregation ---
+# Every process that records metrics writes its registry, and the gauges of its
+# caches, to METRICS_DIR/<pid>-<start time>.json from a background thread. A scrape
+# writes the serving process's file and sums every file under an flock. Files of
+# processes that have exited are folded into archive.json, so their counts are
+# kept without the directory growing with every restarted worker.
+
+_ARCHIVE = "archive.json"
+_process_file = None
+_process_gauges = None
+_flush_lock = threading.Lock()
+
+
+def register_process_gauges(func):
+    """
+    Registers a function returning this process's gauges, as (name, help,
+    {labels tuple: value}) tuples. They are written with the process's metrics and
+    exported with a "pid" label per live process.
+    """
+    global _process_gauges
+    _process_gauges = func
+
+
+def _start_flushing():
+    """Starts writing this process's metrics file, once per process."""
+    global _process_file
+    if _process_file is not None or not METRICS_DIR:
+        return
+    with _flush_lock:
+        if _process_file is not None:
+            return
+        _process_file = os.path.join(METRICS_DIR, f"{os.getpid()}-{time.time_ns()}.json")
+    threading.Thread(target=_flush_periodically, name="metrics-flush", daemon=True).start()
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        _flush()
+
+
+def _gauges():
+    if _process_gauges is None:
+        return []
+    try:
+        return list(_process_gauges())
+    except Exception as e:
+        print(f"Error reading process gauges: {e}")
+        return []
+
+
+def _flush():
+    """Writes this process's metrics and gauges to its file in METRICS_DIR."""
+    path = _process_file
+    if path is None:
+        return
+    state = {
+        "pid": os.getpid(),
+        "metrics": {m.name: [[list(labels), value] for labels, value in m.snapshot().items()] for m in METRICS},
+        "gauges": [[name, help, [[[list(p) for p in pairs], value] for pairs, value in values.items()]]
+                   for name, help, values in _gauges()],
+    }
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing metrics to {path}: {e}")
+
+
+def _read_state(path):
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    metrics = {name: {tuple(labels): value for labels, value in values} for name, values in state["metrics"].items()}
+    gauges = [(name, help, {tuple(tuple(p) for p in pairs): value for pairs, value in values})
+              for name, help, values in state.get("gauges", [])]
+    return state.get("pid"), metrics, gauges
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _collect():
+    """
+    Sums the metrics of every process in METRICS_DIR and gathers the gauges of the
+    live ones. Returns ({metric name: values}, [(name, help, {labels: value})]).
+    """
+    _start_flushing()
+    _flush()
+    totals = {m.name: {} for m in METRICS}
+    archive = {m.name: {} for m in METRICS}
+    gauges, dead = {}, []
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    with open(os.path.join(METRICS_DIR, ".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        for entry in sorted(os.scandir(METRICS_DIR), key=lambda e: e.name):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                pid, metrics, process_gauges = _read_state(entry.path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Skipping unreadable metrics file {entry.path}: {e}")
+                continue
+            for metric in METRICS:
+                metric.merge(totals[metric.name], metrics.get(metric.name, {}))
+            if entry.name != _ARCHIVE and _is_alive(pid):
+                for name, help, values in process_gauges:
+                    merged = gauges.setdefault(name, (help, {}))[1]
+                    for pairs, value in values.items():
+                        merged[pairs + (("pid", pid),)] = value
+                continue
+            for metric in METRICS:
+                metric.merge(archive[metric.name], metrics.get(metric.name, {}))
+            if entry.name != _ARCHIVE:
+                dead.append(entry.path)
+        if dead:
+            state = {"pid": None, "metrics": {
+                name: [[list(labels), value] for labels, value in values.items()] for name, values in archive.items()
+            }}
+            tmp_path = os.path.join(METRICS_DIR, _ARCHIVE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp_path, os.path.join(METRICS_DIR, _ARCHIVE))
+            for path in dead:
+                os.remove(path)
+    return totals, [(name, help, values) for name, (help, values) in gauges.items()]
+
+
+def _after_fork():
+    # A forked worker starts with empty metrics of its own instead of the parent's
+    global _process_file, _flush_lock
+    _process_file = None
+    _flush_lock = threading.Lock()
+    for metric in METRICS:
+        metric._lock = threading.Lock()
+        metric._values = {}
+
+
+os.register_at_fork(after_in_child=_after_fork)
+atexit.register(_flush)
+
+
+def render_metrics(gauges=()):
+    """
+    Renders every metric in the Prometheus text exposition format. With METRICS_DIR
+    set, the counters and histograms are the sums over every worker process, and
+    each process's gauges (see register_process_gauges) carry a "pid" label.
+
+    Args:
+        gauges (iterable, optional): Extra (name, help, {labels tuple: value})
+            gauges read at scrape time, e.g. the size of the talent index. `labels
+            tuple` is a tuple of (label, value) pairs.
+
+    Returns:
+        str: The exposition text.
+    """
+    if METRICS_DIR:
+        values, process_gauges = _collect()
+    else:
+        values, process_gauges = {m.name: m.snapshot() for m in METRICS}, _gauges()
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples(values[metric.name]):
+            pairs = tuple(zip(metric.labelnames, labels)) + tuple(labels[len(metric.labelnames):])
+            lines.append(_sample_line(name, pairs, value))
+    for name, help, values in list(process_gauges) + list(gauges):
+        lines.append(f"# HELP {PREFIX}_{name} {help}")
+        lines.append(f"# TYPE {PREFIX}_{name} gauge")
+        for pairs, value in values.items():
+            lines.append(_sample_line(f"{PREFIX}_{name}", pairs, value))
+    return "\n".join(lines) + "\n"
+
+
+def _sample_line(name, pairs, value):
+    if pairs:
+        labels = ",".join(f'{key}="{_escape(val)}"' for key, val in pairs)
+        return f"{name}{{{labels}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+# --- Spans ---
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_recent_traces = deque(maxlen=TRACE_BUFFER_SIZE)
+_recent_lock = threading.Lock()
+
+
+class Span:
+    """
+    Times a block of code and records it under SPAN_SECONDS, and in the request's
+    trace when one is active. Use `add` to count tokens, bytes or records.
+
+        with Span("generate_text") as span:
+            span.add("prompt_tokens", 120)
+    """
+
+    __slots__ = ("name", "units", "started")
+
+    def __init__(self, name):
+        self.name = name
+        self.units = None
+        self.started = None
+
+    def add(self, unit, amount=1):
+        if self.units is None:
+            self.units = {}
+        self.units[unit] = self.units.get(unit, 0) + amount
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        labels = (self.name,)
+        SPAN_SECONDS.observe(labels, elapsed)
+        # A generator span closed early by its consumer did not fail
+        failed = exc_type is not None and not issubclass(exc_type, GeneratorExit)
+        if failed:
+            SPAN_ERRORS.inc(labels)
+        if self.units:
+            for unit, amount in self.units.items():
+                SPAN_UNITS.inc((self.name, unit), amount)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.record(self, elapsed, failed)
+        return False
+
+
+def traced(name=None):
+    """Decorator that runs every call of a function in a Span (named after the function by default)."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- Request Traces ---
+
+class RequestTrace:
+    """The spans recorded while serving one request, in the order they finished."""
+
+    __slots__ = ("method", "path", "started", "started_at", "spans", "duration", "status")
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.spans = []
+        self.duration = None
+        self.status = None
+
+    def record(self, span, elapsed, failed):
+        self.spans.append((span.name, span.started - self.started, elapsed, span.units, failed))
+
+    def server_timing(self):
+        """
+        Sums the spans by name for a Server-Timing header (durations in ms). The
+        total is the time so far while the request is still being served.
+        """
+        totals = {}
+        for name, _, elapsed, _, _ in self.spans:
+            count, total = totals.get(name, (0, 0.0))
+            totals[name] = (count + 1, total + elapsed)
+        parts = [f'{name.replace(".", "-")};dur={total * 1000:.2f};desc="{count}x"' for name, (count, total) in totals.items()]
+        duration = self.duration if self.duration is not None else time.perf_counter() - self.started
+        parts.append(f"total;dur={duration * 1000:.2f}")
+        return ", ".join(parts)
+
+    def to_dict(self):
+        return {
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "status": self.status,
+            "duration_ms": round((self.duration or 0) * 1000, 3),
+            "spans": [
+                {"name": name, "offset_ms": round(offset * 1000, 3), "duration_ms": round(elapsed * 1000, 3),
+                 "units": units or {}, "error": failed}
+                for name, offset, elapsed, units, failed in self.spans
+            ],
+        }
+
+
+def start_trace(method, path):
+    """Starts collecting the spans of the current request. Returns the trace."""
+    trace = RequestTrace(method, path)
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace():
+    """Returns the trace of the current request, or None."""
+    return _current_trace.get()
+
+
+def finish_trace(status):
+    """Stops collecting spans, keeps the trace among the recent ones and returns it (or None)."""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    _current_trace.set(None)
+    trace.duration = time.perf_counter() - trace.started
+    trace.status = status
+    with _recent_lock:
+        _recent_traces.append(trace)
+    return trace
+
+
+def recent_traces(limit=50):
+    """Returns up to `limit` of this process's latest request traces, newest first."""
+    with _recent_lock:
+        traces = list(_recent_traces)[-limit:]
+    return [trace.to_dict() for trace in reversed(traces)]
@@ -0,0 +1,181 @@
+# skill_validation_system/utils/sessions.py
+
+import os
+import random
+import secrets
+import sqlite3
+import threading
+import time
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+from config import SESSION_BACKEND, SESSIONS_DB_PATH, REDIS_URL, SESSION_LIFETIME
+
+try:
+    import redis
+except ImportError:  # optional: only needed for SESSION_BACKEND = "redis"
+    redis = None
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """A session whose data lives in a SessionStore; the cookie only holds its ID."""
+
+    def __init__(self, initial=None, sid=None, new=False, expires_at=None):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires_at = expires_at
+        self.modified = False
+
+
+class SqliteSessionStore:
+    """
+    Sessions in a SQLite database (WAL mode), shared by every worker on the host.
+    Expired rows are ignored on read and deleted in small, occasional sweeps that
+    use the expiry index, so no request pays for a full table scan.
+    """
+
+    def __init__(self, db_path=SESSIONS_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)")
+            self._local.conn = conn
+        return conn
+
+    def load(self, sid):
+        """Returns (data, expires_at) for a live session, or None."""
+        row = self._connect().execute(
+            "SELECT data, expires_at FROM sessions WHERE id = ? AND expires_at > ?", (sid, time.time())
+        ).fetchone()
+        return row
+
+    def save(self, sid, data, expires_at):
+        conn = self._connect()
+        conn.execute("INSERT OR REPLACE INTO sessions (id, data, expires_at) VALUES (?, ?, ?)", (sid, data, expires_at))
+        if random.random() < 0.01:
+            conn.execute(
+                "DELETE FROM sessions WHERE id IN (SELECT id FROM sessions WHERE expires_at <= ? LIMIT 500)",
+                (time.time(),)
+            )
+
+    def touch(self, sid, expires_at):
+        self._connect().execute("UPDATE sessions SET expires_at = ? WHERE id = ?", (expires_at, sid))
+
+    def delete(self, sid):
+        self._connect().execute("DELETE FROM sessions WHERE id = ?", (sid,))
+
+
+class RedisSessionStore:
+    """Sessions in Redis (or any Redis-compatible server), expired by the server's own TTLs."""
+
+    prefix = "session:"
+
+    def __init__(self, url=REDIS_URL):
+        if redis is None:
+            raise ValueError("SESSION_BACKEND 'redis' requires the redis package (pip install redis)")
+        self._client = redis.Redis.from_url(url)
+
+    def load(self, sid):
+        pipe = self._client.pipeline()
+        pipe.get(self.prefix + sid)
+        pipe.pttl(self.prefix + sid)
+        data, ttl_ms = pipe.execute()
+        if data is None:
+            return None
+        return data.decode("utf-8"), time.time() + max(ttl_ms, 0) / 1000
+
+    def save(self, sid, data, expires_at):
+        self._client.set(self.prefix + sid, data, px=max(int((expires_at - time.time()) * 1000), 1))
+
+    def touch(self, sid, expires_at):
+        self._client.pexpireat(self.prefix + sid, int(expires_at * 1000))
+
+    def delete(self, sid):
+        self._client.delete(self.prefix + sid)
+
+
+STORES = {
+    "sqlite": SqliteSessionStore,
+    "redis": RedisSessionStore,
+}
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Keeps session data in a shared store, so a request can be served by any worker
+    on any host. The cookie holds a random session ID signed with SECRET_KEY.
+    Sessions expire SESSION_LIFETIME seconds after they were last used; the expiry
+    is only pushed back once half of it has passed, so most requests that do not
+    change the session cause no write at all.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store, lifetime=SESSION_LIFETIME):
+        self.store = store
+        self.lifetime = lifetime
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt="server-side-session")
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode("ascii")
+            except BadSignature:
+                sid = None
+            stored = self.store.load(sid) if sid else None
+            if stored is not None:
+                data, expires_at = stored
+                return ServerSideSession(self.serializer.loads(data), sid=sid, expires_at=expires_at)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        expires_at = now + self.lifetime
+        if session.modified or session.new:
+            self.store.save(session.sid, self.serializer.dumps(dict(session)), expires_at)
+        elif session.expires_at - now < self.lifetime / 2:
+            self.store.touch(session.sid, expires_at)
+        else:
+            return
+        response.set_cookie(
+            name, self._signer(app).sign(session.sid).decode("ascii"),
+            expires=expires_at if session.permanent else None, httponly=self.get_cookie_httponly(app),
+            domain=domain, path=path, secure=self.get_cookie_secure(app), samesite=self.get_cookie_samesite(app),
+        )
+
+
+def make_session_interface(backend=SESSION_BACKEND):
+    """Returns the session interface for config.SESSION_BACKEND, or None to keep Flask's cookie sessions."""
+    if backend == "cookie":
+        return None
+    if backend not in STORES:
+        raise ValueError(f"Unknown SESSION_BACKEND '{backend}'")
+    return ServerSideSessionInterface(STORES[backend]())
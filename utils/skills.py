@@ -0,0 +1,172 @@
+# skill_validation_system/utils/skills.py
+
+import re
+
+# Part of the skills cache key (services/resume_parser.py). Bump it when the aliases
+# or the extractor change, so resumes are not answered from stale results.
+TAXONOMY_VERSION = "2"
+
+# Common alternative spellings and abbreviations, mapped to one canonical name.
+# Keys are lower-case and compared after whitespace/punctuation normalization.
+SKILL_ALIASES = {
+    "js": "JavaScript", "javascript": "JavaScript", "ecmascript": "JavaScript",
+    "ts": "TypeScript", "typescript": "TypeScript",
+    "py": "Python", "python": "Python", "python3": "Python", "python 3": "Python",
+    "golang": "Go", "go": "Go",
+    "c#": "C#", "csharp": "C#", "c sharp": "C#",
+    "c++": "C++", "cpp": "C++",
+    "node": "Node.js", "nodejs": "Node.js", "node.js": "Node.js", "node js": "Node.js",
+    "react": "React", "reactjs": "React", "react.js": "React", "react js": "React",
+    "vue": "Vue.js", "vuejs": "Vue.js", "vue.js": "Vue.js",
+    "angular": "Angular", "angularjs": "Angular",
+    "sql": "SQL", "mysql": "MySQL", "postgres": "PostgreSQL", "postgresql": "PostgreSQL",
+    "mongo": "MongoDB", "mongodb": "MongoDB",
+    "k8s": "Kubernetes", "kubernetes": "Kubernetes",
+    "docker": "Docker",
+    "aws": "AWS", "amazon web services": "AWS",
+    "gcp": "Google Cloud", "google cloud": "Google Cloud", "google cloud platform": "Google Cloud",
+    "azure": "Azure", "microsoft azure": "Azure",
+    "ml": "Machine Learning", "machine learning": "Machine Learning",
+    "dl": "Deep Learning", "deep learning": "Deep Learning",
+    "ai": "Artificial Intelligence", "artificial intelligence": "Artificial Intelligence",
+    "nlp": "Natural Language Processing", "natural language processing": "Natural Language Processing",
+    "ci/cd": "CI/CD", "cicd": "CI/CD", "ci cd": "CI/CD",
+    "git": "Git", "github": "GitHub",
+    "rest": "REST APIs", "rest api": "REST APIs", "rest apis": "REST APIs", "restful apis": "REST APIs",
+    "oop": "Object-Oriented Programming", "object oriented programming": "Object-Oriented Programming",
+    "object-oriented programming": "Object-Oriented Programming",
+    "communication": "Communication", "communication skills": "Communication",
+    "leadership": "Leadership", "team leadership": "Team Leadership",
+    "project management": "Project Management", "pm": "Project Management",
+    "problem solving": "Problem Solving", "problem-solving": "Problem Solving",
+    "java": "Java", "kotlin": "Kotlin", "swift": "Swift", "scala": "Scala", "rust": "Rust",
+    "ruby": "Ruby", "ruby on rails": "Ruby on Rails", "rails": "Ruby on Rails",
+    "php": "PHP", "laravel": "Laravel", "perl": "Perl", "r": "R", "matlab": "MATLAB",
+    "bash": "Bash", "shell scripting": "Shell Scripting", "powershell": "PowerShell",
+    "html": "HTML", "html5": "HTML", "css": "CSS", "css3": "CSS", "sass": "Sass", "tailwind": "Tailwind CSS",
+    "tailwind css": "Tailwind CSS", "bootstrap": "Bootstrap", "jquery": "jQuery",
+    "next.js": "Next.js", "nextjs": "Next.js", "redux": "Redux", "graphql": "GraphQL",
+    "express": "Express.js", "express.js": "Express.js", "expressjs": "Express.js",
+    "django": "Django", "flask": "Flask", "fastapi": "FastAPI", "spring": "Spring",
+    "spring boot": "Spring Boot", ".net": ".NET", "dotnet": ".NET", "asp.net": "ASP.NET",
+    "pandas": "pandas", "numpy": "NumPy", "scikit-learn": "scikit-learn", "sklearn": "scikit-learn",
+    "tensorflow": "TensorFlow", "pytorch": "PyTorch", "keras": "Keras", "spark": "Apache Spark",
+    "apache spark": "Apache Spark", "pyspark": "Apache Spark", "hadoop": "Hadoop", "kafka": "Kafka",
+    "apache kafka": "Kafka", "airflow": "Airflow", "tableau": "Tableau", "power bi": "Power BI",
+    "excel": "Excel", "microsoft excel": "Excel", "ms excel": "Excel", "data analysis": "Data Analysis",
+    "data visualization": "Data Visualization", "computer vision": "Computer Vision",
+    "llm": "Large Language Models", "llms": "Large Language Models", "large language models": "Large Language Models",
+    "redis": "Redis", "elasticsearch": "Elasticsearch", "sqlite": "SQLite", "oracle": "Oracle",
+    "nosql": "NoSQL", "dynamodb": "DynamoDB", "firebase": "Firebase",
+    "terraform": "Terraform", "ansible": "Ansible", "jenkins": "Jenkins", "linux": "Linux",
+    "unix": "Unix", "nginx": "Nginx", "microservices": "Microservices", "devops": "DevOps",
+    "agile": "Agile", "agile methodology": "Agile", "agile methodologies": "Agile", "agile development": "Agile",
+    "agile delivery": "Agile", "scrum": "Scrum", "kanban": "Kanban", "jira": "Jira",
+    "unit testing": "Unit Testing", "selenium": "Selenium", "pytest": "pytest", "jest": "Jest",
+    "data structures": "Data Structures", "algorithms": "Algorithms", "system design": "System Design",
+    "teamwork": "Teamwork", "time management": "Time Management", "mentoring": "Mentoring",
+    "stakeholder management": "Stakeholder Management", "public speaking": "Public Speaking",
+}
+
+# Aliases that are ordinary words or too short to trust in free text ("go to",
+# "2 pm", "the rest of", "excel at", "spark interest", "under the leadership of").
+# They still resolve names returned by the LLM, but the local extractor does not
+# look for them in resumes; longer aliases such as "microsoft excel", "apache spark"
+# or "communication skills" are still found.
+AMBIGUOUS_ALIASES = {
+    "go", "pm", "rest", "r", "ts", "py", "dl", "node", "spring", "express", "oracle", "swift", "rust",
+    "excel", "spark", "communication", "leadership", "agile", "flask",
+}
+
+def _normalize(name):
+    return re.sub(r"\s+", " ", (name or "").strip().strip(".,;:*-").strip()).lower()
+
+def canonical_skill(name):
+    """
+    Returns the canonical display name of a skill, resolving aliases.
+    Unknown skills keep their own spelling with normalized whitespace.
+    """
+    normalized = _normalize(name)
+    if not normalized:
+        return ""
+    return SKILL_ALIASES.get(normalized) or re.sub(r"\s+", " ", name.strip().strip(".,;:*-").strip())
+
+def skill_key(name):
+    """Returns the case-insensitive key under which a skill is cached and compared."""
+    return canonical_skill(name).lower()
+
+_CANONICAL_KEYS = {name.lower() for name in SKILL_ALIASES.values()}
+
+def is_known_skill(name):
+    """Returns whether a skill resolves to one of the taxonomy's canonical names."""
+    return skill_key(name) in _CANONICAL_KEYS
+
+def canonicalize_skills(skills):
+    """
+    Canonicalizes a list of skills, dropping empty entries and duplicates
+    (after alias resolution) while keeping the original order.
+    """
+    seen = set()
+    result = []
+    for skill in skills or []:
+        canonical = canonical_skill(skill)
+        if canonical and canonical.lower() not in seen:
+            seen.add(canonical.lower())
+            result.append(canonical)
+    return result
+
+# --- Local Extraction ---
+# Resume text is split into lower-case tokens that keep the symbols skill names use
+# ("c++", "c#", "node.js"), and the taxonomy's aliases, tokenized the same way, are
+# compiled into a trie of tokens. One left-to-right pass takes the longest alias
+# starting at each token, so the cost is linear in the length of the resume.
+
+_TOKEN = re.compile(r"[a-z0-9+#][a-z0-9+#]*(?:\.[a-z0-9+#]+)*|\.[a-z]+")
+_TERMINAL = object()
+_trie = None
+
+def _tokens(text):
+    return _TOKEN.findall(text.lower())
+
+def _build_trie(aliases):
+    trie = {}
+    for alias, canonical in aliases.items():
+        if alias in AMBIGUOUS_ALIASES:
+            continue
+        node = trie
+        for token in _tokens(alias):
+            node = node.setdefault(token, {})
+        node[_TERMINAL] = canonical
+    return trie
+
+def extract_skills_from_text(text):
+    """
+    Finds the taxonomy's skills mentioned in a piece of text without calling an LLM.
+
+    Args:
+        text (str): The resume text.
+
+    Returns:
+        list: Canonical skill names in order of first mention, without duplicates.
+    """
+    global _trie
+    if _trie is None:
+        _trie = _build_trie(SKILL_ALIASES)
+    tokens = _tokens(text or "")
+    found = {}
+    i = 0
+    while i < len(tokens):
+        node = _trie
+        match, end = None, i
+        j = i
+        while j < len(tokens) and tokens[j] in node:
+            node = node[tokens[j]]
+            j += 1
+            if _TERMINAL in node:
+                match, end = node[_TERMINAL], j
+        if match:
+            found.setdefault(match, None)
+            i = end
+        else:
+            i += 1
+    return list(found)
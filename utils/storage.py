@@ -0,0 +1,713 @@
+# skill_validation_system/utils/storage.py
+
+import bisect
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+from config import (
+    STORAGE_BACKEND, SQLITE_DB_PATH, JOURNAL_FSYNC, JOURNAL_COMPACT_BYTES,
+    CANDIDATES_FILE, ASSESSMENTS_FILE, RESPONSES_FILE, CANDIDATE_STATS_FILE,
+    QUESTION_BANK_FILE
+)
+from utils.file_handler import read_records, stage_records, data_path, check_data_format
+from utils.metrics import Span
+from models.candidate import Candidate
+from models.assessment import Assessment
+from models.response import Response
+from models.candidate_stats import CandidateStats
+from models.question_bank_entry import QuestionBankEntry
+
+# Every collection the application stores, the model it holds, its JSON file and
+# the fields (with their SQL type) that must be indexed for lookups and sorting.
+COLLECTIONS = {
+    "candidates": {"model": Candidate, "file": CANDIDATES_FILE, "indexes": {}},
+    "assessments": {"model": Assessment, "file": ASSESSMENTS_FILE, "indexes": {}},
+    "responses": {
+        "model": Response, "file": RESPONSES_FILE,
+        "indexes": {"candidate_id": "TEXT", "assessment_id": "TEXT"},
+    },
+    "candidate_stats": {
+        "model": CandidateStats, "file": CANDIDATE_STATS_FILE,
+        "indexes": {"sort_score": "REAL", "flagged_count": "INTEGER", "seq": "INTEGER"},
+    },
+    "question_bank": {
+        "model": QuestionBankEntry, "file": QUESTION_BANK_FILE,
+        "indexes": {"skill": "TEXT"},
+    },
+}
+
+
+def _copy(record):
+    """Returns a copy of a model object that shares none of its lists or dicts."""
+    copy = record.__class__.__new__(record.__class__)
+    for slot in record.__slots__:
+        value = getattr(record, slot)
+        if isinstance(value, (list, dict)):
+            value = value.copy()
+        setattr(copy, slot, value)
+    return copy
+
+
+class _CachedCollection:
+    """
+    Parsed model objects of one JSON collection, indexed by ID and indexed fields.
+    Records from the journal are applied on top of the snapshot with apply().
+    """
+
+    def __init__(self, version, records, fields):
+        # The snapshot's (mtime, size, inode) and the journal's inode and the
+        # offset up to which it has been applied
+        self.version = version
+        self.journal_ino = None
+        self.journal_offset = 0
+        self.records = []
+        self.by_id = {}
+        self._positions = {}
+        self._keys = {}
+        self.by_field = {field: {} for field in fields}
+        for record in records:
+            self.apply(record)
+        # Aggregates computed from this version of the collection, see count_by().
+        self.aggregates = {}
+
+    def apply(self, record):
+        """Inserts a record, or replaces the one with the same ID in place."""
+        keys = tuple(getattr(record, field) for field in self.by_field)
+        position = self._positions.get(record.id)
+        if position is None:
+            self._positions[record.id] = len(self.records)
+            self.records.append(record)
+            for (field, index), key in zip(self.by_field.items(), keys):
+                index.setdefault(key, []).append(record)
+        else:
+            old = self.records[position]
+            self.records[position] = record
+            for (field, index), old_key, key in zip(self.by_field.items(), self._keys[record.id], keys):
+                bucket = index[old_key]
+                slot = next(i for i, r in enumerate(bucket) if r.id == record.id)
+                if old_key == key:
+                    bucket[slot] = record
+                else:
+                    del bucket[slot]
+                    if not bucket:
+                        del index[old_key]
+                    index.setdefault(key, []).append(record)
+        self.by_id[record.id] = record
+        self._keys[record.id] = keys
+        self.aggregates = {}
+
+
+class JsonRepository:
+    """
+    Stores every collection as a JSON array snapshot (the original data/*.json
+    files) plus an append-only journal next to it (<file>.journal, one JSON record
+    per line, applied as upserts in order).
+
+    Writes append only the changed records to the journal under an exclusive
+    flock and fsync once per call, so a write costs O(records written) and writers
+    in different processes never overwrite each other. Once a journal outgrows
+    JOURNAL_COMPACT_BYTES a background thread folds it into a new snapshot, which
+    is swapped in with an atomic rename before the journal is reset.
+
+    Parsed collections are cached per process together with dict indexes. New
+    journal lines, including those appended by other gunicorn workers, are applied
+    to the cache incrementally; a new snapshot triggers a full reload. File locks
+    and file I/O never happen under the in-process lock, which only guards the
+    cache itself, so a cache hit never waits for a write or a compaction. The
+    returned model objects are copies: modifying one changes nothing until it is
+    saved through update().
+    """
+    name = "json"
+
+    def __init__(self):
+        check_data_format()
+        self._cache = {}
+        self._lock = threading.Lock()
+        # One thread at a time reads a collection's files; the others wait for its result
+        self._loading = {c: threading.Lock() for c in COLLECTIONS}
+        self._stats = {c: {"hits": 0, "misses": 0, "journal_reads": 0, "compactions": 0} for c in COLLECTIONS}
+        self._compacting = set()
+
+    # --- Files & locking ---
+
+    def _version(self, filepath):
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _journal_path(self, collection):
+        return COLLECTIONS[collection]["file"] + ".journal"
+
+    def _flock(self, collection, mode, suffix=".lock"):
+        path = COLLECTIONS[collection]["file"] + suffix
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handle = open(path, "a")
+        fcntl.flock(handle, mode)
+        return handle
+
+    def _journal_state(self, collection):
+        try:
+            st = os.stat(self._journal_path(collection))
+        except FileNotFoundError:
+            return None, 0
+        return st.st_ino, st.st_size
+
+    def _read_journal_lines(self, collection, offset):
+        """Returns the journal's complete lines after `offset` as bytes."""
+        try:
+            with open(self._journal_path(collection), "rb") as f:
+                f.seek(offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return b""
+        return chunk[:chunk.rfind(b"\n") + 1]
+
+    def _read_journal(self, collection, offset):
+        """Returns the records in the journal's complete lines after `offset`, and the new offset."""
+        model = COLLECTIONS[collection]["model"]
+        complete = self._read_journal_lines(collection, offset)
+        records = []
+        for line in complete.splitlines():
+            try:
+                records.append(model.from_dict(json.loads(line)))
+            except ValueError as e:
+                print(f"Skipping malformed journal line in {collection}: {e}")
+        return records, offset + len(complete)
+
+    # --- Reads ---
+
+    def _is_current(self, cached, collection):
+        version = self._version(data_path(COLLECTIONS[collection]["file"]))
+        journal_ino, journal_size = self._journal_state(collection)
+        return (cached is not None and cached.version == version and cached.journal_ino == journal_ino
+                and cached.journal_offset == journal_size)
+
+    def _load(self, collection):
+        """
+        Returns the cached collection. Journal lines appended since the last read are
+        applied to it; the snapshot is only re-parsed if it was replaced.
+        """
+        spec = COLLECTIONS[collection]
+        with self._lock:
+            cached = self._cache.get(collection)
+        if self._is_current(cached, collection):
+            with self._lock:
+                self._stats[collection]["hits"] += 1
+            return cached
+        with self._loading[collection]:
+            with self._lock:
+                cached = self._cache.get(collection)
+            if self._is_current(cached, collection):
+                return cached
+            # A compaction swaps the snapshot and the journal under the exclusive lock
+            handle = self._flock(collection, fcntl.LOCK_SH)
+            try:
+                version = self._version(data_path(spec["file"]))
+                journal_ino, _ = self._journal_state(collection)
+                if cached is not None and cached.version == version and cached.journal_ino == journal_ino:
+                    stat = "journal_reads"
+                else:
+                    stat = "misses"
+                    with Span("snapshot_load") as span:
+                        records = [spec["model"].from_dict(d) for d in read_records(spec["file"])]
+                        cached = _CachedCollection(version, records, spec["indexes"])
+                        span.add("records", len(records))
+                    cached.journal_ino = journal_ino
+                records, offset = self._read_journal(collection, cached.journal_offset)
+                with self._lock:
+                    for record in records:
+                        cached.apply(record)
+                    cached.journal_offset = offset
+                    self._cache[collection] = cached
+                    self._stats[collection][stat] += 1
+            finally:
+                handle.close()
+            return cached
+
+    # --- Writes ---
+
+    def _append(self, collection, records):
+        """Appends records to the collection's journal and applies them to the cache."""
+        if not records:
+            return
+        payload = "".join(
+            json.dumps(r.to_dict(), separators=(",", ":"), ensure_ascii=False) + "\n" for r in records
+        ).encode("utf-8")
+        # The cache keeps its own copies, so callers can go on modifying theirs
+        records = [_copy(r) for r in records]
+        path = self._journal_path(collection)
+        with Span("journal_append") as span:
+            span.add("records", len(records))
+            span.add("bytes", len(payload))
+            handle = self._flock(collection, fcntl.LOCK_EX)
+            try:
+                with open(path, "ab") as f:
+                    start = f.seek(0, os.SEEK_END)
+                    start = self._repair_torn_tail(f, start)
+                    f.write(payload)
+                    f.flush()
+                    if JOURNAL_FSYNC:
+                        os.fsync(f.fileno())
+                    journal_ino = os.fstat(f.fileno()).st_ino
+                    end = start + len(payload)
+                version = self._version(data_path(COLLECTIONS[collection]["file"]))
+                with self._lock:
+                    cached = self._cache.get(collection)
+                    if (cached is not None and cached.journal_ino == journal_ino and cached.journal_offset == start
+                            and cached.version == version):
+                        # Nobody else wrote in between: apply our own records without re-reading them
+                        for record in records:
+                            cached.apply(record)
+                        cached.journal_offset = end
+                    else:
+                        self._cache.pop(collection, None)
+            finally:
+                handle.close()
+        if end >= JOURNAL_COMPACT_BYTES:
+            self._compact_in_background(collection)
+
+    def _repair_torn_tail(self, f, size):
+        """Drops a partial last line left by a crashed writer, so the next line starts clean."""
+        if size == 0:
+            return 0
+        with open(f.name, "rb") as reader:
+            reader.seek(max(0, size - 65536))
+            tail = reader.read()
+        if tail.endswith(b"\n"):
+            return size
+        newline = tail.rfind(b"\n")
+        keep = size - len(tail) + newline + 1 if newline >= 0 else 0
+        f.truncate(keep)
+        f.seek(keep)
+        print(f"Discarded a torn journal record in {f.name}.")
+        return keep
+
+    def compact(self, collection):
+        """
+        Folds the journal into a new snapshot. The snapshot and the journal's
+        complete lines are merged into a temporary file while readers and writers
+        carry on; only the lines appended meanwhile are copied into a fresh journal
+        under the exclusive lock, and both files are then renamed into place.
+        """
+        spec = COLLECTIONS[collection]
+        journal = self._journal_path(collection)
+        # Only compaction replaces the snapshot and resets the journal, so one at a time
+        compacting = self._flock(collection, fcntl.LOCK_EX, suffix=".compact.lock")
+        staged = None
+        try:
+            with Span("journal_compact") as span:
+                merged = {}
+                for data in read_records(spec["file"]):
+                    merged[data.get("id")] = data
+                # Appends never rewrite complete lines, so they can be read without the lock
+                records, offset = self._read_journal(collection, 0)
+                for record in records:
+                    merged[record.id] = record.to_dict()
+                staged = stage_records(spec["file"], list(merged.values()))
+                span.add("records", len(merged))
+            handle = self._flock(collection, fcntl.LOCK_EX)
+            try:
+                # A crash between the renames leaves the whole old journal, which
+                # replays onto the new snapshot as the same upserts
+                fresh = journal + ".tmp"
+                with open(fresh, "wb") as f:
+                    f.write(self._read_journal_lines(collection, offset))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(staged, data_path(spec["file"]))
+                os.replace(fresh, journal)
+            finally:
+                handle.close()
+        finally:
+            if staged and os.path.exists(staged):
+                os.remove(staged)
+            compacting.close()
+        with self._lock:
+            self._stats[collection]["compactions"] += 1
+
+    def _compact_in_background(self, collection):
+        with self._lock:
+            if collection in self._compacting:
+                return
+            self._compacting.add(collection)
+
+        def run():
+            try:
+                self.compact(collection)
+            except Exception as e:
+                print(f"Compaction of {collection} failed: {e}")
+            finally:
+                with self._lock:
+                    self._compacting.discard(collection)
+
+        threading.Thread(target=run, name=f"compact-{collection}", daemon=True).start()
+
+    def cache_stats(self):
+        """Returns the hit/miss counters of each collection cache."""
+        with self._lock:
+            return {c: dict(counts) for c, counts in self._stats.items()}
+
+    def all(self, collection):
+        """Returns every record in the collection as model objects."""
+        return [_copy(r) for r in self._load(collection).records]
+
+    def get(self, collection, record_id):
+        """Returns the record with the given ID, or None."""
+        record = self._load(collection).by_id.get(record_id)
+        return _copy(record) if record is not None else None
+
+    def find(self, collection, field, value):
+        """Returns every record whose `field` equals `value`."""
+        cached = self._load(collection)
+        if field in cached.by_field:
+            return [_copy(r) for r in cached.by_field[field].get(value, [])]
+        return [_copy(r) for r in cached.records if getattr(r, field) == value]
+
+    def get_many(self, collection, record_ids):
+        """Returns the records with the given IDs in the same order, skipping unknown IDs."""
+        by_id = self._load(collection).by_id
+        return [_copy(by_id[i]) for i in record_ids if i in by_id]
+
+    def count_by(self, collection, group_field, **filters):
+        """
+        Counts the records matching `filters`, grouped by `group_field`. The result is
+        computed in a single pass and memoized until the collection changes.
+        """
+        cached = self._load(collection)
+        key = (group_field, tuple(sorted(filters.items())))
+        counts = cached.aggregates.get(key)
+        if counts is None:
+            counts = {}
+            for record in cached.records:
+                if all(getattr(record, f) == v for f, v in filters.items()):
+                    group = getattr(record, group_field)
+                    counts[group] = counts.get(group, 0) + 1
+            cached.aggregates[key] = counts
+        return dict(counts)
+
+    def page(self, collection, sort_field, descending=False, after=None, limit=25, has_item=None):
+        """
+        Returns up to `limit` records ordered by (`sort_field`, id), starting after the
+        keyset cursor `after` = (sort value, id). `has_item` = (field, value) keeps only
+        records whose list `field` contains `value`. The sorted key list is memoized
+        until the collection changes, so each page costs a binary search plus a scan.
+        """
+        cached = self._load(collection)
+        key = ("sorted", sort_field)
+        ordered = cached.aggregates.get(key)
+        if ordered is None:
+            records = sorted(cached.records, key=lambda r: (getattr(r, sort_field), r.id))
+            ordered = ([(getattr(r, sort_field), r.id) for r in records], records)
+            cached.aggregates[key] = ordered
+        keys, records = ordered
+        if descending:
+            end = bisect.bisect_left(keys, tuple(after)) if after else len(keys)
+            candidates = (records[i] for i in range(end - 1, -1, -1))
+        else:
+            start = bisect.bisect_right(keys, tuple(after)) if after else 0
+            candidates = (records[i] for i in range(start, len(records)))
+        result = []
+        for record in candidates:
+            if has_item and has_item[1] not in getattr(record, has_item[0]):
+                continue
+            result.append(_copy(record))
+            if len(result) >= limit:
+                break
+        return result
+
+    def values(self, collection, *fields):
+        """
+        Returns a (field, ...) tuple per record, in collection order, without
+        copying the records. Unlike the SQLite backend this does not avoid hydration:
+        the collection is still parsed into model objects once per version, and the
+        fields are read from the cached objects.
+        """
+        return [tuple(getattr(r, f) for f in fields) for r in self._load(collection).records]
+
+    def scan(self, collection, after=None, limit=1000):
+        """
+        Returns up to `limit` records ordered by ID, starting after the ID `after`.
+        Used to walk a whole collection in batches with a resumable position.
+        """
+        cached = self._load(collection)
+        ids = cached.aggregates.get("scan")
+        if ids is None:
+            ids = sorted(cached.by_id)
+            cached.aggregates["scan"] = ids
+        start = bisect.bisect_right(ids, after) if after is not None else 0
+        return [_copy(cached.by_id[i]) for i in ids[start:start + limit]]
+
+    def insert_many(self, collection, records):
+        """Appends new records to the collection."""
+        self._append(collection, list(records))
+
+    def save_many(self, collection, records):
+        """Inserts or replaces records by ID."""
+        self._append(collection, list(records))
+
+    def update(self, collection, record):
+        """Replaces the stored record that has the same ID."""
+        self._append(collection, [record])
+
+    def increment(self, collection, field, amounts):
+        """
+        Adds to a numeric field of existing records, given as {record ID: amount}.
+        Reading and rewriting them holds a per-collection lock, so increments made
+        at the same time by other threads or processes are not lost.
+        """
+        if not amounts:
+            return
+        handle = self._flock(collection, fcntl.LOCK_EX, suffix=".increment.lock")
+        try:
+            records = self.get_many(collection, list(amounts))
+            for record in records:
+                setattr(record, field, (getattr(record, field) or 0) + amounts[record.id])
+            self._append(collection, records)
+        finally:
+            handle.close()
+
+
+class SqliteRepository:
+    """
+    Stores each collection in a SQLite table running in WAL mode. Records are kept
+    as JSON documents keyed by a primary key, and the fields listed in COLLECTIONS
+    get their own indexed columns, so lookups and writes cost O(log N).
+    """
+    name = "sqlite"
+
+    def __init__(self, db_path=SQLITE_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        """Returns this thread's connection, creating the schema on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._init_lock:
+                if not self._initialized:
+                    self._create_schema(conn)
+                    self._initialized = True
+        return conn
+
+    def _create_schema(self, conn):
+        with conn:
+            for collection, spec in COLLECTIONS.items():
+                columns = "".join(f", {field} {sql_type}" for field, sql_type in spec["indexes"].items())
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {collection} "
+                    f"(id TEXT PRIMARY KEY{columns}, data TEXT NOT NULL)"
+                )
+                for field in spec["indexes"]:
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{collection}_{field} ON {collection} ({field}, id)"
+                    )
+
+    def _hydrate(self, collection, rows):
+        model = COLLECTIONS[collection]["model"]
+        return [model.from_dict(json.loads(row[0])) for row in rows]
+
+    def _row(self, collection, record):
+        data = record.to_dict()
+        fields = COLLECTIONS[collection]["indexes"]
+        return (record.id, *(data.get(f) for f in fields), json.dumps(data))
+
+    def _insert(self, collection, records, verb):
+        fields = COLLECTIONS[collection]["indexes"]
+        placeholders = ", ".join("?" * (len(fields) + 2))
+        conn = self._connect()
+        with conn, Span("sqlite_write") as span:
+            span.add("records", len(records))
+            conn.executemany(
+                f"{verb} INTO {collection} (id{''.join(', ' + f for f in fields)}, data) "
+                f"VALUES ({placeholders})",
+                [self._row(collection, r) for r in records],
+            )
+
+    def all(self, collection):
+        """Returns every record in insertion order."""
+        rows = self._connect().execute(f"SELECT data FROM {collection} ORDER BY rowid")
+        return self._hydrate(collection, rows)
+
+    def get(self, collection, record_id):
+        """Returns the record with the given ID, or None."""
+        rows = self._connect().execute(f"SELECT data FROM {collection} WHERE id = ?", (record_id,))
+        records = self._hydrate(collection, rows)
+        return records[0] if records else None
+
+    def find(self, collection, field, value):
+        """Returns every record whose indexed `field` equals `value`."""
+        if field not in COLLECTIONS[collection]["indexes"]:
+            raise ValueError(f"'{field}' is not an indexed field of {collection}")
+        rows = self._connect().execute(
+            f"SELECT data FROM {collection} WHERE {field} = ? ORDER BY rowid", (value,)
+        )
+        return self._hydrate(collection, rows)
+
+    def get_many(self, collection, record_ids):
+        """Returns the records with the given IDs in the same order, skipping unknown IDs."""
+        record_ids = list(record_ids)
+        conn = self._connect()
+        model = COLLECTIONS[collection]["model"]
+        by_id = {}
+        # Stay well below SQLite's limit on the number of bound parameters.
+        for start in range(0, len(record_ids), 500):
+            chunk = record_ids[start:start + 500]
+            rows = conn.execute(
+                f"SELECT id, data FROM {collection} WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for record_id, data in rows:
+                by_id[record_id] = model.from_dict(json.loads(data))
+        return [by_id[i] for i in record_ids if i in by_id]
+
+    def count_by(self, collection, group_field, **filters):
+        """Counts the records matching `filters`, grouped by the indexed `group_field`."""
+        if group_field not in COLLECTIONS[collection]["indexes"]:
+            raise ValueError(f"'{group_field}' is not an indexed field of {collection}")
+        where = " AND ".join(f"json_extract(data, '$.{f}') = ?" for f in filters)
+        rows = self._connect().execute(
+            f"SELECT {group_field}, COUNT(*) FROM {collection}"
+            f"{' WHERE ' + where if where else ''} GROUP BY {group_field}",
+            tuple(filters.values()),
+        )
+        return dict(rows.fetchall())
+
+    def page(self, collection, sort_field, descending=False, after=None, limit=25, has_item=None):
+        """
+        Returns up to `limit` records ordered by the indexed (`sort_field`, id), starting
+        after the keyset cursor `after` = (sort value, id). `has_item` = (field, value)
+        keeps only records whose JSON list `field` contains `value`.
+        """
+        if sort_field not in COLLECTIONS[collection]["indexes"]:
+            raise ValueError(f"'{sort_field}' is not an indexed field of {collection}")
+        clauses, params = [], []
+        if after:
+            clauses.append(f"({sort_field}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+        if has_item:
+            clauses.append(f"EXISTS (SELECT 1 FROM json_each(data, '$.{has_item[0]}') WHERE value = ?)")
+            params.append(has_item[1])
+        direction = "DESC" if descending else "ASC"
+        rows = self._connect().execute(
+            f"SELECT data FROM {collection}"
+            f"{' WHERE ' + ' AND '.join(clauses) if clauses else ''} "
+            f"ORDER BY {sort_field} {direction}, id {direction} LIMIT ?",
+            (*params, limit),
+        )
+        return self._hydrate(collection, rows)
+
+    def values(self, collection, *fields):
+        """
+        Returns a (field, ...) tuple per record in insertion order. Fields are read in
+        SQL (indexed columns directly, others with json_extract), so no record is
+        decoded or hydrated. Meant for scalar fields.
+        """
+        indexed = COLLECTIONS[collection]["indexes"]
+        columns = ", ".join(
+            f if f == "id" or f in indexed else f"json_extract(data, '$.{f}')" for f in fields
+        )
+        return self._connect().execute(f"SELECT {columns} FROM {collection} ORDER BY rowid").fetchall()
+
+    def scan(self, collection, after=None, limit=1000):
+        """Returns up to `limit` records ordered by ID, starting after the ID `after`."""
+        rows = self._connect().execute(
+            f"SELECT data FROM {collection} WHERE id > ? ORDER BY id LIMIT ?", (after or "", limit)
+        )
+        return self._hydrate(collection, rows)
+
+    def insert_many(self, collection, records, ignore_existing=False):
+        """Inserts new records in a single transaction."""
+        self._insert(collection, records, "INSERT OR IGNORE" if ignore_existing else "INSERT")
+
+    def save_many(self, collection, records):
+        """Inserts or replaces records by ID in a single transaction."""
+        self._insert(collection, records, "INSERT OR REPLACE")
+
+    def update(self, collection, record):
+        """Replaces the stored record that has the same ID."""
+        fields = COLLECTIONS[collection]["indexes"]
+        assignments = "".join(f"{f} = ?, " for f in fields)
+        row = self._row(collection, record)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                f"UPDATE {collection} SET {assignments}data = ? WHERE id = ?",
+                (*row[1:], row[0]),
+            )
+
+    def increment(self, collection, field, amounts):
+        """
+        Adds to a numeric field of existing records, given as {record ID: amount}.
+        Each row is updated in place by one statement, so concurrent increments are
+        not lost.
+        """
+        if not amounts:
+            return
+        assignment = f"data = json_set(data, '$.{field}', COALESCE(json_extract(data, '$.{field}'), 0) + ?1)"
+        if field in COLLECTIONS[collection]["indexes"]:
+            assignment += f", {field} = COALESCE({field}, 0) + ?1"
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                f"UPDATE {collection} SET {assignment} WHERE id = ?2",
+                [(amount, record_id) for record_id, amount in amounts.items()],
+            )
+
+    def cache_stats(self):
+        """SQLite lookups are served from indexes, so there is no cache to report."""
+        return {}
+
+
+BACKENDS = {
+    JsonRepository.name: JsonRepository,
+    SqliteRepository.name: SqliteRepository,
+}
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_repository():
+    """Returns the process-wide repository selected by config.STORAGE_BACKEND."""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                if STORAGE_BACKEND not in BACKENDS:
+                    raise ValueError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}'")
+                _repository = BACKENDS[STORAGE_BACKEND]()
+    return _repository
+
+
+def migrate_json_to_sqlite(db_path=SQLITE_DB_PATH):
+    """
+    Copies every data/*.json collection into the SQLite database. Records that
+    already exist in the database are skipped, so the migration can be re-run safely.
+
+    Args:
+        db_path (str): The SQLite database to populate.
+
+    Returns:
+        dict: The number of records read from each JSON collection.
+    """
+    source = JsonRepository()
+    target = SqliteRepository(db_path)
+    counts = {}
+    for collection in COLLECTIONS:
+        records = source.all(collection)
+        target.insert_many(collection, records, ignore_existing=True)
+        counts[collection] = len(records)
+    return counts
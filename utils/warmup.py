@@ -0,0 +1,30 @@
+# skill_validation_system/utils/warmup.py
+
+import importlib
+import time
+
+# Libraries the app only imports on first use. Warming up loads them ahead of time,
+# e.g. in the gunicorn master (see gunicorn.conf.py) so that forked workers share
+# the loaded modules instead of each importing them on its first request.
+HEAVY_MODULES = ("numpy", "faiss", "PyPDF2", "docx", "httpx", "openai")
+
+
+def warm_up(modules=HEAVY_MODULES):
+    """
+    Imports the given modules now.
+
+    Args:
+        modules (iterable, optional): Module names. Defaults to HEAVY_MODULES.
+
+    Returns:
+        dict: Seconds spent importing each module (0 if it was already loaded).
+    """
+    timings = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"Warm-up could not import {name}: {e}")
+        timings[name] = time.perf_counter() - started
+    return timings